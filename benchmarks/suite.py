@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Suite de benchmarks : noyaux physiques, boucles d'images hors écran et graphiques.
+
+Exemples :
+    python -m benchmarks.suite --sortie reference.json
+    python -m benchmarks.suite --comparer reference.json --seuil 0.2
+    python -m benchmarks.suite --filtre physique --repetitions 10
+
+Chaque cas est mesuré en temps (médiane et minimum sur plusieurs répétitions,
+après un passage d'échauffement) puis en pic mémoire Python (tracemalloc, sur
+une exécution séparée pour ne pas fausser les temps). Les résultats sont écrits
+en JSON. En mode comparaison, un cas plus lent ou plus gourmand que la
+référence au-delà du seuil est signalé et le code de sortie vaut 1.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+# Pas de temps de SimulateurCoriolis et altitudes de SimulateurBille mesurés
+PAS_TEMPS = (0.01, 0.005, 0.001)
+ALTITUDES = (10.0, 84.0, 1000.0)
+
+
+# ==================== CAS DE MESURE ====================
+# Chaque cas est une fonction de préparation qui retourne la fonction à mesurer :
+# la préparation (imports, construction des objets) n'est pas chronométrée.
+
+def _physique_trajectoire(dt, methode):
+    def preparer():
+        from utils.physique import SimulateurCoriolis
+
+        simulateur = SimulateurCoriolis()
+        return lambda: simulateur.calculer_trajectoire_animee((0.6, 0.0, 0.8), dt=dt, methode=methode)
+    return preparer
+
+
+def _bille_donnees(altitude, modele):
+    def preparer():
+        from utils.bille import SimulateurBille
+
+        # Cache désactivé : on mesure le calcul, pas la recherche dans le cache
+        moteur = SimulateurBille(taille_cache=0)
+        point = (np.cos(0.85), 0.0, np.sin(0.85))
+        return lambda: moteur.calculer_donnees(point, altitude, modele)
+    return preparer
+
+
+def _bille_premier_bloc(altitude, modele):
+    def preparer():
+        from utils.bille import SimulateurBille
+
+        # Latence du flux progressif : seul le premier bloc est calculé
+        moteur = SimulateurBille(taille_cache=0)
+        point = (np.cos(0.85), 0.0, np.sin(0.85))
+        return lambda: next(moteur.iterer_donnees(point, altitude, modele))
+    return preparer
+
+
+def _bille_cache():
+    from utils.bille import SimulateurBille
+
+    moteur = SimulateurBille()
+    point = (np.cos(0.85), 0.0, np.sin(0.85))
+    moteur.calculer_donnees(point, 84.0)
+    return lambda: moteur.calculer_donnees(point, 84.0)
+
+
+def _graphiques_animation():
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from utils.export import flux_sim1
+    from utils.graphiques import GestionnaireGraphiques
+
+    flux = flux_sim1(48.86, 84.0, 60)
+    t, dev, alt = flux.trace
+    graph = GestionnaireGraphiques(FigureCanvasAgg(Figure()), FigureCanvasAgg(Figure()))
+    graph.preparer_axes(t[-1], alt[0], dev[-1], n_points=len(t))
+
+    def animation():
+        # Une animation complète : à chaque image, les points décimés atteints, comme dans sim1
+        graph.reinitialiser()
+        for i in range(flux.n_images):
+            lot = flux.plage_trace(i, i)
+            graph.mettre_a_jour_points(t[lot], dev[lot], alt[lot])
+    return animation
+
+
+def _boucle_images(simulation):
+    def preparer():
+        import pyvista as pv
+        from utils import rendu
+        from utils.export import flux_sim1, flux_sim2
+
+        plotter = pv.Plotter(off_screen=True, window_size=(768, 720))
+        if simulation == "sim1":
+            # Mêmes images que l'interface (2 s à 60 images/s)
+            flux = flux_sim1(48.86, 84.0, 60)
+            scene = rendu.SceneBille(plotter)
+            scene.cadrer(84.0, flux.images[3][-1])
+        else:
+            flux = flux_sim2(30)
+            scene = rendu.SceneFlammarion(plotter)
+        plotter.show(auto_close=False)
+
+        def boucle():
+            # Toutes les images de l'animation, rendues hors écran
+            scene.reinitialiser()
+            for i in range(flux.n_images):
+                scene.afficher(flux.images, i, i)
+                plotter.render()
+        return boucle
+    return preparer
+
+
+def _flux_animation(altitude):
+    def preparer():
+        from utils.bille import SimulateurBille
+        from utils.reechantillonnage import FluxAnimation
+
+        t, x_id, z_id, x_co, z_co, force_mag = SimulateurBille(taille_cache=0).calculer_donnees((1, 0, 1), altitude)
+        return lambda: FluxAnimation(t, (x_id, z_id, x_co, z_co, force_mag), (x_co, z_co), 2.0, 60)
+    return preparer
+
+
+def _chute3d_lot(backend):
+    def preparer():
+        from utils import noyau
+        from utils.chute3d import ModeleChute3D
+
+        # Lot du Monte Carlo (taille_lot, n_pas par défaut) avec traînée
+        modele = ModeleChute3D(trainee=True)
+        altitudes = np.full(20_000, 68.0)
+
+        def lot():
+            # Les autres cas gardent le backend choisi par CORIOLIS_BACKEND
+            precedent = noyau.backend_actif().nom
+            noyau.choisir_backend(backend)
+            try:
+                return modele.integrer(48.8462, altitudes, n_pas=40, garder_trajectoires=False)
+            finally:
+                noyau.choisir_backend(precedent)
+        return lot
+    return preparer
+
+
+def _backends():
+    from utils import noyau
+
+    return noyau.backends_disponibles()
+
+
+CAS = {
+    **{f"physique.trajectoire_animee[{m},dt={dt}]": _physique_trajectoire(dt, m)
+       for m in ("euler", "rk4") for dt in PAS_TEMPS},
+    **{f"bille.calculer_donnees[{m},h={h:g}]": _bille_donnees(h, m)
+       for m in ("analytique", "3d", "atmosphere") for h in ALTITUDES},
+    "bille.calculer_donnees[cache]": _bille_cache,
+    **{f"bille.iterer_donnees[premier_bloc,{m},h={h:g}]": _bille_premier_bloc(h, m)
+       for m in ("analytique", "3d", "atmosphere") for h in ALTITUDES},
+    **{f"reechantillonnage.flux_animation[h={h:g}]": _flux_animation(h) for h in ALTITUDES},
+    **{f"chute3d.integrer[lot,{b}]": _chute3d_lot(b) for b in _backends()},
+    "graphiques.mettre_a_jour_points[animation]": _graphiques_animation,
+    "sim1.boucle_images[hors_ecran]": _boucle_images("sim1"),
+    "sim2.boucle_images[hors_ecran]": _boucle_images("sim2"),
+}
+
+
+# ==================== MESURE ====================
+
+def mesurer(preparer, repetitions=5):
+    """Temps (médiane, minimum) et pic mémoire d'un cas."""
+    fonction = preparer()
+    fonction()  # échauffement (imports paresseux, caches, premier rendu)
+
+    durees = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        fonction()
+        durees.append(time.perf_counter() - debut)
+
+    tracemalloc.start()
+    try:
+        fonction()
+        _, pic = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "temps_median_s": statistics.median(durees),
+        "temps_min_s": min(durees),
+        "repetitions": repetitions,
+        "pic_memoire_octets": pic,
+    }
+
+
+def executer(filtre=None, repetitions=5, afficher=print):
+    resultats = {}
+    for nom, preparer in CAS.items():
+        if filtre and filtre not in nom:
+            continue
+        resultats[nom] = r = mesurer(preparer, repetitions)
+        afficher(f"{nom:<48} {r['temps_median_s'] * 1000:>10.3f} ms {r['pic_memoire_octets'] / 2**20:>9.2f} Mo")
+    return {
+        "meta": {
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "plateforme": platform.platform(),
+            "processeur": platform.processor(),
+        },
+        "resultats": resultats,
+    }
+
+
+def comparer(actuels, reference, seuil=0.2):
+    """
+    Compare deux jeux de résultats. Retourne les lignes du rapport et la liste
+    des régressions (cas plus lents ou plus gourmands de plus de `seuil`).
+    """
+    lignes = [f"{'CAS':<48} {'TEMPS':>9} {'MÉMOIRE':>9}"]
+    regressions = []
+    for nom, r in actuels["resultats"].items():
+        ref = reference["resultats"].get(nom)
+        if ref is None:
+            lignes.append(f"{nom:<48} {'(nouveau)':>9}")
+            continue
+        ratio_temps = r["temps_median_s"] / ref["temps_median_s"]
+        ratio_memoire = r["pic_memoire_octets"] / max(ref["pic_memoire_octets"], 1)
+        alerte = ""
+        if ratio_temps > 1 + seuil or ratio_memoire > 1 + seuil:
+            alerte = "  <-- RÉGRESSION"
+            regressions.append(nom)
+        lignes.append(f"{nom:<48} {ratio_temps:>8.2f}x {ratio_memoire:>8.2f}x{alerte}")
+    return lignes, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks des simulations Coriolis.")
+    parser.add_argument("--sortie", help="fichier JSON où écrire les résultats")
+    parser.add_argument("--comparer", metavar="REFERENCE", help="fichier JSON de référence")
+    parser.add_argument("--resultats", help="résultats JSON déjà mesurés (au lieu de relancer la suite)")
+    parser.add_argument("--seuil", type=float, default=0.2,
+                        help="dégradation tolérée avant de signaler une régression (défaut : 0.2 = +20 %%)")
+    parser.add_argument("--filtre", help="ne lance que les cas dont le nom contient ce texte")
+    parser.add_argument("--repetitions", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    if args.resultats:
+        actuels = json.loads(Path(args.resultats).read_text())
+    else:
+        actuels = executer(args.filtre, args.repetitions)
+    if args.sortie:
+        Path(args.sortie).write_text(json.dumps(actuels, indent=2))
+
+    if args.comparer:
+        reference = json.loads(Path(args.comparer).read_text())
+        lignes, regressions = comparer(actuels, reference, args.seuil)
+        print("\n".join(lignes))
+        if regressions:
+            print(f"{len(regressions)} régression(s) au-delà de +{args.seuil * 100:.0f} %")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
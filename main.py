@@ -7,7 +7,7 @@ Copyright © Groupe G6E Samuel SAMINATHAN
 """
 
 import tkinter as tk
-from tkinter import font
+from tkinter import font, messagebox
 import threading
 
 
@@ -15,7 +15,7 @@ class SimulationApp:
     def __init__(self, root):
         self.root = root
         self.root.title("Simulations Coriolis")
-        self.root.geometry("700x400")
+        self.root.geometry("1250x440")
         self.root.resizable(False, False)
         
         # Configuration du style
@@ -67,7 +67,37 @@ class SimulationApp:
             command=self.launch_sim2,
             **button_style
         )
-        btn2.pack(side=tk.RIGHT, padx=15, expand=True, fill=tk.BOTH)
+        btn2.pack(side=tk.LEFT, padx=15, expand=True, fill=tk.BOTH)
+
+        # Bouton 3 - Comparaison multi-sites
+        btn3 = tk.Button(
+            button_frame,
+            text="Comparaison de la déviation\nsur plusieurs sites\n(expériences historiques)",
+            command=self.launch_comparaison,
+            **button_style
+        )
+        btn3.pack(side=tk.LEFT, padx=15, expand=True, fill=tk.BOTH)
+
+        # Bouton 4 - Pendule de Foucault, avec le choix de la latitude (Paris par défaut)
+        pendule_frame = tk.Frame(button_frame, bg="#f0f0f0")
+        pendule_frame.pack(side=tk.LEFT, padx=15, expand=True, fill=tk.BOTH)
+        btn4 = tk.Button(
+            pendule_frame,
+            text="Pendule de Foucault\n(précession du plan d'oscillation\nselon la latitude)",
+            command=self.launch_sim3,
+            **button_style
+        )
+        btn4.pack(side=tk.TOP, expand=True, fill=tk.BOTH)
+
+        latitude_frame = tk.Frame(pendule_frame, bg="#f0f0f0")
+        latitude_frame.pack(side=tk.TOP, pady=(8, 0))
+        tk.Label(latitude_frame, text="Latitude (°) :", font=button_font, bg="#f0f0f0").pack(side=tk.LEFT)
+        self.latitude_pendule = tk.Spinbox(
+            latitude_frame, from_=-90.0, to=90.0, increment=0.5, format="%.2f", width=7, font=button_font
+        )
+        self.latitude_pendule.delete(0, tk.END)
+        self.latitude_pendule.insert(0, "48.85")
+        self.latitude_pendule.pack(side=tk.LEFT, padx=5)
         
         # Pied de page avec copyright
         footer_font = font.Font(family="Helvetica", size=9)
@@ -96,6 +126,29 @@ class SimulationApp:
         # Après fermeture de la simulation, on réaffiche le menu
         self.root.deiconify()
 
+    def launch_comparaison(self):
+        """Lance la comparaison multi-sites"""
+        from utils.comparaison import main as comparaison_main
+        self.root.withdraw()  # Masquer la fenêtre principale
+        comparaison_main([])
+        # Après fermeture de la simulation, on réaffiche le menu
+        self.root.deiconify()
+
+    def launch_sim3(self):
+        """Lance la simulation 3: pendule de Foucault, à la latitude saisie"""
+        try:
+            latitude = float(self.latitude_pendule.get().replace(",", "."))
+        except ValueError:
+            latitude = None
+        if latitude is None or not -90 <= latitude <= 90:
+            messagebox.showerror("Latitude invalide", "La latitude doit être un nombre entre -90 et 90°.")
+            return
+        from utils.sim3 import main as sim3_main
+        self.root.withdraw()  # Masquer la fenêtre principale
+        sim3_main(["--latitude", str(latitude)])
+        # Après fermeture de la simulation, on réaffiche le menu
+        self.root.deiconify()
+
 
 def main():
     root = tk.Tk()
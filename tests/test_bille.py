@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from utils.bille import SimulateurBille
+
+LATITUDES = np.array([-80.0, -45.5, 0.0, 12.3, 48.8, 89.9])
+ALTITUDES = np.array([0.5, 23.0, 68.0, 158.5, 1000.0])
+
+
+def point_globe(lat_deg):
+    lat = np.radians(lat_deg)
+    return np.cos(lat), 0.0, np.sin(lat)
+
+
+def test_grille_identique_au_calcul_point_par_point():
+    # Sans cache : le calcul point par point ne ramène pas au centre d'une cellule
+    moteur = SimulateurBille(taille_cache=0)
+    grille = moteur.calculer_grille(LATITUDES, ALTITUDES)
+
+    assert grille["deviation_mm"].shape == (LATITUDES.size, ALTITUDES.size)
+    for i, lat in enumerate(LATITUDES):
+        for j, h in enumerate(ALTITUDES):
+            details = moteur.obtenir_details_numeriques(point_globe(lat), h)
+            force_mag = moteur.calculer_donnees(point_globe(lat), h)[5]
+            assert details["latitude"] == pytest.approx(lat, abs=1e-9)
+            assert grille["temps_vol"][j] == pytest.approx(details["temps_vol"], rel=1e-12)
+            assert grille["deviation_mm"][i, j] == pytest.approx(details["deviation_mm"], rel=1e-12)
+            # force_mag est amplifiée pour l'affichage du vecteur
+            assert grille["force_coriolis_max"][i, j] == pytest.approx(
+                force_mag[-1] / (moteur.amplification * 10), rel=1e-12)
+
+
+def test_grille_par_blocs_bornes():
+    moteur = SimulateurBille()
+    complet = moteur.calculer_grille(LATITUDES, ALTITUDES)
+
+    # Une ligne de latitude par bloc : les tranches couvrent le maillage dans l'ordre
+    tranches = []
+    deviation = np.empty_like(complet["deviation_mm"])
+    for tranche, dev, force in moteur.iterer_grille(LATITUDES, ALTITUDES, octets_max=1):
+        assert dev.shape == force.shape == (1, ALTITUDES.size)
+        deviation[tranche] = dev
+        tranches.append(tranche.start)
+    assert tranches == list(range(LATITUDES.size))
+    np.testing.assert_array_equal(deviation, complet["deviation_mm"])
+
+    # Deux lignes par bloc (deux tableaux float64 de 5 altitudes par ligne)
+    fractions = []
+    simple = moteur.calculer_grille(LATITUDES, ALTITUDES, octets_max=160, dtype=np.float32,
+                                    progression=fractions.append)
+    assert simple["deviation_mm"].dtype == np.float32
+    assert fractions[-1] == 1.0 and fractions == sorted(fractions)
+    np.testing.assert_allclose(simple["deviation_mm"], complet["deviation_mm"], rtol=1e-6)
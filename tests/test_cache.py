@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from utils import bille
+from utils.bille import SimulateurBille
+from utils.cache import CacheLRU
+
+
+@pytest.fixture(autouse=True)
+def dossier_cache_temporaire(tmp_path, monkeypatch):
+    # Les tables de l'atmosphère sont écrites dans le dossier de cache
+    monkeypatch.setenv("CORIOLIS_CACHE", str(tmp_path / "cache"))
+
+
+def test_cache_lru_compteurs_et_eviction():
+    cache = CacheLRU(taille_max=2)
+    assert cache.obtenir("a") is None
+    cache.ajouter("a", 1)
+    cache.ajouter("b", 2)
+    assert cache.obtenir("a") == 1
+    # "b" est la moins récemment utilisée : c'est elle qui sort
+    cache.ajouter("c", 3)
+
+    assert "b" not in cache and "a" in cache and "c" in cache
+    assert cache.statistiques() == {
+        "entrees": 2, "succes": 1, "echecs": 1, "evictions": 1, "taux_succes": 0.5,
+    }
+    assert [cle for cle, _ in cache.elements()] == ["a", "c"]
+
+
+def test_cache_lru_desactive():
+    cache = CacheLRU(taille_max=0)
+    cache.ajouter("a", 1)
+    assert len(cache) == 0 and cache.obtenir("a") is None
+
+
+def test_aller_retour_npz(tmp_path):
+    moteur = SimulateurBille()
+    moteur.precalculer([(48.8462, 68.0), (-10.0, 500.0)])
+    moteur.obtenir_details_numeriques((1.0, 0.0, 0.0), 84.0, modele="3d")
+    chemin = moteur.sauvegarder_cache(tmp_path / "trajectoires.npz")
+
+    recharge = SimulateurBille()
+    assert recharge.charger_cache(chemin) == 3
+    for (cle, attendu), (cle_rechargee, resultat) in zip(moteur.cache.elements(), recharge.cache.elements()):
+        assert cle_rechargee == cle
+        for champ in bille.CHAMPS_RESULTAT:
+            np.testing.assert_array_equal(resultat[champ], attendu[champ])
+    # Les entrées rechargées servent sans recalcul
+    recharge.obtenir_details_numeriques((1.0, 0.0, 0.0), 84.0, modele="3d")
+    assert recharge.cache.succes == 1 and recharge.cache.echecs == 0
+
+
+def test_cache_npz_ignore(tmp_path, monkeypatch):
+    moteur = SimulateurBille()
+    moteur.precalculer([(48.8462, 68.0)])
+    moteur.obtenir_details_numeriques((1.0, 0.0, 0.0), 84.0, modele="atmosphere")
+    chemin = moteur.sauvegarder_cache(tmp_path / "trajectoires.npz")
+
+    # Autre profil de vent : seule l'entrée analytique reste valable
+    assert SimulateurBille(couches_vent=[(0.0, 5.0, 0.0)]).charger_cache(chemin) == 1
+    # Autre amplification : rien n'est repris
+    autre = SimulateurBille()
+    autre.amplification = 10
+    assert autre.charger_cache(chemin) == 0
+    # Fichier d'une autre version, puis fichier absent
+    monkeypatch.setattr(bille, "VERSION_CACHE_TRAJECTOIRES", bille.VERSION_CACHE_TRAJECTOIRES + 1)
+    assert SimulateurBille().charger_cache(chemin) == 0
+    assert SimulateurBille().charger_cache(tmp_path / "absent.npz") == 0
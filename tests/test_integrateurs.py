@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from utils import integrateurs
+
+GRAVITE = np.array([0.0, 0.0, -9.81])
+OMEGA = np.array([0.0, 3e-2, 5e-2])  # rotation exagérée pour que Coriolis domine l'erreur
+
+
+def coriolis(pos, v):
+    return GRAVITE - 2 * integrateurs.produit_vectoriel(OMEGA, v)
+
+
+def integrer(pas, duree, n_pas):
+    pos, v = np.zeros(3), np.array([1.0, 0.0, 2.0])
+    dt = duree / n_pas
+    for _ in range(n_pas):
+        pos, v = pas(pos, v, dt)
+    return pos
+
+
+def ordre_observe(pas, reference, duree=4.0):
+    # Erreur divisée par 2^p quand le pas est divisé par 2
+    erreurs = [np.linalg.norm(integrer(pas, duree, n) - reference) for n in (50, 100, 200)]
+    return np.log2(erreurs[0] / erreurs[1]), np.log2(erreurs[1] / erreurs[2])
+
+
+@pytest.fixture(scope="module")
+def reference():
+    return integrer(lambda p, v, dt: integrateurs.pas_rk4(p, v, dt, coriolis), 4.0, 20_000)
+
+
+def test_produit_vectoriel_identique_a_numpy():
+    a, b = np.random.default_rng(0).normal(size=(2, 5, 3))
+    np.testing.assert_allclose(integrateurs.produit_vectoriel(a, b), np.cross(a, b))
+
+
+def test_rk4_ordre_4(reference):
+    ordres = ordre_observe(lambda p, v, dt: integrateurs.pas_rk4(p, v, dt, coriolis), reference)
+    assert ordres == pytest.approx((4, 4), abs=0.2)
+
+
+def test_boris_ordre_2(reference):
+    ordres = ordre_observe(lambda p, v, dt: integrateurs.pas_boris(p, v, dt, lambda _: GRAVITE, OMEGA), reference)
+    assert ordres == pytest.approx((2, 2), abs=0.2)
+
+
+def test_boris_conserve_la_vitesse_sans_gravite():
+    # Coriolis ne travaille pas : la rotation de Boris garde |v| au pas près
+    pos, v = np.zeros(3), np.array([1.0, 2.0, 3.0])
+    for _ in range(1000):
+        pos, v = integrateurs.pas_boris(pos, v, 0.5, lambda _: np.zeros(3), OMEGA)
+    assert np.linalg.norm(v) == pytest.approx(np.sqrt(14), rel=1e-12)
+
+
+def test_dormand_prince_erreur_locale():
+    pos, v = np.zeros(3), np.array([1.0, 0.0, 2.0])
+    p_ref = integrer(lambda p, v, dt: integrateurs.pas_rk4(p, v, dt, coriolis), 0.1, 100)
+    p_suiv, _, erreur = integrateurs.pas_dormand_prince(pos, v, 0.1, coriolis)
+    assert np.linalg.norm(p_suiv - p_ref) < 1e-9
+    assert erreur.shape == (6,)
+
+
+def test_impact_plan_exact_pour_une_parabole():
+    # Chute libre : trajectoire cubique par morceaux, reproduite exactement par Hermite
+    p0 = np.array([[0.0, 0.0, 1.0], [0.0, 0.0, 0.3]])
+    v0 = np.array([[0.5, 0.0, 0.0], [0.0, 1.0, -2.0]])
+    dt = 0.5
+    p1 = p0 + v0 * dt + 0.5 * GRAVITE * dt**2
+    v1 = v0 + GRAVITE * dt
+
+    impact, s = integrateurs.point_impact_plan(p0, v0, p1, v1, dt)
+
+    # Racine de z0 + vz·t - g t²/2 = 0
+    t = (v0[:, 2] + np.sqrt(v0[:, 2] ** 2 + 2 * 9.81 * p0[:, 2])) / 9.81
+    np.testing.assert_allclose(s, t / dt, rtol=1e-9)
+    np.testing.assert_allclose(impact, p0 + v0 * t[:, None] + 0.5 * GRAVITE * t[:, None] ** 2, atol=1e-9)
+
+
+def test_impact_sphere_en_ligne_droite():
+    rayon = 10.0
+    p0 = np.array([[0.0, 0.0, 12.0], [11.0, 0.0, 0.0]])
+    v0 = np.array([[0.0, 0.0, -4.0], [-4.0, 0.0, 0.0]])
+    p1, v1 = p0 + v0, v0
+
+    impact, s = integrateurs.point_impact(p0, v0, p1, v1, 1.0, rayon)
+
+    np.testing.assert_allclose(s, [0.5, 0.25], rtol=1e-9)
+    np.testing.assert_allclose(np.linalg.norm(impact, axis=1), rayon, rtol=1e-9)
@@ -0,0 +1,51 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import numpy as np
+import pytest
+
+from utils.montecarlo import CampagneMonteCarlo, StatistiquesFlux
+
+
+def test_statistiques_flux_identiques_a_numpy():
+    valeurs = np.random.default_rng(1).normal(8.0, 2.5, 10_001)
+    # Lots de tailles inégales, dont un vide et un d'une seule valeur
+    flux = StatistiquesFlux()
+    for lot in np.split(valeurs, [0, 1, 37, 5000, 5001]):
+        flux.ajouter(lot)
+
+    assert flux.n == valeurs.size
+    assert flux.moyenne == pytest.approx(np.mean(valeurs), rel=1e-12)
+    assert flux.ecart_type == pytest.approx(np.std(valeurs, ddof=1), rel=1e-12)
+    assert (flux.minimum, flux.maximum) == (valeurs.min(), valeurs.max())
+    assert flux.histogramme.sum() + flux.sous + flux.dessus == valeurs.size
+
+
+def test_fusion_independante_de_l_ordre():
+    a, b = np.random.default_rng(2).normal(1e3, 1e-3, (2, 1000))
+    ab, ba = StatistiquesFlux(), StatistiquesFlux()
+    for flux, lots in ((ab, (a, b)), (ba, (b, a))):
+        for lot in lots:
+            partiel = StatistiquesFlux()
+            partiel.ajouter(lot)
+            flux.fusionner(partiel)
+
+    tout = np.concatenate((a, b))
+    for flux in (ab, ba):
+        assert flux.moyenne == pytest.approx(np.mean(tout), rel=1e-12)
+        assert flux.variance == pytest.approx(np.var(tout, ddof=1), rel=1e-6)
+
+
+def test_lot_en_echec_annule_la_campagne():
+    campagne = CampagneMonteCarlo(n_lancers=40, taille_lot=10, n_pas=5, taille_echantillon=10)
+    # Taille de lot négative : le tirage aléatoire échoue dans le travailleur
+    graine, _, perturbations, n_pas, n_echantillon = campagne.arguments[1]
+    campagne.arguments[1] = (graine, -1, perturbations, n_pas, n_echantillon)
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        futures = campagne.soumettre(pool)
+        wait(futures)
+        campagne.recuperer()
+
+    assert campagne.erreur is not None and "ValueError" in campagne.erreur
+    assert not campagne.termine
+    assert campagne.recuperer() < 1.0
@@ -0,0 +1,34 @@
+import pytest
+
+from utils import noyau
+
+# Cas de référence partagés avec `python -m utils.noyau` : pas fixes de
+# SimulateurCoriolis et ModeleChute3D.integrer (sans, avec traînée, atmosphère)
+CAS = noyau._cas_verification()
+
+
+@pytest.fixture
+def backend_restaure(monkeypatch):
+    # choisir_backend modifie le backend de tout le processus : rétabli après chaque test
+    monkeypatch.setattr(noyau, "_actif", noyau._actif)
+
+
+@pytest.mark.parametrize("nom", list(noyau.BACKENDS))
+@pytest.mark.parametrize("calculer", [calculer for _, calculer in CAS], ids=[cas for cas, _ in CAS])
+def test_backend_identique_a_numpy(nom, calculer, backend_restaure):
+    if nom not in noyau.backends_disponibles():
+        pytest.skip(f"backend {nom!r} indisponible ({noyau.BACKENDS[nom].installation})")
+    reference = calculer(noyau.choisir_backend("numpy"))
+    resultat = calculer(noyau.choisir_backend(nom))
+    assert noyau.ecart_relatif(reference, resultat) <= noyau.TOLERANCE_VERIFICATION
+
+
+def test_ecart_relatif_detecte_une_difference():
+    assert noyau.ecart_relatif([[1.0, 2.0]], [[1.0, 2.0]]) == 0.0
+    assert noyau.ecart_relatif([[1.0, 2.0]], [[1.0, 2.1]]) == pytest.approx(0.05)
+    assert noyau.ecart_relatif([[1.0, 2.0]], [[1.0, 2.0, 3.0]]) == float("inf")
+
+
+def test_choisir_backend_inconnu(backend_restaure):
+    with pytest.raises(ValueError):
+        noyau.choisir_backend("fortran")
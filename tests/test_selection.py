@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+import pyvista as pv
+
+from utils.selection import coordonnees_geographiques, intersection_rayon_sphere
+
+
+def test_nord_de_la_texture_en_moins_z():
+    # texture_map_to_sphere : v = 1 (haut de la carte, le Nord) au pôle -Z
+    sphere = pv.Sphere(radius=1.0).texture_map_to_sphere()
+    pole_sud = np.argmax(sphere.points[:, 2])
+    assert sphere.active_texture_coordinates[pole_sud, 1] == pytest.approx(0.0)
+    assert coordonnees_geographiques((0.0, 0.0, -1.0))[0] == pytest.approx(90.0)
+    assert coordonnees_geographiques((0.0, 0.0, 1.0))[0] == pytest.approx(-90.0)
+
+
+def test_latitude_d_un_point_de_la_sphere():
+    latitude = np.radians(48.85)
+    point = (np.cos(latitude), 0.0, -np.sin(latitude))
+    assert coordonnees_geographiques(point)[0] == pytest.approx(48.85)
+
+
+def test_intersection_rayon_sphere():
+    point = intersection_rayon_sphere((0.0, 0.0, 5.0), (0.0, 0.0, -1.0))
+    np.testing.assert_allclose(point, (0.0, 0.0, 1.0))
+    assert intersection_rayon_sphere((0.0, 2.0, 5.0), (0.0, 0.0, -1.0)) is None
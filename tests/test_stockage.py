@@ -0,0 +1,61 @@
+import numpy as np
+
+from utils.stockage import StockageTrajectoire
+
+
+def points(n, forme=(3,)):
+    return np.arange(n * int(np.prod(forme)), dtype=float).reshape((n,) + forme)
+
+
+def test_agrandissement_par_doublement():
+    stockage = StockageTrajectoire((2, 3), capacite=4)
+    attendus = points(11, (2, 3))
+    for point in attendus[:5]:
+        stockage.ajouter(point)
+    assert stockage.capacite == 8
+    stockage.etendre(attendus[5:])
+    assert stockage.capacite == 16
+
+    assert len(stockage) == 11 and stockage.nbytes == 11 * 6 * 8
+    np.testing.assert_array_equal(stockage.donnees, attendus)
+    np.testing.assert_array_equal(np.asarray(stockage), attendus)
+    # `donnees` est une vue du tampon, sans copie
+    assert np.shares_memory(stockage.donnees, stockage.tampon)
+
+    stockage.reserver(100)
+    assert stockage.capacite == 100
+    np.testing.assert_array_equal(stockage.donnees, attendus)
+
+
+def test_float32_divise_la_memoire():
+    stockage = StockageTrajectoire(dtype=np.float32)
+    stockage.etendre(points(10))
+    assert stockage.donnees.dtype == np.float32 and stockage.nbytes == 10 * 3 * 4
+
+
+def test_fichier_projete(tmp_path):
+    chemin = tmp_path / "trajectoire.bin"
+    stockage = StockageTrajectoire(capacite=2, chemin=chemin)
+    attendus = points(300)
+    stockage.etendre(attendus[:1])
+    for point in attendus[1:]:
+        stockage.ajouter(point)
+
+    assert isinstance(stockage.tampon, np.memmap)
+    assert chemin.stat().st_size == stockage.capacite * 3 * 8
+    np.testing.assert_array_equal(stockage.donnees, attendus)
+
+    # À la fermeture, le fichier ne garde que les points stockés
+    stockage.fermer()
+    assert chemin.stat().st_size == 300 * 3 * 8
+    np.testing.assert_array_equal(StockageTrajectoire.relire(chemin), attendus)
+
+
+def test_fichier_existant_ecrase(tmp_path):
+    chemin = tmp_path / "trajectoire.bin"
+    chemin.write_bytes(b"\xff" * 1000)
+    # Un fichier existant est écrasé : seuls les nouveaux points sont relus
+    stockage = StockageTrajectoire(capacite=4, chemin=chemin)
+    stockage.etendre(points(3))
+    stockage.fermer()
+    np.testing.assert_array_equal(StockageTrajectoire.relire(chemin), points(3))
@@ -0,0 +1,85 @@
+import time
+from PyQt5 import QtCore
+
+
+class PlanificateurAnimation(QtCore.QObject):
+    """
+    Anime une suite d'images sur une durée fixe, cadencée par un QTimer.
+
+    À chaque tic, l'image affichée est déduite du temps réellement écoulé :
+    si le rendu prend du retard, des images sont sautées au lieu de ralentir
+    le temps simulé. Le rappel reçoit (premier, dernier) : la plage des indices
+    atteints depuis le tic précédent, pour ajouter d'un coup les points sautés.
+    """
+
+    def __init__(self, fps_cible=60, parent=None):
+        super().__init__(parent)
+        self.fps_cible = fps_cible
+        self.timer = QtCore.QTimer(self)
+        self.timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self.timer.timeout.connect(self._tic)
+
+        self._rappel_image = None
+        self._rappel_fin = None
+        self._n_images = 0
+        self._periode = 0.0
+        self._debut = 0.0
+        self._dernier = -1
+
+    @property
+    def en_cours(self):
+        return self.timer.isActive()
+
+    def demarrer(self, n_images, duree, rappel_image, rappel_fin=None):
+        """Lance une nouvelle animation, en annulant celle en cours s'il y en a une."""
+        self.arreter()
+        self._n_images = n_images
+        # Durée d'une image : elle reste fixe si le nombre d'images est ajusté ensuite
+        self._periode = max(duree, 1e-6) / max(n_images - 1, 1)
+        self._rappel_image = rappel_image
+        self._rappel_fin = rappel_fin
+        self._dernier = -1
+        self._debut = time.perf_counter()
+        self.timer.start(max(1, int(1000 / self.fps_cible)))
+        # Première image affichée immédiatement, sans attendre le premier tic
+        self._tic()
+
+    def ajuster(self, n_images):
+        """
+        Change le nombre d'images de l'animation en cours, à cadence inchangée
+        (flux progressif dont la durée n'est connue qu'à la fin du calcul).
+        """
+        self._n_images = n_images
+        self._dernier = min(self._dernier, n_images - 1)
+
+    def recaler(self, dernier):
+        """
+        Ramène l'animation en cours à l'image `dernier`, la dernière réellement
+        affichée : quand les données manquent (calcul en retard), l'animation
+        attend au lieu de sauter des images ou de se terminer trop tôt.
+        """
+        self._dernier = dernier
+        self._debut = time.perf_counter() - max(dernier, 0) * self._periode
+
+    def arreter(self):
+        """Annule l'animation en cours (aucun rappel n'est appelé ensuite)."""
+        self.timer.stop()
+        self._rappel_image = None
+        self._rappel_fin = None
+
+    def _tic(self):
+        if self._rappel_image is None:
+            return
+        ecoule = time.perf_counter() - self._debut
+        indice = min(self._n_images - 1, int(ecoule / self._periode))
+
+        if indice > self._dernier:
+            premier = self._dernier + 1
+            self._dernier = indice
+            self._rappel_image(premier, indice)
+
+        if self._dernier >= self._n_images - 1:
+            rappel_fin = self._rappel_fin
+            self.arreter()
+            if rappel_fin is not None:
+                rappel_fin()
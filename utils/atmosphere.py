@@ -0,0 +1,156 @@
+"""
+Atmosphère tabulée pour les chutes de haute altitude.
+
+Masse volumique de l'atmosphère type internationale (ISA), gravité selon
+l'altitude et profil de vent en couches optionnel sont évalués une fois sur
+une grille régulière d'altitudes, puis interpolés linéairement : la grille
+étant régulière, l'indice est z / pas (pas de recherche), et une seule
+interpolation donne toutes les colonnes pour tout un lot de billes.
+
+Les tables sont écrites dans le dossier de cache (utils.cache.dossier_cache)
+et relues aux lancements suivants.
+"""
+
+import hashlib
+import json
+
+import numpy as np
+
+from utils import noyau
+from utils.cache import dossier_cache
+
+# Grille des tables : altitudes 0 … Z_MAX par pas de PAS_TABLE (m). L'erreur
+# d'interpolation de la densité est de l'ordre de (pas / 8 km)² / 8, soit 5e-8.
+Z_MAX = 20000.0
+PAS_TABLE = 5.0
+VERSION_CACHE_ATMOSPHERE = 1
+
+# Atmosphère type : niveau de la mer, gradient de la troposphère, tropopause isotherme
+T0 = 288.15  # K
+P0 = 101325.0  # Pa
+GRADIENT_T = 0.0065  # K/m
+Z_TROPOPAUSE = 11000.0  # m
+R_AIR = 287.05287  # J/(kg·K)
+G_ISA = 9.80665  # m/s² (gravité de référence de la loi de pression)
+
+# Colonnes de TablesAtmosphere.table
+COLONNES = ("densite", "gravite", "vent_est", "vent_nord")
+
+# Exemple de profil de vent en couches : (altitude (m), vent Est (m/s), vent Nord (m/s)),
+# interpolé linéairement entre les couches et constant au-delà
+PROFIL_VENT_EXEMPLE = (
+    (0.0, 2.0, 0.0),
+    (1000.0, 8.0, 1.0),
+    (5000.0, 20.0, 3.0),
+    (10000.0, 35.0, 5.0),
+)
+
+
+def densite_isa(z):
+    """Masse volumique (kg/m³) de l'atmosphère type à l'altitude z (m), valable jusqu'à 20 km."""
+    z = np.maximum(np.asarray(z, dtype=float), 0.0)
+    # 1. Température : décroissance linéaire, puis constante au-dessus de la tropopause
+    temperature = T0 - GRADIENT_T * np.minimum(z, Z_TROPOPAUSE)
+    # 2. Pression : loi polytropique, puis exponentielle dans la couche isotherme
+    pression = P0 * (temperature / T0) ** (G_ISA / (R_AIR * GRADIENT_T))
+    pression = pression * np.exp(-G_ISA * np.maximum(z - Z_TROPOPAUSE, 0.0) / (R_AIR * temperature))
+    return pression / (R_AIR * temperature)
+
+
+def gravite_altitude(z, g, R_terre):
+    """Gravité à l'altitude z : g·(R / (R + z))²."""
+    return g * (R_terre / (R_terre + np.asarray(z, dtype=float)))**2
+
+
+def profil_vent(z, couches):
+    """Vent (Est, Nord) (..., 2) à l'altitude z, interpolé entre les couches (altitude, Est, Nord)."""
+    couches = np.asarray(couches, dtype=float).reshape(-1, 3)
+    couches = couches[np.argsort(couches[:, 0])]
+    z = np.asarray(z, dtype=float)
+    return np.stack((np.interp(z, couches[:, 0], couches[:, 1]),
+                     np.interp(z, couches[:, 0], couches[:, 2])), axis=-1)
+
+
+class TablesAtmosphere:
+    """
+    Tables (n, 4) densité, gravité, vent Est, vent Nord aux altitudes 0, pas, 2·pas, …
+
+    En dessous de 0 et au-dessus de la dernière altitude, les valeurs sont celles
+    du bord de la table.
+    """
+
+    def __init__(self, table, pas):
+        self.table = np.ascontiguousarray(table, dtype=float)
+        self.pas = float(pas)
+        self.n = len(self.table)
+        self.z_max = self.pas * (self.n - 1)
+        self.avec_vent = bool(np.any(self.table[:, 2:]))
+
+    @classmethod
+    def construire(cls, g=noyau.G, R_terre=noyau.R_TERRE, couches_vent=None, z_max=Z_MAX, pas=PAS_TABLE):
+        """Évalue les modèles sur la grille (calcul complet, sans cache)."""
+        z = np.linspace(0.0, z_max, int(round(z_max / pas)) + 1)
+        table = np.zeros((z.size, 4))
+        table[:, 0] = densite_isa(z)
+        table[:, 1] = gravite_altitude(z, g, R_terre)
+        if couches_vent is not None:
+            table[:, 2:] = profil_vent(z, couches_vent)
+        return cls(table, z_max / (z.size - 1))
+
+    def interpoler(self, z):
+        """Colonnes (..., 4) interpolées aux altitudes z (une seule interpolation pour toutes)."""
+        s = np.clip(np.asarray(z, dtype=float) / self.pas, 0.0, self.n - 1.0)
+        i = np.minimum(s.astype(np.intp), self.n - 2)
+        f = (s - i)[..., None]
+        return self.table[i] * (1 - f) + self.table[i + 1] * f
+
+    def densite(self, z):
+        return self.interpoler(z)[..., 0]
+
+    def gravite(self, z):
+        return self.interpoler(z)[..., 1]
+
+    def vent(self, z):
+        """Vent horizontal (..., 3) à l'altitude z (composante verticale nulle)."""
+        colonnes = self.interpoler(z)
+        return np.concatenate((colonnes[..., 2:], np.zeros_like(colonnes[..., :1])), axis=-1)
+
+
+def empreinte_atmosphere(g=noyau.G, R_terre=noyau.R_TERRE, couches_vent=None, z_max=Z_MAX, pas=PAS_TABLE):
+    """
+    Empreinte (16 caractères hexadécimaux) des paramètres des tables, sans les construire :
+    des profils de vent ou des grilles différents ont des empreintes différentes.
+    """
+    meta = {
+        "version": VERSION_CACHE_ATMOSPHERE, "g": g, "R_terre": R_terre, "z_max": z_max, "pas": pas,
+        "vent": None if couches_vent is None else np.asarray(couches_vent, dtype=float).tolist(),
+    }
+    return hashlib.sha1(json.dumps(meta, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def charger_atmosphere(g=noyau.G, R_terre=noyau.R_TERRE, couches_vent=None, z_max=Z_MAX, pas=PAS_TABLE):
+    """
+    TablesAtmosphere pour ces paramètres, via le cache disque.
+
+    Le fichier est nommé d'après l'empreinte des paramètres (empreinte_atmosphere) :
+    des profils de vent différents ont chacun leur table. Un cache illisible est reconstruit.
+    """
+    empreinte = empreinte_atmosphere(g, R_terre, couches_vent, z_max, pas)
+    chemin = dossier_cache() / "atmosphere" / f"{empreinte}.npy"
+    n = int(round(z_max / pas)) + 1
+
+    try:
+        table = np.load(chemin)
+        if table.shape == (n, len(COLONNES)):
+            return TablesAtmosphere(table, z_max / (n - 1))
+    except (OSError, ValueError):
+        pass
+
+    # Cache absent ou illisible : on construit puis on l'écrit
+    tables = TablesAtmosphere.construire(g, R_terre, couches_vent, z_max, pas)
+    try:
+        chemin.parent.mkdir(parents=True, exist_ok=True)
+        np.save(chemin, tables.table)
+    except OSError:
+        pass
+    return tables
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Mode batch (sans interface graphique) : études paramétriques de la déviation vers l'Est.
+
+Exemples :
+    python -m utils.batch --latitudes 0:90:0.5 --altitudes 10,84,1000 --sortie res.csv
+    python -m utils.batch --latitudes=-89:89:0.1 --altitudes 1:10000:1 --sortie res.npy
+
+(les valeurs négatives s'écrivent avec "=", comme ci-dessus)
+
+Aucun module graphique (PyQt5, PyVista, Matplotlib) n'est importé : seules les
+formules de SimulateurBille (identiques à celles de l'expérience Flammarion) sont
+utilisées. Les résultats sont écrits bloc par bloc, la mémoire reste constante
+quel que soit le nombre de scénarios.
+"""
+
+import argparse
+import csv
+import sys
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+from utils import noyau
+from utils.bille import SimulateurBille
+
+COLONNES = (
+    "latitude_deg",
+    "altitude_m",
+    "amplification",
+    "temps_vol_s",
+    "deviation_mm",
+    "force_coriolis_max",
+    "deviation_visuelle_m",
+)
+
+
+def lire_valeurs(texte):
+    """Lit une liste "a,b,c" ou une plage inclusive "debut:fin:pas"."""
+    if ":" in texte:
+        debut, fin, pas = (float(v) for v in texte.split(":"))
+        if pas <= 0:
+            raise argparse.ArgumentTypeError(f"Pas invalide dans {texte!r}")
+        return np.arange(debut, fin + pas / 2, pas)
+    return np.array([float(v) for v in texte.split(",") if v.strip()])
+
+
+def iterer_blocs(moteur, latitudes, altitudes, amplifications, octets_max=64 * 2**20):
+    """Produit les lignes de résultats par blocs (tableaux (n_lignes, len(COLONNES)))."""
+    t_vol = noyau.temps_vol(altitudes, moteur.g)
+    for amplification in amplifications:
+        for tranche, dev_mm, force in moteur.iterer_grille(latitudes, altitudes, octets_max // 4):
+            n_lat = dev_mm.shape[0]
+            bloc = np.empty((n_lat, altitudes.size, len(COLONNES)))
+            bloc[..., 0] = latitudes[tranche, None]
+            bloc[..., 1] = altitudes
+            bloc[..., 2] = amplification
+            bloc[..., 3] = t_vol
+            bloc[..., 4] = dev_mm
+            bloc[..., 5] = force
+            bloc[..., 6] = dev_mm / 1000 * amplification
+            yield bloc.reshape(-1, len(COLONNES))
+
+
+class _EcrivainCsv:
+    def __init__(self, chemin, n_lignes):
+        self.fichier = open(chemin, "w", newline="")
+        csv.writer(self.fichier).writerow(COLONNES)
+
+    def ecrire(self, bloc):
+        np.savetxt(self.fichier, bloc, delimiter=",", fmt="%.10g")
+
+    def fermer(self):
+        self.fichier.close()
+
+
+class _EcrivainNpy:
+    """Tableau .npy projeté en mémoire (lisible ensuite avec np.load(..., mmap_mode="r"))."""
+
+    def __init__(self, chemin, n_lignes):
+        self.tableau = np.lib.format.open_memmap(
+            chemin, mode="w+", dtype=np.float64, shape=(n_lignes, len(COLONNES))
+        )
+        self.position = 0
+
+    def ecrire(self, bloc):
+        self.tableau[self.position:self.position + len(bloc)] = bloc
+        self.position += len(bloc)
+
+    def fermer(self):
+        self.tableau.flush()
+        del self.tableau
+
+
+class _EcrivainNpz:
+    """Archive .npz écrite en flux : l'en-tête .npy puis les blocs, directement dans le zip."""
+
+    def __init__(self, chemin, n_lignes):
+        self.zip = zipfile.ZipFile(chemin, "w", compression=zipfile.ZIP_STORED, allowZip64=True)
+        with self.zip.open("colonnes.npy", "w") as f:
+            np.lib.format.write_array(f, np.array(COLONNES))
+        self.flux = self.zip.open("resultats.npy", "w", force_zip64=True)
+        np.lib.format.write_array_header_2_0(self.flux, {
+            "descr": np.lib.format.dtype_to_descr(np.dtype(np.float64)),
+            "fortran_order": False,
+            "shape": (n_lignes, len(COLONNES)),
+        })
+
+    def ecrire(self, bloc):
+        self.flux.write(np.ascontiguousarray(bloc, dtype=np.float64).tobytes())
+
+    def fermer(self):
+        self.flux.close()
+        self.zip.close()
+
+
+ECRIVAINS = {".csv": _EcrivainCsv, ".npy": _EcrivainNpy, ".npz": _EcrivainNpz}
+
+
+def executer(latitudes, altitudes, amplifications, sortie, octets_max=64 * 2**20):
+    """Calcule tous les scénarios et les écrit dans `sortie`. Retourne le nombre de lignes."""
+    sortie = Path(sortie)
+    if sortie.suffix not in ECRIVAINS:
+        raise ValueError(f"Format de sortie non pris en charge : {sortie.suffix!r} (choix : .csv, .npy, .npz)")
+
+    moteur = SimulateurBille(taille_cache=0)
+    n_lignes = latitudes.size * altitudes.size * amplifications.size
+    ecrivain = ECRIVAINS[sortie.suffix](sortie, n_lignes)
+    try:
+        for bloc in iterer_blocs(moteur, latitudes, altitudes, amplifications, octets_max):
+            ecrivain.ecrire(bloc)
+    finally:
+        ecrivain.fermer()
+    return n_lignes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Calcul sans interface de la déviation vers l'Est (formules de SimulateurBille)."
+    )
+    parser.add_argument("--latitudes", type=lire_valeurs, required=True,
+                        help='latitudes en degrés : "a,b,c" ou "debut:fin:pas"')
+    parser.add_argument("--altitudes", type=lire_valeurs, required=True,
+                        help='altitudes de départ en mètres : "a,b,c" ou "debut:fin:pas"')
+    parser.add_argument("--amplifications", type=lire_valeurs, default=np.array([100.0]),
+                        help="facteurs d'amplification visuelle (défaut : 100)")
+    parser.add_argument("--sortie", required=True, help="fichier de sortie (.csv, .npy ou .npz)")
+    parser.add_argument("--memoire-max", type=float, default=64,
+                        help="taille maximale d'un bloc en Mo (défaut : 64)")
+    args = parser.parse_args(argv)
+
+    try:
+        n_lignes = executer(args.latitudes, args.altitudes, args.amplifications, args.sortie,
+                            octets_max=int(args.memoire_max * 2**20))
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"{n_lignes} scénarios écrits dans {args.sortie}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,65 +1,419 @@
+import threading
+
 import numpy as np
 
+from utils import noyau
+from utils.atmosphere import charger_atmosphere, empreinte_atmosphere
+from utils.cache import CacheLRU, dossier_cache
+from utils.chute3d import ModeleChute3D
+from utils.reechantillonnage import nombre_echantillons
+
+# Champs d'une entrée du cache de trajectoires
+CHAMPS_RESULTAT = (
+    "t", "x_id", "z_id", "x_co", "z_co", "force_mag",
+    "latitude", "temps_vol", "deviation_mm", "deviation_sud_mm", "ecart_analytique_mm",
+)
+
+# Colonnes des blocs de iterer_donnees (tableaux retournés par calculer_donnees)
+COLONNES = CHAMPS_RESULTAT[:6]
+
+# Modèles disponibles : formule du premier ordre, intégration 3D complète (air au
+# niveau de la mer), ou intégration 3D dans l'atmosphère tabulée (densité ISA, gravité
+# et vent selon l'altitude, voir utils.atmosphere)
+MODELES = ("analytique", "3d", "atmosphere")
+
+# Version du fichier de cache des trajectoires, à incrémenter quand un calcul
+# change de résultat ou de format (2 : pas des modèles intégrés tiré du temps de vol
+# estimé ; 3 : variante des paramètres du modèle dans la clé, voir SimulateurBille._variante)
+VERSION_CACHE_TRAJECTOIRES = 3
+
+# Échantillons par bloc du calcul progressif (iterer_donnees)
+TAILLE_BLOC = 64
+
+# Nombre de pas RK4 des modèles intégrés pour un clic (écart au point d'impact de
+# l'ordre du nm jusqu'à 1000 m, quelques µm à 10 000 m)
+N_PAS_3D = 100
+
+# Résolution du modèle analytique : l'interpolation linéaire entre deux échantillons
+# reste à moins de TOLERANCE_ECHANTILLONNAGE (m, repère visuel) des courbes exactes.
+# L'affichage rééchantillonne ensuite à sa propre cadence (voir utils.reechantillonnage).
+TOLERANCE_ECHANTILLONNAGE = 1e-3
+N_ECHANTILLONS_MIN = 50
+
+# Scénarios précalculés au démarrage si aucun cache disque n'existe :
+# altitude par défaut de l'interface et quelques expériences historiques
+SCENARIOS_COURANTS = (
+    [(lat, 84.0) for lat in range(-80, 81, 5)]
+    + [(48.8462, 68.0), (48.86, 84.0), (50.92, 158.5), (42.38, 23.0)]
+)
+
+
 class SimulateurBille:
-    def __init__(self, flip_latitude=False):
+    def __init__(self, flip_latitude=False, taille_cache=256, modele="analytique", couches_vent=None):
         # Constantes physiques
-        self.g = 9.81                  # Accélération de la pesanteur (m/s²)
-        self.omega = 7.2921e-5         # Vitesse angulaire de la Terre (rad/s)
-        self.R_terre = 6371000         # Rayon moyen de la Terre (m)
-        
+        self.g = noyau.G                   # Accélération de la pesanteur (m/s²)
+        self.omega = noyau.OMEGA_TERRE     # Vitesse angulaire de la Terre (rad/s)
+        self.R_terre = noyau.R_TERRE       # Rayon moyen de la Terre (m)
+
         # Paramètres de simulation
         self.amplification = 100       # Facteur pour rendre la déviation visible à l'œil
         # Si True, on inverse le signe de la latitude (utile si le maillage du globe
         # a l'axe Z inversé par rapport à la convention géographique)
         self.flip_latitude = flip_latitude
 
-    def calculer_donnees(self, point_globe, h_saisie):
-        """
-        Calcule les trajectoires et les vecteurs forces en fonction 
-        de la position sur le globe et de l'altitude choisie.
-        """
-        # 1. Extraction de la latitude à partir des coordonnées cartésiennes du globe
+        # Modèle physique par défaut ; le modèle 3D (Coriolis complet, centrifuge,
+        # gravité variable, traînée de l'air) corrige la formule aux grandes altitudes
+        self.modele = modele
+        self.modele_3d = ModeleChute3D(g=self.g, omega=self.omega, R_terre=self.R_terre, trainee=True)
+        # Modèle atmosphère créé à sa première utilisation (voir modele_atmosphere) ;
+        # `couches_vent` : profil de vent optionnel, voir utils.atmosphere.profil_vent
+        self.couches_vent = couches_vent
+        self.empreinte_atmosphere = empreinte_atmosphere(self.g, self.R_terre, couches_vent)
+        self._modele_atmosphere = None
+        self._verrou_atmosphere = threading.Lock()
+
+        # Cache des résultats, indexé par (latitude, altitude, amplification, modèle) quantifiés.
+        # Deux clics dans la même bande de latitude à la même altitude réutilisent le calcul.
+        self.pas_latitude = 0.1        # degrés
+        self.pas_altitude = 0.1        # mètres
+        self.cache = CacheLRU(taille_cache)
+
+    def _latitude_deg(self, point_globe):
+        """Latitude (degrés) à partir des coordonnées cartésiennes du globe."""
         x, y, z = point_globe
         # Calcul robuste de la latitude : atan2(z, sqrt(x^2+y^2)).
-        base_lat = np.arctan2(z, np.sqrt(x**2 + y**2))
-        latitude_rad = -base_lat if self.flip_latitude else base_lat
-        
-        # 2. Calcul du temps de vol théorique : t = sqrt(2h/g)
-        t_vol = np.sqrt(2 * h_saisie / self.g)
-        t = np.linspace(0, t_vol, 200)
-
-        # 3. Trajectoire Idéale (Chute parfaitement verticale)
-        # Équation : z(t) = h - 1/2 * g * t²
-        z_id = h_saisie - 0.5 * self.g * t**2
-        x_id = np.zeros_like(t)
-        
-        # 4. Trajectoire Coriolis (Déviation vers l'Est)
-        # Équation simplifiée de la déviation : d = 1/3 * omega * cos(lat) * g * t³
-        x_co = (1/3) * self.omega * np.cos(latitude_rad) * self.g * (t**3) * self.amplification
-        z_co = z_id.copy()
-        
-        # 5. Calcul de l'intensité de la force de Coriolis pour l'affichage du vecteur
-        # La force de Coriolis est Fc = -2m(Omega x v). 
-        # Sa composante Est est proportionnelle à cos(lat) * v_verticale
-        # v_verticale = g * t
-        force_mag = 2 * self.omega * np.cos(latitude_rad) * (self.g * t) * (self.amplification * 10)
-        
-        return t, x_id, z_id, x_co, z_co, force_mag
-
-    def obtenir_details_numeriques(self, point_globe, h_saisie):
-        """Calcule les résultats réels (non amplifiés) pour l'affichage texte."""
-        x, y, z = point_globe
         base_lat_deg = np.degrees(np.arctan2(z, np.sqrt(x**2 + y**2)))
-        lat_deg = -base_lat_deg if self.flip_latitude else base_lat_deg
-        
-        t_vol = np.sqrt(2 * h_saisie / self.g)
-        
-        # Calcul de la déviation réelle en mètres (sans amplification)
+        return -base_lat_deg if self.flip_latitude else base_lat_deg
+
+    @property
+    def modele_atmosphere(self):
+        """
+        Modèle 3D dans l'atmosphère tabulée. Les tables sont relues du cache disque (ou
+        construites et écrites) au premier appel seulement : les calculs analytiques et
+        3D n'y touchent pas.
+        """
+        with self._verrou_atmosphere:
+            if self._modele_atmosphere is None:
+                self._modele_atmosphere = ModeleChute3D(
+                    g=self.g, omega=self.omega, R_terre=self.R_terre, trainee=True,
+                    atmosphere=charger_atmosphere(self.g, self.R_terre, self.couches_vent),
+                )
+        return self._modele_atmosphere
+
+    def _modele_integre(self, modele):
+        """ModeleChute3D d'un modèle intégré ("3d", "atmosphere"), None pour la formule analytique."""
+        if modele == "3d":
+            return self.modele_3d
+        if modele == "atmosphere":
+            return self.modele_atmosphere
+        return None
+
+    def _variante(self, modele):
+        """Paramètres du modèle absents du nom : l'empreinte des tables (vent compris) pour "atmosphere"."""
+        return self.empreinte_atmosphere if modele == "atmosphere" else ""
+
+    def _cle(self, lat_deg, h_saisie, modele):
+        return (
+            int(round(lat_deg / self.pas_latitude)),
+            int(round(h_saisie / self.pas_altitude)),
+            self.amplification,
+            modele,
+            self._variante(modele),
+        )
+
+    def _verifier_modele(self, modele):
+        modele = modele or self.modele
+        if modele not in MODELES:
+            raise ValueError(f"Modèle inconnu : {modele!r} (choix : {MODELES})")
+        return modele
+
+    def _resultats(self, lat_deg, h_saisie, modele=None):
+        """Résultats complets pour une latitude et une altitude, via le cache."""
+        modele = self._verifier_modele(modele)
+        if self.cache.taille_max <= 0:
+            return self._calculer(lat_deg, h_saisie, modele)
+
+        cle = self._cle(lat_deg, h_saisie, modele)
+        resultat = self.cache.obtenir(cle)
+        if resultat is None:
+            # On calcule au centre de la cellule pour que le résultat ne dépende
+            # pas du premier clic qui a rempli l'entrée
+            resultat = self._calculer(cle[0] * self.pas_latitude, cle[1] * self.pas_altitude, modele)
+            self.cache.ajouter(cle, resultat)
+        return resultat
+
+    def _calculer(self, lat_deg, h_saisie, modele="analytique"):
+        """Résultat complet : le calcul progressif en un seul bloc."""
+        scalaires = {}
+        blocs = list(self._etapes(lat_deg, h_saisie, modele, None, scalaires))
+        return self._assembler(blocs, scalaires)
+
+    def _etapes(self, lat_deg, h_saisie, modele, taille_bloc, scalaires):
+        """
+        Générateur des blocs de colonnes (voir COLONNES) d'un calcul ; à la fin,
+        `scalaires` contient latitude, temps de vol et déviations.
+        """
+        modele_3d = self._modele_integre(modele)
+        if modele_3d is not None:
+            return self._etapes_3d(lat_deg, h_saisie, modele_3d, taille_bloc, scalaires)
+        return self._etapes_analytique(lat_deg, h_saisie, taille_bloc, scalaires)
+
+    def _etapes_analytique(self, lat_deg, h_saisie, taille_bloc, scalaires):
+        latitude_rad = np.radians(lat_deg)
+
+        # 1. Calcul du temps de vol théorique : t = sqrt(2h/g)
+        t_vol = noyau.temps_vol(h_saisie, self.g)
+        coriolis_max = noyau.acceleration_coriolis(0.0, t_vol, self.g, self.omega)
+        acceleration_max = max(self.g, coriolis_max * self.amplification)
+        n = nombre_echantillons(t_vol, acceleration_max, TOLERANCE_ECHANTILLONNAGE, n_min=N_ECHANTILLONS_MIN)
+        t_tous = np.linspace(0, t_vol, n)
+
+        # 2. Déviation réelle en mètres (sans amplification)
         # $d = \frac{1}{3} \omega \cos(\phi) g t^3$
-        dev_finale_reelle = (1/3) * self.omega * np.cos(np.radians(lat_deg)) * self.g * (t_vol**3)
-        
+        dev_finale_reelle = noyau.deviation_est(latitude_rad, t_vol, self.g, self.omega)
+        scalaires.update({
+            "latitude": np.float64(lat_deg),
+            "temps_vol": np.float64(t_vol),
+            "deviation_mm": np.float64(dev_finale_reelle * 1000),  # Conversion en millimètres
+            "deviation_sud_mm": np.float64(0.0),
+            "ecart_analytique_mm": np.float64(0.0),
+        })
+
+        for debut in range(0, n, taille_bloc or n):
+            t = t_tous[debut:debut + (taille_bloc or n)]
+
+            # 3. Trajectoire Idéale (Chute parfaitement verticale)
+            # Équation : z(t) = h - 1/2 * g * t²
+            z_id = noyau.altitude_chute(h_saisie, t, self.g)
+            x_id = np.zeros_like(t)
+
+            # 4. Trajectoire Coriolis (Déviation vers l'Est)
+            # Équation simplifiée de la déviation : d = 1/3 * omega * cos(lat) * g * t³
+            x_co = noyau.deviation_est(latitude_rad, t, self.g, self.omega) * self.amplification
+            z_co = z_id.copy()
+
+            # 5. Calcul de l'intensité de la force de Coriolis pour l'affichage du vecteur
+            # La force de Coriolis est Fc = -2m(Omega x v).
+            # Sa composante Est est proportionnelle à cos(lat) * v_verticale
+            # v_verticale = g * t
+            force_mag = noyau.acceleration_coriolis(latitude_rad, t, self.g, self.omega) * (self.amplification * 10)
+
+            yield t, x_id, z_id, x_co, z_co, force_mag
+
+    def _etapes_3d(self, lat_deg, h_saisie, modele_3d, taille_bloc, scalaires):
+        """Mêmes colonnes que le modèle analytique, issues de l'intégration 3D complète de `modele_3d`."""
+        latitude_rad = np.radians(lat_deg)
+
+        # Échantillons aux pas d'intégration (le dernier s'arrête exactement au sol)
+        etats = modele_3d.iterer([lat_deg], [h_saisie], n_pas=N_PAS_3D)
+        for t, pos, v, _ in noyau.par_blocs(etats, taille_bloc):
+            t, pos, v = t[:, 0], pos[:, 0], v[:, 0]
+            z_co = pos[:, 2]
+
+            # Composante Est de la force de Coriolis : -2·ω·(cos(lat)·vz - sin(lat)·vy)
+            force_est = -2 * self.omega * (np.cos(latitude_rad) * v[:, 2] - np.sin(latitude_rad) * v[:, 1])
+
+            yield (t, np.zeros_like(t), z_co.copy(), pos[:, 0] * self.amplification, z_co,
+                   force_est * (self.amplification * 10))
+
+        impact = pos[-1]
+        deviation_analytique = noyau.deviation_est(latitude_rad, noyau.temps_vol(h_saisie, self.g),
+                                                   self.g, self.omega)
+        scalaires.update({
+            "latitude": np.float64(lat_deg),
+            "temps_vol": np.float64(t[-1]),
+            "deviation_mm": np.float64(impact[0] * 1000),
+            "deviation_sud_mm": np.float64(-impact[1] * 1000),
+            "ecart_analytique_mm": np.float64((impact[0] - deviation_analytique) * 1000),
+        })
+
+    def _assembler(self, blocs, scalaires):
+        """Résultat complet (dictionnaire du cache) à partir des blocs d'un calcul."""
+        resultat = {champ: np.concatenate(colonne) for champ, colonne in zip(COLONNES, zip(*blocs))}
+        resultat.update(scalaires)
+        return self._proteger(resultat)
+
+    @staticmethod
+    def _proteger(resultat):
+        # Les tableaux peuvent être partagés par le cache : on les protège en écriture
+        for valeur in resultat.values():
+            if isinstance(valeur, np.ndarray):
+                valeur.flags.writeable = False
+        return resultat
+
+    def calculer_donnees(self, point_globe, h_saisie, modele=None):
+        """
+        Calcule les trajectoires et les vecteurs forces en fonction
+        de la position sur le globe et de l'altitude choisie.
+        """
+        r = self._resultats(self._latitude_deg(point_globe), h_saisie, modele)
+        return r["t"], r["x_id"], r["z_id"], r["x_co"], r["z_co"], r["force_mag"]
+
+    def temps_vol_estime(self, h_saisie, modele=None):
+        """Temps de vol connu avant le calcul (exact pour le modèle analytique)."""
+        modele = self._verifier_modele(modele)
+        modele_3d = self._modele_integre(modele)
+        if modele_3d is not None:
+            return float(modele_3d.temps_vol_estime(h_saisie))
+        return float(noyau.temps_vol(h_saisie, self.g))
+
+    def iterer_donnees(self, point_globe, h_saisie, modele=None, taille_bloc=TAILLE_BLOC):
+        """
+        Version progressive de calculer_donnees : générateur de blocs
+        (t, x_id, z_id, x_co, z_co, force_mag), chacun calculé quand il est demandé.
+
+        Le premier bloc arrive après `taille_bloc` échantillons, quelle que soit
+        l'altitude. Un résultat déjà en cache est produit en un seul bloc ; sinon,
+        une fois le dernier bloc consommé, le résultat complet entre dans le cache
+        (obtenir_details_numeriques le retrouve sans recalcul).
+        """
+        lat_deg = self._latitude_deg(point_globe)
+        modele = self._verifier_modele(modele)
+        cle = None
+        if self.cache.taille_max > 0:
+            cle = self._cle(lat_deg, h_saisie, modele)
+            resultat = self.cache.obtenir(cle)
+            if resultat is not None:
+                yield tuple(resultat[champ] for champ in COLONNES)
+                return
+            # Calcul au centre de la cellule du cache, comme _resultats
+            lat_deg, h_saisie = cle[0] * self.pas_latitude, cle[1] * self.pas_altitude
+
+        scalaires = {}
+        blocs = []
+        for bloc in self._etapes(lat_deg, h_saisie, modele, taille_bloc, scalaires):
+            blocs.append(bloc)
+            yield bloc
+        if cle is not None:
+            self.cache.ajouter(cle, self._assembler(blocs, scalaires))
+
+    def obtenir_details_numeriques(self, point_globe, h_saisie, modele=None):
+        """Calcule les résultats réels (non amplifiés) pour l'affichage texte."""
+        r = self._resultats(self._latitude_deg(point_globe), h_saisie, modele)
+        return {
+            "latitude": r["latitude"],
+            "temps_vol": r["temps_vol"],
+            "deviation_mm": r["deviation_mm"],
+            # Nuls pour le modèle analytique
+            "deviation_sud_mm": r["deviation_sud_mm"],
+            "ecart_analytique_mm": r["ecart_analytique_mm"],
+        }
+
+    def precalculer(self, scenarios=SCENARIOS_COURANTS):
+        """Remplit le cache pour une liste de couples (latitude en degrés, altitude)."""
+        for lat_deg, h_saisie in scenarios:
+            self._resultats(lat_deg, h_saisie)
+
+    def sauvegarder_cache(self, chemin=None):
+        """Écrit le contenu du cache dans un fichier .npz."""
+        chemin = chemin or dossier_cache() / "trajectoires.npz"
+        elements = self.cache.elements()
+        tableaux = {
+            "version": np.array(VERSION_CACHE_TRAJECTOIRES),
+            "cles": np.array([cle[:3] for cle, _ in elements], dtype=float).reshape(-1, 3),
+            "modeles": np.array([cle[3] for cle, _ in elements], dtype=str),
+            "variantes": np.array([cle[4] for cle, _ in elements], dtype=str),
+        }
+        for i, (_, resultat) in enumerate(elements):
+            for champ in CHAMPS_RESULTAT:
+                tableaux[f"{i}_{champ}"] = resultat[champ]
+        np.savez(chemin, **tableaux)
+        return chemin
+
+    def charger_cache(self, chemin=None):
+        """
+        Recharge un cache sauvegardé par `sauvegarder_cache`.
+
+        Seules les entrées calculées avec l'amplification courante et les mêmes paramètres
+        de modèle (profil de vent de l'atmosphère, voir _variante) sont reprises ; un
+        fichier d'une autre version (VERSION_CACHE_TRAJECTOIRES) est ignoré en entier.
+        Retourne le nombre d'entrées chargées (0 si le fichier est absent, illisible ou périmé).
+        """
+        chemin = chemin or dossier_cache() / "trajectoires.npz"
+        try:
+            donnees = np.load(chemin)
+        except (OSError, ValueError):
+            return 0
+
+        n_charges = 0
+        with donnees:
+            # Fichiers sans version : écrits avant VERSION_CACHE_TRAJECTOIRES (version 1)
+            version = int(donnees["version"]) if "version" in donnees.files else 1
+            if version != VERSION_CACHE_TRAJECTOIRES:
+                return 0
+            cles = donnees["cles"]
+            for i, ((lat_q, h_q, amplification), modele, variante) in enumerate(
+                    zip(cles, donnees["modeles"], donnees["variantes"])):
+                if amplification != self.amplification or modele not in MODELES:
+                    continue
+                if variante != self._variante(str(modele)):
+                    continue
+                if any(f"{i}_{champ}" not in donnees.files for champ in CHAMPS_RESULTAT):
+                    continue
+                resultat = {}
+                for champ in CHAMPS_RESULTAT:
+                    valeur = donnees[f"{i}_{champ}"]
+                    if valeur.ndim == 0:
+                        valeur = valeur[()]
+                    else:
+                        valeur.flags.writeable = False
+                    resultat[champ] = valeur
+                modele = str(modele)
+                self.cache.ajouter((int(lat_q), int(h_q), self.amplification, modele, self._variante(modele)),
+                                   resultat)
+                n_charges += 1
+        return n_charges
+
+    def iterer_grille(self, latitudes_deg, altitudes, octets_max=64 * 2**20):
+        """
+        Parcourt un maillage latitude × altitude par blocs de lignes de latitude.
+
+        Chaque bloc occupe au plus `octets_max` octets et est produit sous la forme
+        (tranche, deviation_mm, force_coriolis_max) où `tranche` indexe les latitudes
+        couvertes et les deux tableaux ont la forme (len(tranche), n_altitudes).
+        Les valeurs sont réelles (non amplifiées).
+        """
+        latitudes_rad = np.radians(np.asarray(latitudes_deg, dtype=float))
+        altitudes = np.asarray(altitudes, dtype=float)
+
+        # Le temps de vol ne dépend que de l'altitude et la déviation se factorise
+        # en cos(lat) × f(h) : un produit extérieur suffit, sans boucle Python.
+        t_vol = noyau.temps_vol(altitudes, self.g)
+        dev_mm_par_cos = noyau.deviation_est(0.0, t_vol, self.g, self.omega) * 1000
+        force_par_cos = noyau.acceleration_coriolis(0.0, t_vol, self.g, self.omega)
+        cos_lat = np.cos(latitudes_rad)
+
+        lignes_par_bloc = max(1, octets_max // max(1, 2 * 8 * altitudes.size))
+        for debut in range(0, cos_lat.size, lignes_par_bloc):
+            tranche = slice(debut, min(debut + lignes_par_bloc, cos_lat.size))
+            c = cos_lat[tranche, None]
+            yield tranche, c * dev_mm_par_cos, c * force_par_cos
+
+    def calculer_grille(self, latitudes_deg, altitudes, octets_max=64 * 2**20, dtype=np.float64,
+                        progression=None):
+        """
+        Évalue temps de vol, déviation vers l'Est et force de Coriolis maximale
+        sur tout le maillage latitude × altitude.
+
+        Le calcul est fait par blocs bornés en mémoire (voir `iterer_grille`) et
+        écrit directement dans les tableaux de sortie (n_latitudes, n_altitudes).
+        `progression(fraction)`, si fourni, est appelé après chaque bloc.
+        """
+        latitudes_deg = np.asarray(latitudes_deg, dtype=float)
+        altitudes = np.asarray(altitudes, dtype=float)
+
+        deviation_mm = np.empty((latitudes_deg.size, altitudes.size), dtype=dtype)
+        force_max = np.empty_like(deviation_mm)
+        for tranche, dev, force in self.iterer_grille(latitudes_deg, altitudes, octets_max):
+            deviation_mm[tranche] = dev
+            force_max[tranche] = force
+            if progression is not None:
+                progression(tranche.stop / max(1, latitudes_deg.size))
+
         return {
-            "latitude": lat_deg,
-            "temps_vol": t_vol,
-            "deviation_mm": dev_finale_reelle * 1000  # Conversion en millimètres
-        }
\ No newline at end of file
+            "latitude": latitudes_deg,
+            "altitude": altitudes,
+            "temps_vol": noyau.temps_vol(altitudes, self.g),
+            "deviation_mm": deviation_mm,
+            "force_coriolis_max": force_max,  # N/kg (accélération, non amplifiée)
+        }
@@ -0,0 +1,76 @@
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+
+def dossier_cache():
+    """
+    Dossier des fichiers de cache de l'application.
+
+    Par défaut ~/.cache/coriolis, modifiable par la variable d'environnement
+    CORIOLIS_CACHE. Le dossier est créé s'il n'existe pas.
+    """
+    dossier = Path(os.environ.get("CORIOLIS_CACHE", Path.home() / ".cache" / "coriolis"))
+    dossier.mkdir(parents=True, exist_ok=True)
+    return dossier
+
+
+class CacheLRU:
+    """Cache borné qui évince l'entrée la moins récemment utilisée."""
+
+    def __init__(self, taille_max=256):
+        self.taille_max = taille_max
+        self._entrees = OrderedDict()
+        self._verrou = threading.Lock()
+
+        # Compteurs d'utilisation
+        self.succes = 0
+        self.echecs = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entrees)
+
+    def __contains__(self, cle):
+        return cle in self._entrees
+
+    def obtenir(self, cle):
+        """Retourne la valeur associée à `cle`, ou None si elle est absente."""
+        with self._verrou:
+            valeur = self._entrees.get(cle)
+            if valeur is None:
+                self.echecs += 1
+                return None
+            self._entrees.move_to_end(cle)
+            self.succes += 1
+            return valeur
+
+    def ajouter(self, cle, valeur):
+        if self.taille_max <= 0:
+            return
+        with self._verrou:
+            self._entrees[cle] = valeur
+            self._entrees.move_to_end(cle)
+            while len(self._entrees) > self.taille_max:
+                self._entrees.popitem(last=False)
+                self.evictions += 1
+
+    def elements(self):
+        """Copie des paires (clé, valeur), de la plus ancienne à la plus récente."""
+        with self._verrou:
+            return list(self._entrees.items())
+
+    def vider(self):
+        with self._verrou:
+            self._entrees.clear()
+
+    def statistiques(self):
+        total = self.succes + self.echecs
+        return {
+            "entrees": len(self._entrees),
+            "succes": self.succes,
+            "echecs": self.echecs,
+            "evictions": self.evictions,
+            "taux_succes": self.succes / total if total else 0.0,
+        }
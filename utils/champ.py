@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Champ de déviation : des particules lâchées sur toute une grille latitude × longitude.
+
+Exemples :
+    python -m utils.champ
+    python -m utils.champ --points 250000 --pas-par-image 2
+
+Toutes les particules tombent ensemble vers le globe (SimulateurCoriolis, pas de
+Boris) ; elles sont avancées par lots de TAILLE_LOT particules, dont les
+temporaires restent petits, et les particules arrivées au sol sortent du calcul.
+Le rendu est un seul nuage de points dont les coordonnées et la couleur
+(déviation) sont réécrites en place à chaque image.
+"""
+
+import argparse
+import math
+import sys
+
+import numpy as np
+import pyvista as pv
+
+from utils import integrateurs
+from utils.physique import SimulateurCoriolis
+
+# Grille de départ : nombre de particules et latitude extrême (degrés)
+N_POINTS = 100_000
+LATITUDE_MAX = 85.0
+
+# Particules avancées ensemble (temporaires NumPy de quelques centaines de Ko)
+TAILLE_LOT = 8192
+
+
+def grille_departs(n_points=N_POINTS, latitude_max=LATITUDE_MAX):
+    """
+    Directions unitaires (N, 3) d'une grille régulière latitude × longitude
+    d'environ `n_points` points (deux fois plus de longitudes que de latitudes).
+    """
+    n_latitudes = max(2, round(math.sqrt(n_points / 2)))
+    n_longitudes = max(1, round(n_points / n_latitudes))
+    latitudes = np.radians(np.linspace(-latitude_max, latitude_max, n_latitudes))
+    longitudes = np.linspace(0, 2 * np.pi, n_longitudes, endpoint=False)
+    lat, lon = np.meshgrid(latitudes, longitudes, indexing="ij")
+    return np.column_stack((
+        (np.cos(lat) * np.cos(lon)).ravel(),
+        (np.cos(lat) * np.sin(lon)).ravel(),
+        np.sin(lat).ravel(),
+    ))
+
+
+def deviation(pos, directions):
+    """Distance (N,) de chaque particule à la verticale de son point de départ."""
+    radial = np.einsum("ij,ij->i", pos, directions)
+    return np.linalg.norm(pos - radial[:, None] * directions, axis=1)
+
+
+class ChampDeviation:
+    """
+    Chute simultanée de particules lâchées au repos à `altitude` au-dessus du globe.
+
+    Sans rotation, la gravité centrale ramènerait chaque particule sur la
+    verticale de son départ : la distance à cette verticale est donc la
+    déviation due à la force de Coriolis. Les particules s'arrêtent sur la
+    surface du globe affiché (rayon `radius_earth`), point d'impact interpolé.
+
+    `self.nuage` (PolyData en float32, champ "deviation") est créé une fois :
+    avancer() écrit les nouvelles positions dans ses points, lot par lot.
+    `self.echelle` est la déviation finale d'une particule lâchée sur
+    l'équateur, la plus déviée : elle fixe l'échelle des couleurs.
+    """
+
+    def __init__(self, departs=None, simulateur=None, altitude=0.05, dt=0.005, duree_chute_max=2.0,
+                 taille_lot=TAILLE_LOT, echelle=None):
+        # Gravité renforcée : la chute dure moins d'une seconde. Rotation modérée
+        # (ω·t < 1) : avec la rotation par défaut, les particules proches de
+        # l'équateur décrivent des cycloïdes et n'atteignent jamais le sol
+        self.simulateur = simulateur or SimulateurCoriolis(omega_val=1.0, g_scale=0.5)
+        departs = grille_departs() if departs is None else np.atleast_2d(np.asarray(departs, dtype=float))
+        self.directions = departs / np.linalg.norm(departs, axis=1)[:, None]
+        self.altitude = altitude
+        self.dt = dt
+        self.n_pas_max = int(np.ceil(duree_chute_max / dt - 1e-9))
+        self.taille_lot = taille_lot
+        self.rayon_sol = self.simulateur.radius_earth
+
+        # 1. État de toutes les particules (float64) et particules encore en vol
+        n = len(self.directions)
+        self.pos = np.empty((n, 3))
+        self.v = np.empty((n, 3))
+        self.en_vol = np.empty(n, dtype=bool)
+
+        # 2. Nuage affiché (float32 : moitié moins de données envoyées au rendu)
+        self.nuage = pv.PolyData(np.zeros((n, 3), dtype=np.float32))
+        self.nuage["deviation"] = np.zeros(n, dtype=np.float32)
+        self._deviations = self.nuage["deviation"]
+
+        if echelle is None:
+            reference = ChampDeviation([(1.0, 0.0, 0.0)], self.simulateur, altitude, dt, duree_chute_max, echelle=1.0)
+            reference.avancer(reference.n_pas_max)
+            echelle = float(reference.deviations[0]) or 1.0
+        self.echelle = echelle
+        self.reinitialiser()
+
+    @property
+    def n_particules(self):
+        return len(self.directions)
+
+    @property
+    def deviations(self):
+        """Vue (N,) des déviations affichées."""
+        return self._deviations
+
+    @property
+    def termine(self):
+        return self.n_en_vol == 0 or self.n_pas >= self.n_pas_max
+
+    def reinitialiser(self):
+        """Toutes les particules au départ, au repos (mêmes tableaux et même nuage)."""
+        np.multiply(self.directions, self.rayon_sol + self.altitude, out=self.pos)
+        self.v[:] = 0.0
+        self.en_vol[:] = True
+        self.n_en_vol = self.n_particules
+        self.n_pas = 0
+        self.nuage.points[:] = self.pos
+        self._deviations[:] = 0.0
+        self._marquer_modifie()
+
+    def avancer(self, n_pas=1):
+        """Avance toutes les particules en vol de `n_pas` pas, lot par lot, et met à jour le nuage."""
+        n_pas = min(n_pas, self.n_pas_max - self.n_pas)
+        if n_pas <= 0 or self.n_en_vol == 0:
+            return
+        for debut in range(0, self.n_particules, self.taille_lot):
+            self._avancer_lot(slice(debut, debut + self.taille_lot), n_pas)
+        self.n_pas += n_pas
+        self.n_en_vol = int(np.count_nonzero(self.en_vol))
+        self._marquer_modifie()
+
+    def _avancer_lot(self, lot, n_pas):
+        indices = np.flatnonzero(self.en_vol[lot]) + lot.start
+        if indices.size == 0:
+            # Lot entièrement au sol : positions et couleurs déjà à jour
+            return
+        p, v = self.pos[indices], self.v[indices]
+        r2_sol = self.rayon_sol ** 2
+
+        for _ in range(n_pas):
+            p_suiv, v_suiv = self.simulateur.pas("boris", p, v, self.dt)
+
+            # Arrivées au sol : point d'impact (dérive rectiligne sur le pas), puis retrait du lot
+            touche = np.einsum("ij,ij->i", p_suiv, p_suiv) <= r2_sol
+            if touche.any():
+                vitesse = (p_suiv[touche] - p[touche]) / self.dt
+                impacts, _ = integrateurs.point_impact(p[touche], vitesse, p_suiv[touche], vitesse,
+                                                       self.dt, self.rayon_sol)
+                arrivees = indices[touche]
+                self.pos[arrivees] = impacts
+                self.v[arrivees] = 0.0
+                self.en_vol[arrivees] = False
+                garder = ~touche
+                indices, p, v = indices[garder], p_suiv[garder], v_suiv[garder]
+            else:
+                p, v = p_suiv, v_suiv
+
+        self.pos[indices] = p
+        self.v[indices] = v
+
+        # Écriture en place dans le nuage (conversion float32 au passage)
+        self.nuage.points[lot] = self.pos[lot]
+        self._deviations[lot] = deviation(self.pos[lot], self.directions[lot])
+
+    def _marquer_modifie(self):
+        self.nuage.GetPoints().Modified()
+        self.nuage.GetPointData().GetArray("deviation").Modified()
+
+
+def main(argv=None):
+    """Lance le champ de déviation sur le globe."""
+    from utils.globe import GlobeApp
+
+    parser = argparse.ArgumentParser(description="Champ de déviation de particules lâchées sur tout le globe.")
+    parser.add_argument("--points", type=int, default=N_POINTS, help="nombre de particules (grille lat × lon)")
+    parser.add_argument("--pas-par-image", type=int, default=1, help="pas d'intégration par image")
+    args = parser.parse_args(argv)
+    if args.points < 2 or args.pas_par_image < 1:
+        parser.error("il faut au moins 2 particules et 1 pas par image")
+
+    app = GlobeApp()
+    app.setup_globe()
+    app.setup_champ_deviation(ChampDeviation(grille_departs(args.points)), args.pas_par_image)
+    app.demarrer_champ()
+    app.plotter.show()
+    app.instr.fermer()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
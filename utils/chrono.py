@@ -0,0 +1,57 @@
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+
+class ChronoDemarrage:
+    """
+    Mesure la durée de chaque phase du démarrage d'une simulation.
+
+    Activé par la variable d'environnement CORIOLIS_CHRONO :
+    - "1" : le rapport est affiché sur la sortie d'erreur ;
+    - un chemin de fichier : le rapport est aussi ajouté en JSON (une ligne par
+      lancement), pour suivre les régressions du démarrage à froid.
+    """
+
+    def __init__(self, nom, debut=None):
+        self.nom = nom
+        self.phases = []
+        # `debut` permet de compter aussi les imports faits avant la création du chrono
+        self._debut = time.perf_counter() if debut is None else debut
+
+    def ajouter(self, phase, duree):
+        self.phases.append((phase, duree))
+
+    @contextmanager
+    def phase(self, nom):
+        debut = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.ajouter(nom, time.perf_counter() - debut)
+
+    def rapport(self):
+        total = time.perf_counter() - self._debut
+        lignes = [f"--- DÉMARRAGE {self.nom} ---"]
+        for phase, duree in self.phases:
+            lignes.append(f"{phase:<20} {duree * 1000:>9.1f} ms")
+        lignes.append(f"{'TOTAL':<20} {total * 1000:>9.1f} ms")
+        return "\n".join(lignes), total
+
+    def publier(self):
+        """Affiche et/ou enregistre le rapport si CORIOLIS_CHRONO est défini."""
+        cible = os.environ.get("CORIOLIS_CHRONO")
+        if not cible:
+            return
+        texte, total = self.rapport()
+        print(texte, file=sys.stderr)
+        if cible != "1":
+            with open(cible, "a") as f:
+                f.write(json.dumps({
+                    "simulation": self.nom,
+                    "horodatage": time.time(),
+                    "phases": dict(self.phases),
+                    "total": total,
+                }) + "\n")
@@ -0,0 +1,208 @@
+import numpy as np
+
+from utils import noyau
+from utils.stockage import StockageTrajectoire
+
+
+class ModeleChute3D:
+    """
+    Chute libre complète dans le repère local tournant (x = Est, y = Nord, z = haut).
+
+    Contrairement à la formule d = 1/3·ω·cos(φ)·g·t³, le modèle intègre les
+    équations 3D complètes :
+        a = -g(z)·ez - 2·Ω×v - Ω×(Ω×r) - k·|v - vent|·(v - vent)
+    avec Ω = ω·(0, cos φ, sin φ), une gravité décroissant avec l'altitude et une
+    traînée quadratique optionnelle. L'intégration RK4 est vectorisée sur autant
+    de couples (latitude, altitude) que l'on veut.
+
+    Avec `atmosphere` (utils.atmosphere.TablesAtmosphere, construite avec les
+    mêmes g et R_terre), la densité de l'air (traînée), la gravité et le vent
+    suivent l'altitude : une interpolation dans les tables par évaluation de
+    l'accélération. Le vent du profil s'ajoute au vent de chaque bille.
+
+    `facteurs_trainee` (integrer, iterer) donne à chaque bille son propre ½·Cd·A/m
+    (billes de tailles ou de formes différentes) ; par défaut, celui du modèle.
+    """
+
+    def __init__(self, g=noyau.G, omega=noyau.OMEGA_TERRE, R_terre=noyau.R_TERRE, trainee=False,
+                 gravite_variable=True, centrifuge=True,
+                 rayon_bille=0.01, masse_bille=0.0327, cd=0.47, rho_air=1.225, atmosphere=None):
+        # Constantes physiques
+        self.g = g
+        self.omega = omega
+        self.R_terre = R_terre
+
+        # Termes optionnels du modèle
+        self.trainee = trainee
+        self.gravite_variable = gravite_variable
+        self.centrifuge = centrifuge
+
+        # Bille (acier de 1 cm de rayon par défaut) et air au niveau de la mer
+        self.rayon_bille = rayon_bille
+        self.masse_bille = masse_bille
+        self.cd = cd
+        self.rho_air = rho_air
+        self.atmosphere = atmosphere
+
+    @property
+    def facteur_trainee(self):
+        """½·Cd·A / m (m²/kg) : k = facteur·ρ."""
+        return 0.5 * self.cd * np.pi * self.rayon_bille**2 / self.masse_bille
+
+    def coef_trainee(self, z, facteurs=None):
+        """k = ½·ρ·Cd·A / m (1/m), tel que a_trainee = -k·|v|·v (`facteurs` : ½·Cd·A/m par bille)."""
+        facteurs = self.facteur_trainee if facteurs is None else facteurs
+        if self.atmosphere is not None:
+            return facteurs * self.atmosphere.densite(z)
+        return facteurs * self.rho_air * np.ones_like(z)
+
+    def temps_vol_estime(self, altitudes, facteurs_trainee=None):
+        """
+        Temps de chute verticale sans rotation (gravité constante ; traînée au sol
+        si active, ou à mi-hauteur de chaque chute avec l'atmosphère tabulée).
+        """
+        altitudes = np.asarray(altitudes, dtype=float)
+        k = 0.0
+        if self.trainee:
+            z = 0.5 * altitudes if self.atmosphere is not None else np.zeros_like(altitudes)
+            k = self.coef_trainee(z, facteurs_trainee)
+        return noyau.temps_vol_trainee(altitudes, self.g, k)
+
+    def gravite(self, z):
+        if not self.gravite_variable:
+            return self.g * np.ones_like(z)
+        if self.atmosphere is not None:
+            return self.atmosphere.gravite(z)
+        return self.g * (self.R_terre / (self.R_terre + z))**2
+
+    def acceleration(self, pos, v, omega_local, vent, facteurs=None):
+        # Ω n'a pas de composante Est : les produits vectoriels sont développés
+        # à la main (beaucoup plus rapide que np.cross sur de petits tableaux)
+        oy = omega_local[:, 1]
+        oz = omega_local[:, 2]
+        vx, vy, vz = v[:, 0], v[:, 1], v[:, 2]
+
+        # Coriolis : -2·Ω×v
+        accel = np.empty_like(v)
+        accel[:, 0] = -2 * (oy * vz - oz * vy)
+        accel[:, 1] = -2 * oz * vx
+        accel[:, 2] = 2 * oy * vx
+
+        if self.centrifuge:
+            # Variation du terme centrifuge par rapport au point de départ
+            # (la partie constante est déjà incluse dans g) :
+            # -Ω×(Ω×r) = |Ω|²·r - (Ω·r)·Ω
+            omega_r = oy * pos[:, 1] + oz * pos[:, 2]
+            accel += self.omega**2 * pos
+            accel[:, 1] -= omega_r * oy
+            accel[:, 2] -= omega_r * oz
+
+        if self.atmosphere is None:
+            accel[:, 2] -= self.gravite(pos[:, 2])
+            k = self.coef_trainee(pos[:, 2], facteurs) if self.trainee else None
+        else:
+            # Une seule interpolation pour densité, gravité et vent
+            colonnes = self.atmosphere.interpoler(pos[:, 2])
+            accel[:, 2] -= colonnes[:, 1] if self.gravite_variable else self.g
+            k = (self.facteur_trainee if facteurs is None else facteurs) * colonnes[:, 0]
+            if self.atmosphere.avec_vent:
+                vent = vent.copy()
+                vent[:, :2] += colonnes[:, 2:]
+
+        if self.trainee:
+            v_rel = v - vent
+            norme = np.sqrt(np.einsum("ij,ij->i", v_rel, v_rel))
+            accel -= (k * norme)[:, None] * v_rel
+        return accel
+
+    def _conditions_initiales(self, latitudes_deg, altitudes, v0, vent, facteurs_trainee):
+        """
+        État de départ des M billes, ½·Cd·A/m de chacune, temps de vol dans le vide
+        et durée estimée (voir integrer).
+        """
+        latitudes_rad = np.radians(np.atleast_1d(np.asarray(latitudes_deg, dtype=float)))
+        altitudes = np.atleast_1d(np.asarray(altitudes, dtype=float))
+        latitudes_rad, altitudes = np.broadcast_arrays(latitudes_rad, altitudes)
+        n = altitudes.size
+
+        omega_local = self.omega * np.column_stack(
+            (np.zeros(n), np.cos(latitudes_rad), np.sin(latitudes_rad))
+        )
+        vent = np.zeros((n, 3)) if vent is None else np.broadcast_to(vent, (n, 3))
+
+        pos = np.column_stack((np.zeros(n), np.zeros(n), altitudes))
+        v = np.zeros((n, 3)) if v0 is None else np.array(np.broadcast_to(v0, (n, 3)), dtype=float)
+        facteurs = self.facteur_trainee if facteurs_trainee is None else facteurs_trainee
+        facteurs = np.array(np.broadcast_to(facteurs, (n,)), dtype=float)
+
+        t_vide = noyau.temps_vol(altitudes, self.g)
+        t_estime = self.temps_vol_estime(altitudes, facteurs)
+        return latitudes_rad, altitudes, pos, v, omega_local, vent, facteurs, t_vide, t_estime
+
+    def iterer(self, latitudes_deg, altitudes, v0=None, vent=None, n_pas=200, facteur_pas_max=20,
+               facteurs_trainee=None):
+        """
+        Version pas à pas d'integrer : générateur des états (instants (M,), positions (M, 3),
+        vitesses (M, 3), temps de vol (M,)) au départ puis après chaque pas RK4.
+
+        Les tableaux sont modifiés en place au pas suivant (voir noyau.par_blocs pour
+        les regrouper en blocs copiés). Boucle NumPy, quel que soit le backend actif.
+        """
+        _, _, pos, v, omega_local, vent, facteurs, _, t_estime = self._conditions_initiales(
+            latitudes_deg, altitudes, v0, vent, facteurs_trainee
+        )
+        return noyau.BackendNumPy().iterer_chute3d(
+            self, pos, v, t_estime / n_pas, omega_local, vent, facteurs, n_pas * facteur_pas_max
+        )
+
+    def integrer(self, latitudes_deg, altitudes, v0=None, vent=None, n_pas=200,
+                 garder_trajectoires=True, facteur_pas_max=20, dtype=np.float64, chemin=None,
+                 facteurs_trainee=None):
+        """
+        Intègre la chute pour M couples (latitude en degrés, altitude en m).
+
+        Le pas de chaque couple vaut t_estime / n_pas, où t_estime est le temps de
+        vol de temps_vol_estime (sqrt(2h/g) sans traînée) : le nombre de pas reste
+        proche de n_pas même quand la traînée allonge beaucoup la chute.
+        L'impact (z = 0) est interpolé exactement.
+        `v0` et `vent` sont des tableaux (M, 3) optionnels (vitesse initiale et
+        vent horizontal, en m/s), `facteurs_trainee` un tableau (M,) optionnel de
+        ½·Cd·A/m (m²/kg) par bille.
+
+        Retourne un dictionnaire de tableaux :
+        temps_vol, impact (M, 3), deviation_est_mm, deviation_sud_mm,
+        deviation_analytique_mm et ecart_analytique_mm (3D - formule), plus
+        t (M, T) et trajectoires (M, T, 3) si `garder_trajectoires`.
+        Les trajectoires sont une vue d'un StockageTrajectoire : `dtype=np.float32`
+        divise leur mémoire par deux, `chemin` les écrit dans un fichier projeté
+        en mémoire.
+        """
+        latitudes_rad, altitudes, pos, v, omega_local, vent, facteurs, t_vide, t_estime = self._conditions_initiales(
+            latitudes_deg, altitudes, v0, vent, facteurs_trainee
+        )
+        n = altitudes.size
+
+        stockage = None
+        if garder_trajectoires:
+            stockage = StockageTrajectoire((n, 3), dtype=dtype, capacite=2 * n_pas, chemin=chemin)
+
+        # Boucle RK4 déléguée au backend actif (NumPy par défaut, voir utils.noyau)
+        pos, temps_vol, instants, trajectoires = noyau.backend_actif().chute3d(
+            self, pos, v, t_estime / n_pas, omega_local, vent, facteurs, n_pas * facteur_pas_max, stockage
+        )
+
+        deviation_analytique = noyau.deviation_est(latitudes_rad, t_vide, self.g, self.omega)
+        resultat = {
+            "latitude": np.degrees(latitudes_rad),
+            "altitude": altitudes,
+            "temps_vol": temps_vol,
+            "impact": pos,
+            "deviation_est_mm": pos[:, 0] * 1000,
+            "deviation_sud_mm": -pos[:, 1] * 1000,
+            "deviation_analytique_mm": deviation_analytique * 1000,
+            "ecart_analytique_mm": (pos[:, 0] - deviation_analytique) * 1000,
+        }
+        if garder_trajectoires:
+            resultat["t"] = instants
+            resultat["trajectoires"] = trajectoires
+        return resultat
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Comparaison de la déviation vers l'Est sur plusieurs sites à la fois.
+
+Exemples :
+    python -m utils.comparaison
+    python -m utils.comparaison --site "Tour Eiffel:48.858:276" --aleatoires 2000
+
+Chaque site (latitude, hauteur de chute) est une colonne posée sur une grille ;
+toutes les billes tombent ensemble, de leur hauteur réelle jusqu'au sol, avec
+la déviation amplifiée. Le rendu ne dépend pas du nombre de sites en nombre
+d'acteurs : toutes les billes sont des glyphes d'un seul vtkGlyph3DMapper et
+toutes les trajectoires sont les cellules d'un seul maillage de polylignes,
+mis à jour en place à chaque image.
+"""
+
+import argparse
+import math
+import sys
+import time
+
+import numpy as np
+import pyvista as pv
+from vtkmodules.vtkCommonDataModel import vtkCellArray
+from vtkmodules.vtkRenderingCore import vtkActor
+from vtkmodules.vtkRenderingOpenGL2 import vtkOpenGLGlyph3DMapper
+
+from utils import noyau
+from utils.instrumentation import creer_instrumentation
+from utils.rendu import TYPE_ID, ids_vtk
+
+# Expériences historiques : nom, latitude (degrés), hauteur de chute (m)
+SITES_HISTORIQUES = (
+    ("Guglielmini - Bologne (1791)", 44.494, 78.3),
+    ("Benzenberg - Hambourg (1802)", 53.548, 76.3),
+    ("Reich - Freiberg (1831)", 50.92, 158.5),
+    ("Hall - Harvard (1902)", 42.38, 23.0),
+    ("Flammarion - Panthéon (1903)", 48.8462, 68.0),
+)
+
+# Animation : durée réelle (s) et cadence (images/s) ; toutes les chutes durent DUREE_ANIMATION
+DUREE_ANIMATION = 4.0
+FPS_ANIMATION = 30
+
+# Au-delà, les noms des sites ne sont plus affichés
+N_ETIQUETTES_MAX = 30
+
+
+def lire_site(texte):
+    """Site au format "nom:latitude:hauteur" (argument --site)."""
+    try:
+        nom, latitude, hauteur = texte.rsplit(":", 2)
+        return nom, float(latitude), float(hauteur)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Site invalide : {texte!r} (format attendu : nom:latitude:hauteur)")
+
+
+def sites_aleatoires(n, graine=0, hauteurs=(10.0, 300.0)):
+    """n sites tirés uniformément sur la sphère (latitude) et en hauteur."""
+    rng = np.random.default_rng(graine)
+    latitudes = np.degrees(np.arcsin(rng.uniform(-1, 1, n)))
+    altitudes = rng.uniform(*hauteurs, n)
+    return [(f"Site {i + 1}", lat, h) for i, (lat, h) in enumerate(zip(latitudes, altitudes))]
+
+
+def deviations(latitudes, hauteurs):
+    """Temps de vol (s) et déviation vers l'Est (m) de chaque site, formule analytique vectorisée."""
+    t_vol = noyau.temps_vol(hauteurs, noyau.G)
+    return t_vol, noyau.deviation_est(np.radians(latitudes), t_vol, noyau.G, noyau.OMEGA_TERRE)
+
+
+class ComparaisonSites:
+    """
+    Chute simultanée sur tous les sites.
+
+    Image k : chaque site est à la fraction k / (n_images - 1) de son temps de vol.
+    Les positions sont calculées directement pour tous les sites (formule fermée),
+    écrites dans le nuage des billes et dans le maillage des trajectoires, dont
+    chaque site occupe un bloc préalloué de `n_images` points. Comme pour
+    utils.rendu.PolyligneProgressive, seules les cellules changent de longueur :
+    la connectivité est réécrite en place dans un buffer de taille fixe.
+    """
+
+    def __init__(self, sites, plotter=None):
+        self.noms = [nom for nom, _, _ in sites]
+        self.latitudes = np.array([lat for _, lat, _ in sites], dtype=float)
+        self.hauteurs = np.array([h for _, _, h in sites], dtype=float)
+        self.t_vol, self.deviation = deviations(self.latitudes, self.hauteurs)
+        n = len(sites)
+        self.n_images = max(2, round(DUREE_ANIMATION * FPS_ANIMATION) + 1)
+
+        # 1. Disposition en grille (plan XY, Z vertical) et amplification de la déviation
+        colonnes = math.ceil(math.sqrt(n))
+        self.espacement = 0.3 * self.hauteurs.max()
+        ligne, colonne = np.divmod(np.arange(n), colonnes)
+        self.base = np.column_stack((colonne * self.espacement, ligne * self.espacement, np.zeros(n)))
+        deviation_max = np.abs(self.deviation).max()
+        self.amplification = 0.4 * self.espacement / deviation_max if deviation_max > 0 else 1.0
+
+        self.plotter = plotter or pv.Plotter(title="Comparaison multi-sites - Déviation vers l'Est")
+        self.plotter.set_background("black")
+        deviation_mm = self.deviation * 1000
+        couleurs = dict(cmap="plasma", clim=(deviation_mm.min(), deviation_mm.max() or 1.0))
+
+        # 2. Sol
+        etendue = self.base.max(axis=0) + self.espacement
+        milieu = self.base.max(axis=0) / 2
+        sol = pv.Plane(center=(milieu[0], milieu[1], 0), i_size=etendue[0], j_size=etendue[1])
+        self.plotter.add_mesh(sol, color="seagreen", opacity=0.3)
+
+        # 3. Trajectoires : un seul maillage, une polyligne (bloc de n_images points) par site
+        # (points affectés après coup : pas de cellules sommets, seulement les polylignes)
+        self.trajectoires = pv.PolyData()
+        self.trajectoires.points = np.repeat(self._positions(0.0), self.n_images, axis=0)
+        self._debuts_blocs = np.arange(n, dtype=TYPE_ID)[:, None] * self.n_images
+        self._connectivite = np.empty(n * self.n_images, dtype=TYPE_ID)
+        self._offsets = np.empty(n + 1, dtype=TYPE_ID)
+        self._cellules = vtkCellArray()
+        self.trajectoires.SetLines(self._cellules)
+        self._longueur_visible(0)
+        self.trajectoires["deviation_mm"] = np.repeat(deviation_mm, self.n_images)
+        # Vue (n, n_images, 3) des points du maillage, sans copie
+        self._points_trajectoires = self.trajectoires.points.reshape(n, self.n_images, 3)
+        self.plotter.add_mesh(self.trajectoires, scalars="deviation_mm", line_width=2,
+                              show_scalar_bar=False, **couleurs)
+
+        # 4. Billes : un nuage de points, une sphère instanciée par point (un seul acteur)
+        self.billes = pv.PolyData(self._positions(0.0))
+        self.billes["deviation_mm"] = deviation_mm
+        rayon = 0.04 * self.espacement
+        mapper = vtkOpenGLGlyph3DMapper()
+        mapper.SetInputData(self.billes)
+        mapper.SetSourceData(pv.Sphere(radius=rayon, theta_resolution=8, phi_resolution=8))
+        mapper.ScalingOff()
+        mapper.SetScalarModeToUsePointFieldData()
+        mapper.SelectColorArray("deviation_mm")
+        mapper.SetScalarRange(*couleurs["clim"])
+        mapper.SetLookupTable(pv.LookupTable(couleurs["cmap"]))
+        self.acteur_billes = vtkActor()
+        self.acteur_billes.SetMapper(mapper)
+        self.plotter.add_actor(self.acteur_billes, reset_camera=False)
+        self.plotter.add_scalar_bar("Déviation (mm)", mapper=self.plotter.mapper, color="white")
+
+        # 5. Noms des sites (seulement pour quelques dizaines de sites)
+        if n <= N_ETIQUETTES_MAX:
+            self.plotter.add_point_labels(self.base, self.noms, font_size=10, text_color="white",
+                                          shape_opacity=0.3, always_visible=True)
+        self.plotter.add_text(self.texte_resultats(), position="upper_left", font_size=9,
+                              color="cyan", font="courier")
+
+        # 6. Caméra isométrique sur la grille
+        centre = (milieu[0], milieu[1], self.hauteurs.max() / 2)
+        distance = 1.5 * max(etendue[0], etendue[1], self.hauteurs.max())
+        self.plotter.camera_position = [
+            (centre[0] + distance, centre[1] - distance, centre[2] + distance * 0.6),
+            centre,
+            (0, 0, 1),
+        ]
+
+        # 7. Animation (même pilotage que sim2 : image choisie selon le temps écoulé)
+        self.image_suivante = 0
+        self.timer_id = None
+        self.debut_animation = None
+        self.instr = creer_instrumentation("comparaison")
+        self.instr.attacher(self.plotter)
+        self.plotter.iren.add_observer("TimerEvent", self._sur_timer)
+        self.plotter.iren.add_observer("KeyPressEvent", self.on_key_press)
+
+    def _positions(self, fractions):
+        """Positions (n, k, 3) des billes aux fractions (k,) de leur chute, ou (n, 3) pour un scalaire."""
+        f = np.asarray(fractions, dtype=float)
+        t = self.t_vol[:, None] * np.atleast_1d(f)
+        positions = np.empty(t.shape + (3,))
+        latitudes_rad = np.radians(self.latitudes)[:, None]
+        deviation = noyau.deviation_est(latitudes_rad, t, noyau.G, noyau.OMEGA_TERRE)
+        positions[..., 0] = self.base[:, 0, None] + deviation * self.amplification
+        positions[..., 1] = self.base[:, 1, None]
+        positions[..., 2] = np.maximum(noyau.altitude_chute(self.hauteurs[:, None], t, noyau.G), 0.0)
+        return positions[:, 0] if f.ndim == 0 else positions
+
+    def _longueur_visible(self, k):
+        """Chaque polyligne couvre les k premiers points de son bloc (aucune cellule si k < 2)."""
+        n = len(self._debuts_blocs)
+        k = k if k >= 2 else 0
+        ids = self._connectivite[:n * k]
+        np.add(self._debuts_blocs, np.arange(k, dtype=TYPE_ID), out=ids.reshape(n, k))
+        offsets = self._offsets if k else self._offsets[:1]
+        np.multiply(np.arange(len(offsets), dtype=TYPE_ID), k, out=offsets)
+        self._cellules.SetData(ids_vtk(offsets), ids_vtk(ids))
+        self._cellules.Modified()
+        self.trajectoires.Modified()
+
+    def texte_resultats(self):
+        lignes = [f"COMPARAISON : {len(self.noms)} SITES (déviation amplifiée ×{self.amplification:.0f})"]
+        ordre = np.argsort(self.deviation)[::-1]
+        for i in ordre[:10]:
+            lignes.append(f"  {self.noms[i][:30]:<30} {self.latitudes[i]:+7.2f}° {self.hauteurs[i]:7.1f} m"
+                          f" {self.deviation[i] * 1000:7.2f} mm")
+        if len(ordre) > 10:
+            lignes.append(f"  ... ({len(ordre) - 10} autres sites)")
+        lignes += ["", "COMMANDES :", "  [R] Recommencer", "  [Q] Quitter"]
+        return "\n".join(lignes)
+
+    # ==================== ANIMATION ====================
+
+    def afficher(self, premier, dernier):
+        """Billes à l'image `dernier`, trajectoires prolongées des images `premier` à `dernier`."""
+        fractions = np.arange(premier, dernier + 1) / (self.n_images - 1)
+        lot = self._positions(fractions)
+        self._points_trajectoires[:, premier:dernier + 1] = lot
+        self.trajectoires.GetPoints().Modified()
+        self._longueur_visible(dernier + 1)
+        self.billes.points[:] = lot[:, -1]
+        self.billes.GetPoints().Modified()
+
+    def demarrer(self):
+        """(Re)lance la chute depuis le sommet, avec les mêmes acteurs et buffers."""
+        self.arreter()
+        self.afficher(0, 0)
+        self.image_suivante = 1
+        self.instr.nouvelle_animation()
+        self.debut_animation = None
+        self.timer_id = self.plotter.iren.create_timer(1000 // FPS_ANIMATION)
+
+    def arreter(self):
+        if self.timer_id is not None:
+            self.plotter.iren.destroy_timer(self.timer_id)
+            self.timer_id = None
+
+    def _sur_timer(self, obj, event):
+        if self.timer_id is not None:
+            self.update_animation()
+
+    def update_animation(self):
+        f = self.image_suivante
+        if self.debut_animation is None:
+            self.debut_animation = time.perf_counter()
+        # Image correspondant au temps écoulé : les images en retard sont sautées
+        ecoule = time.perf_counter() - self.debut_animation
+        cible = min(int(ecoule / DUREE_ANIMATION * (self.n_images - 1)), self.n_images - 1)
+
+        if f < self.n_images and cible >= f:
+            with self.instr.phase("scene"):
+                self.afficher(f, cible)
+            self.image_suivante = cible + 1
+        elif f >= self.n_images:
+            self.arreter()
+
+        with self.instr.phase("rendu"):
+            self.plotter.render()
+        self.instr.image_terminee()
+
+    def on_key_press(self, obj, event):
+        key = obj.GetKeySym()
+        if key == "r" or key == "R":
+            self.demarrer()
+            self.plotter.render()
+
+    def executer(self):
+        self.demarrer()
+        self.plotter.show()
+        self.instr.fermer()
+
+
+def main(argv=None):
+    """Lance la comparaison (sites historiques, sites de la ligne de commande, sites aléatoires)."""
+    parser = argparse.ArgumentParser(description="Comparaison de la déviation vers l'Est sur plusieurs sites.")
+    parser.add_argument("--site", type=lire_site, action="append", default=[],
+                        help='site supplémentaire "nom:latitude:hauteur" (répétable)')
+    parser.add_argument("--aleatoires", type=int, default=0, help="nombre de sites aléatoires à ajouter")
+    parser.add_argument("--graine", type=int, default=0)
+    parser.add_argument("--sans-historiques", action="store_true", help="n'affiche pas les expériences historiques")
+    args = parser.parse_args(argv)
+
+    sites = [] if args.sans_historiques else list(SITES_HISTORIQUES)
+    sites += args.site + sites_aleatoires(args.aleatoires, args.graine)
+    if not sites:
+        parser.error("aucun site à comparer")
+    ComparaisonSites(sites).executer()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Export hors écran des animations (MP4, GIF ou séquence PNG) pour les rapports.
+
+Exemples :
+    python -m utils.export sim1 --latitude 48.86 --altitude 84 --sortie chute.mp4
+    python -m utils.export sim2 --sortie flammarion.gif --fps 25
+    python -m utils.export sim1 --sortie images/          (séquence PNG)
+
+Les images sont rendues par des traceurs PyVista hors écran, sans fenêtre ni
+GPU (rendu logiciel de VTK), et réparties par plages sur plusieurs processus.
+Les graphiques Matplotlib (backend Agg) sont collés à droite de la vue 3D.
+Les plages reviennent dans l'ordre et sont envoyées à l'encodeur au fil de
+l'eau : seules quelques plages sont en mémoire à la fois.
+
+MP4 et GIF nécessitent imageio (et imageio-ffmpeg pour le MP4) ; la séquence
+PNG n'a besoin que de Matplotlib.
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from utils.reechantillonnage import FluxAnimation
+
+try:
+    import imageio.v2 as imageio
+except ImportError:
+    imageio = None
+
+# Durée des animations interactives (s) : DUREE_ANIMATION de sim1 et de sim2
+DUREES = {"sim1": 2.0, "sim2": 6.0}
+
+# Part de la largeur occupée par la vue 3D (le reste pour les graphiques)
+PART_VUE_3D = 0.6
+
+# Rendu propre à chaque processus (créé par _initialiser)
+_RENDU = None
+
+
+def flux_sim1(latitude, altitude, fps):
+    """Images et tracé de l'animation sim1 (mêmes formules et découpage que l'interface)."""
+    from utils.bille import SimulateurBille
+
+    moteur = SimulateurBille(taille_cache=0)
+    lat_rad = np.radians(latitude)
+    point = (np.cos(lat_rad), 0.0, np.sin(lat_rad))
+    t, x_id, z_id, x_co, z_co, force_mag = moteur.calculer_donnees(point, altitude)
+    return FluxAnimation(t, (x_id, z_id, x_co, z_co, force_mag), (x_co, z_co), DUREES["sim1"], fps)
+
+
+def flux_sim2(fps):
+    """Images (t, x amplifié, y, z) et tracé (déviation en mm, altitude) de l'animation sim2."""
+    from utils.sim2 import AMPLIFICATION, calculer_trajectoire
+
+    t, x_visu, y, z, _ = calculer_trajectoire()
+    return FluxAnimation(t, (x_visu, y, z), (x_visu / AMPLIFICATION * 1000, y), DUREES["sim2"], fps)
+
+
+class _RenduImages:
+    """Traceur hors écran + deux figures Agg ; produit les images composées."""
+
+    def __init__(self, simulation, flux, largeur, hauteur):
+        import pyvista as pv
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        from utils.graphiques import GestionnaireGraphiques
+
+        self.flux = flux
+        self.hauteur = hauteur
+        self.largeur_3d = int(largeur * PART_VUE_3D)
+        largeur_graphes = largeur - self.largeur_3d
+
+        # 1. Vue 3D hors écran
+        self.plotter = pv.Plotter(off_screen=True, window_size=(self.largeur_3d, hauteur))
+        if simulation == "sim1":
+            from utils.rendu import SceneBille
+
+            t, x_id, z_id, x_co, z_co, force_mag = flux.images
+            self.scene = SceneBille(self.plotter, capacite=flux.n_images)
+            self.scene.cadrer(z_co[0], x_co[-1])
+        else:
+            from utils.rendu import SceneFlammarion
+
+            self.scene = SceneFlammarion(self.plotter, capacite=flux.n_images)
+        t, dev, alt = flux.trace
+
+        # 2. Graphiques (backend Agg, même gestionnaire que l'interface)
+        dpi = 100
+        canvas = [
+            FigureCanvasAgg(Figure(figsize=(largeur_graphes / dpi, hauteur / 2 / dpi), dpi=dpi))
+            for _ in range(2)
+        ]
+        self.graph = GestionnaireGraphiques(*canvas)
+        self.graph.preparer_axes(t[-1], alt[0], dev[-1], n_points=len(t))
+
+        # Premier rendu : sans lui, le traceur hors écran ne redessine pas la scène
+        self.plotter.show(auto_close=False)
+
+    def _avancer(self, premier, dernier):
+        self.scene.afficher(self.flux.images, premier, dernier)
+        lot = self.flux.plage_trace(premier, dernier)
+        self.graph.mettre_a_jour_points(*(courbe[lot] for courbe in self.flux.trace))
+
+    def _composer(self):
+        self.plotter.render()
+        vue = self.plotter.screenshot(return_img=True)
+        image = np.zeros((self.hauteur, self.largeur_3d + self.graph.canvas1.get_width_height()[0], 3),
+                         dtype=np.uint8)
+        image[:vue.shape[0], :vue.shape[1]] = vue[..., :3]
+        haut = 0
+        for canvas in (self.graph.canvas1, self.graph.canvas2):
+            graphe = np.asarray(canvas.buffer_rgba())[..., :3]
+            h, w = graphe.shape[:2]
+            h = min(h, self.hauteur - haut)
+            image[haut:haut + h, self.largeur_3d:self.largeur_3d + w] = graphe[:h]
+            haut += h
+        return image
+
+    def plage(self, debut, fin):
+        """Rend les images [debut, fin[ (les tracés sont reconstruits depuis le début)."""
+        self.scene.reinitialiser()
+        self.graph.reinitialiser()
+        self._avancer(0, debut)
+        images = [self._composer()]
+        for k in range(debut + 1, fin):
+            self._avancer(k, k)
+            images.append(self._composer())
+        return images
+
+    def fermer(self):
+        self.plotter.close()
+
+
+def _initialiser(simulation, flux, largeur, hauteur):
+    global _RENDU
+    _RENDU = _RenduImages(simulation, flux, largeur, hauteur)
+
+
+def _rendre_plage(debut, fin):
+    return _RENDU.plage(debut, fin)
+
+
+class _EcrivainPng:
+    def __init__(self, chemin, fps):
+        from matplotlib.image import imsave
+
+        self._imsave = imsave
+        self.dossier = Path(chemin)
+        self.dossier.mkdir(parents=True, exist_ok=True)
+        self.n = 0
+
+    def ecrire(self, image):
+        self._imsave(self.dossier / f"image_{self.n:05d}.png", image)
+        self.n += 1
+
+    def fermer(self):
+        pass
+
+
+class _EcrivainVideo:
+    def __init__(self, chemin, fps):
+        if imageio is None:
+            raise ValueError("L'export MP4/GIF nécessite imageio (pip install imageio imageio-ffmpeg)")
+        if Path(chemin).suffix == ".gif":
+            self.ecrivain = imageio.get_writer(chemin, mode="I", duration=1000 / fps, loop=0)
+        else:
+            self.ecrivain = imageio.get_writer(chemin, fps=fps, macro_block_size=1)
+
+    def ecrire(self, image):
+        self.ecrivain.append_data(image)
+
+    def fermer(self):
+        self.ecrivain.close()
+
+
+ECRIVAINS = {"": _EcrivainPng, ".mp4": _EcrivainVideo, ".gif": _EcrivainVideo}
+
+
+def _plages(n_images, taille_plage):
+    return [(debut, min(debut + taille_plage, n_images)) for debut in range(0, n_images, taille_plage)]
+
+
+def exporter(simulation, sortie, latitude=48.86, altitude=84.0, fps=30, largeur=1280, hauteur=720,
+             n_processus=None, taille_plage=10, progression=None):
+    """Rend l'animation `simulation` ("sim1" ou "sim2") dans `sortie`. Retourne le nombre d'images."""
+    sortie = Path(sortie)
+    if simulation not in DUREES:
+        raise ValueError(f"Simulation inconnue : {simulation!r} (choix : sim1, sim2)")
+    if sortie.suffix not in ECRIVAINS:
+        raise ValueError(f"Format de sortie non pris en charge : {sortie.suffix!r} (choix : .mp4, .gif, dossier PNG)")
+
+    # Images à la cadence demandée, rééchantillonnées depuis la physique
+    flux = flux_sim1(latitude, altitude, fps) if simulation == "sim1" else flux_sim2(fps)
+    n_images = flux.n_images
+    plages = _plages(n_images, taille_plage)
+
+    ecrivain = ECRIVAINS[sortie.suffix](sortie, fps)
+    n_ecrites = 0
+
+    def ecrire(images):
+        nonlocal n_ecrites
+        for image in images:
+            ecrivain.ecrire(image)
+        n_ecrites += len(images)
+        if progression is not None:
+            progression(n_ecrites / n_images)
+
+    try:
+        n_processus = min(n_processus or os.cpu_count() or 1, len(plages))
+        initargs = (simulation, flux, largeur, hauteur)
+        if n_processus == 1:
+            rendu = _RenduImages(*initargs)
+            try:
+                for debut, fin in plages:
+                    ecrire(rendu.plage(debut, fin))
+            finally:
+                rendu.fermer()
+        else:
+            # "spawn" : chaque processus crée son propre contexte de rendu VTK.
+            # Au plus 2 plages par processus sont en attente : la mémoire reste bornée.
+            contexte = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(n_processus, mp_context=contexte,
+                                     initializer=_initialiser, initargs=initargs) as pool:
+                en_attente = deque()
+                for debut, fin in plages:
+                    if len(en_attente) >= 2 * n_processus:
+                        ecrire(en_attente.popleft().result())
+                    en_attente.append(pool.submit(_rendre_plage, debut, fin))
+                while en_attente:
+                    ecrire(en_attente.popleft().result())
+    finally:
+        ecrivain.fermer()
+    return n_ecrites
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export hors écran des animations (MP4, GIF, PNG).")
+    parser.add_argument("simulation", choices=sorted(DUREES))
+    parser.add_argument("--sortie", required=True, help="fichier .mp4 / .gif, ou dossier pour une séquence PNG")
+    parser.add_argument("--latitude", type=float, default=48.86, help="latitude en degrés (sim1)")
+    parser.add_argument("--altitude", type=float, default=84.0, help="altitude de départ en m (sim1)")
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--largeur", type=int, default=1280)
+    parser.add_argument("--hauteur", type=int, default=720)
+    parser.add_argument("--processus", type=int, default=None, help="nombre de processus de rendu")
+    args = parser.parse_args(argv)
+
+    try:
+        n_images = exporter(args.simulation, args.sortie, args.latitude, args.altitude, args.fps,
+                            args.largeur, args.hauteur, args.processus)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"{n_images} images écrites dans {args.sortie}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
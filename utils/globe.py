@@ -1,5 +1,77 @@
+import json
+import numpy as np
 import pyvista as pv
 
+from utils.cache import dossier_cache
+from utils.instrumentation import creer_instrumentation
+
+# Paramètres du maillage du globe de l'interface : toute modification invalide le cache
+RESOLUTION_GLOBE = 100
+VERSION_CACHE_GLOBE = 1
+
+# Cadence du champ de déviation (images/s)
+FPS_CHAMP = 30
+
+
+def construire_globe(resolution=RESOLUTION_GLOBE):
+    """Construit le maillage texturé du globe et charge la texture (calcul complet, lent)."""
+    # 1. Création de la sphère de base
+    # On augmente la résolution pour un rendu plus joli
+    earth_mesh = pv.Sphere(radius=1.0, theta_resolution=resolution, phi_resolution=resolution)
+
+    # 2. Préparation des coordonnées de texture
+    # inplace=True modifie directement le maillage
+    earth_mesh.texture_map_to_sphere(inplace=True)
+
+    try:
+        # Chargement de la texture (module d'exemples importé seulement ici)
+        from pyvista import examples
+        tex = pv.read_texture(examples.mapfile) if hasattr(examples, "mapfile") else None
+    except Exception:
+        tex = None
+    return earth_mesh, tex
+
+
+def charger_globe(resolution=RESOLUTION_GLOBE):
+    """
+    Retourne (maillage, texture) du globe, via un cache disque.
+
+    Les tableaux (points, faces, coordonnées de texture, image) sont stockés en
+    .npy dans le dossier de cache et relus par projection mémoire : le calcul des
+    coordonnées de texture et le décodage du JPEG ne sont faits qu'au premier
+    lancement.
+    """
+    dossier = dossier_cache() / "globe"
+    meta = {"version": VERSION_CACHE_GLOBE, "resolution": resolution, "pyvista": pv.__version__}
+
+    try:
+        if json.loads((dossier / "meta.json").read_text()) == meta:
+            earth_mesh = pv.PolyData(
+                np.load(dossier / "points.npy", mmap_mode="r"),
+                np.load(dossier / "faces.npy", mmap_mode="r"),
+            )
+            earth_mesh.active_texture_coordinates = np.load(dossier / "tcoords.npy", mmap_mode="r")
+            chemin_image = dossier / "texture.npy"
+            tex = pv.Texture(np.load(chemin_image, mmap_mode="r")) if chemin_image.exists() else None
+            return earth_mesh, tex
+    except (OSError, ValueError):
+        pass
+
+    # Cache absent, obsolète ou illisible : on reconstruit puis on l'écrit
+    earth_mesh, tex = construire_globe(resolution)
+    try:
+        dossier.mkdir(parents=True, exist_ok=True)
+        np.save(dossier / "points.npy", np.asarray(earth_mesh.points))
+        np.save(dossier / "faces.npy", np.asarray(earth_mesh.faces))
+        np.save(dossier / "tcoords.npy", np.asarray(earth_mesh.active_texture_coordinates))
+        if tex is not None:
+            np.save(dossier / "texture.npy", tex.to_array())
+        (dossier / "meta.json").write_text(json.dumps(meta))
+    except OSError:
+        pass
+    return earth_mesh, tex
+
+
 class GlobeApp:
     def __init__(self):
         self.plotter = pv.Plotter(shape=(1, 2), title="Coriolis Simulation - Multi-view")
@@ -22,4 +94,52 @@ class GlobeApp:
         # Création des acteurs pour les billes
         self.b_jaune = self.plotter.add_mesh(pv.Sphere(radius=0.015), color="yellow", name="bj")
         self.b_rouge = self.plotter.add_mesh(pv.Sphere(radius=0.015), color="red", name="br")
-        self.plotter.add_text("2. Observation de la déviation", font_size=10)
\ No newline at end of file
+        self.plotter.add_text("2. Observation de la déviation", font_size=10)
+
+    def setup_champ_deviation(self, champ, pas_par_image=1):
+        """
+        Ajoute le nuage d'un ChampDeviation (utils.champ) sur le globe de gauche :
+        un seul acteur, coloré par la déviation, dont le timer avance les particules.
+        """
+        self.plotter.subplot(0, 0)
+        self.champ = champ
+        self.pas_par_image = pas_par_image
+        self.plotter.add_mesh(champ.nuage, scalars="deviation", cmap="plasma", clim=(0.0, champ.echelle),
+                              point_size=2, render_points_as_spheres=False, name="champ",
+                              scalar_bar_args={"title": "Déviation", "color": "white"})
+        self.plotter.add_text(f"Champ de déviation : {champ.n_particules} particules\n[R] Recommencer",
+                              font_size=10, color="white")
+
+        self.timer_champ = None
+        self.instr = creer_instrumentation("champ")
+        self.instr.attacher(self.plotter)
+        self.plotter.iren.add_observer("TimerEvent", self._sur_timer_champ)
+        self.plotter.iren.add_observer("KeyPressEvent", self._touche_champ)
+
+    def demarrer_champ(self):
+        """(Re)lâche toutes les particules, avec le même nuage."""
+        self.arreter_champ()
+        self.champ.reinitialiser()
+        self.instr.nouvelle_animation()
+        self.timer_champ = self.plotter.iren.create_timer(1000 // FPS_CHAMP)
+
+    def arreter_champ(self):
+        if self.timer_champ is not None:
+            self.plotter.iren.destroy_timer(self.timer_champ)
+            self.timer_champ = None
+
+    def _sur_timer_champ(self, obj, event):
+        if self.timer_champ is None:
+            return
+        with self.instr.phase("physique"):
+            self.champ.avancer(self.pas_par_image)
+        with self.instr.phase("rendu"):
+            self.plotter.render()
+        self.instr.image_terminee()
+        if self.champ.termine:
+            self.arreter_champ()
+
+    def _touche_champ(self, obj, event):
+        if obj.GetKeySym() in ("r", "R"):
+            self.demarrer_champ()
+            self.plotter.render()
@@ -1,23 +1,37 @@
 import numpy as np
 
 class GestionnaireGraphiques:
-    def __init__(self, canvas1, canvas2):
+    def __init__(self, canvas1, canvas2, capacite=256):
         self.canvas1 = canvas1
         self.canvas2 = canvas2
-        
+
         # On prépare les objets lignes pour le futur
         self.line_dev = None
         self.line_alt = None
         self.ax1 = None
         self.ax2 = None
 
-    def preparer_axes(self, t_max, h_max, dev_max):
+        # Buffers préalloués (temps, déviation, altitude) et nombre de points visibles.
+        # Un ajout écrit en place ; la capacité double seulement si elle est dépassée.
+        self._t = np.empty(capacite)
+        self._dev = np.empty(capacite)
+        self._alt = np.empty(capacite)
+        self.n_points = 0
+
+        # Fonds (axes, grille, titres) mémorisés pour le blitting
+        self._fond1 = None
+        self._fond2 = None
+        self.canvas1.mpl_connect("draw_event", self._memoriser_fonds)
+        self.canvas2.mpl_connect("draw_event", self._memoriser_fonds)
+
+    def preparer_axes(self, t_max, h_max, dev_max, n_points=None):
         """Vide les figures et prépare les axes proprement avant l'animation."""
+        # Les lignes sont "animées" : elles ne sont pas dessinées avec le fond statique
         # --- Graphique 1 : Déviation ---
         self.canvas1.figure.clf() # On vide TOUT
         self.ax1 = self.canvas1.figure.add_subplot(111)
-        self.line_dev, = self.ax1.plot([], [], color='red', lw=2)
-        
+        self.line_dev, = self.ax1.plot([], [], color='red', lw=2, animated=True)
+
         self.ax1.set_xlim(0, t_max)
         self.ax1.set_ylim(0, dev_max * 1.1)
         self.ax1.set_title("Déviation cumulée (mm)", pad=15)
@@ -27,34 +41,90 @@ class GestionnaireGraphiques:
         # --- Graphique 2 : Altitude ---
         self.canvas2.figure.clf() # On vide TOUT
         self.ax2 = self.canvas2.figure.add_subplot(111)
-        self.line_alt, = self.ax2.plot([], [], color='green', lw=2)
-        
+        self.line_alt, = self.ax2.plot([], [], color='green', lw=2, animated=True)
+
         self.ax2.set_xlim(0, t_max)
         self.ax2.set_ylim(0, h_max * 1.1)
         self.ax2.set_title("Altitude z(t) (m)", pad=15)
         self.ax2.set_xlabel("Temps (s)")
         self.ax2.grid(True, linestyle='--', alpha=0.7)
 
+        # Remise à zéro des buffers (réalloués seulement si trop petits)
+        self.n_points = 0
+        if n_points is not None and n_points > self._t.size:
+            self._agrandir(n_points)
+
         # Empêche les chevauchements de texte
         self.canvas1.figure.tight_layout()
         self.canvas2.figure.tight_layout()
-        
+
+        # Le dessin complet déclenche _memoriser_fonds
         self.canvas1.draw()
         self.canvas2.draw()
 
+    def _agrandir(self, capacite):
+        for nom in ("_t", "_dev", "_alt"):
+            ancien = getattr(self, nom)
+            nouveau = np.empty(capacite)
+            nouveau[:self.n_points] = ancien[:self.n_points]
+            setattr(self, nom, nouveau)
+
+    def _memoriser_fonds(self, event):
+        """Après un dessin complet (préparation, redimensionnement), capture le fond statique."""
+        canvas = event.canvas
+        if not getattr(canvas, "supports_blit", False):
+            return
+        fond = canvas.copy_from_bbox(canvas.figure.bbox)
+        if canvas is self.canvas1:
+            self._fond1 = fond
+            ligne = self.line_dev
+        else:
+            self._fond2 = fond
+            ligne = self.line_alt
+        # Les lignes animées ne font pas partie du dessin complet : on les repose
+        if ligne is not None and ligne.axes is not None:
+            ligne.axes.draw_artist(ligne)
+
+    def _blit(self, canvas, fond, ligne):
+        if fond is None:
+            # Sans blitting, seul le dessin complet affiche la ligne : elle ne doit plus être animée
+            if not getattr(canvas, "supports_blit", False):
+                ligne.set_animated(False)
+            canvas.draw_idle()
+            return
+        canvas.restore_region(fond)
+        ligne.axes.draw_artist(ligne)
+        canvas.blit(ligne.axes.bbox)
+
+    def reinitialiser(self):
+        """Vide les lignes sans redessiner les axes (les buffers sont conservés)."""
+        self.n_points = 0
+
+    def mettre_a_jour_points(self, t_lot, dev_lot, alt_lot):
+        """
+        Ajoute un lot de points aux lignes puis redessine uniquement les lignes.
+
+        Permet de rafraîchir les graphiques moins souvent que la physique n'avance.
+        """
+        if not (self.line_dev and self.line_alt):
+            return
+        t_lot = np.atleast_1d(t_lot)
+        fin = self.n_points + t_lot.size
+        if fin > self._t.size:
+            self._agrandir(max(fin, 2 * self._t.size))
+        self._t[self.n_points:fin] = t_lot
+        self._dev[self.n_points:fin] = dev_lot
+        self._alt[self.n_points:fin] = alt_lot
+        self.n_points = fin
+
+        # Les lignes lisent des vues sur les buffers (pas de np.append)
+        self.line_dev.set_data(self._t[:fin], self._dev[:fin])
+        self.line_alt.set_data(self._t[:fin], self._alt[:fin])
+
+        # On redessine uniquement les lignes sur le fond mémorisé (très rapide)
+        self._blit(self.canvas1, self._fond1, self.line_dev)
+        self._blit(self.canvas2, self._fond2, self.line_alt)
+
     def mettre_a_jour_point(self, t_actuel, dev_actuelle, alt_actuelle):
         """Ajoute le point actuel aux lignes sans redessiner les axes."""
-        if self.line_dev and self.line_alt:
-            # Mise à jour Déviation
-            xdata = np.append(self.line_dev.get_xdata(), t_actuel)
-            ydata = np.append(self.line_dev.get_ydata(), dev_actuelle)
-            self.line_dev.set_data(xdata, ydata)
-            
-            # Mise à jour Altitude
-            xdata2 = np.append(self.line_alt.get_xdata(), t_actuel)
-            ydata2 = np.append(self.line_alt.get_ydata(), alt_actuelle)
-            self.line_alt.set_data(xdata2, ydata2)
-            
-            # On redessine uniquement le contenu (très rapide)
-            self.canvas1.draw_idle()
-            self.canvas2.draw_idle()
\ No newline at end of file
+        self.mettre_a_jour_points(t_actuel, dev_actuelle, alt_actuelle)
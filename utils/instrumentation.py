@@ -0,0 +1,158 @@
+import json
+import os
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+
+# Variable d'environnement : "1" pour l'affichage seul, un chemin pour écrire aussi la trace JSONL
+VARIABLE_ENVIRONNEMENT = "CORIOLIS_INSTRUMENTATION"
+
+# Rafraîchissement du texte affiché (s) : le texte VTK n'est pas mis à jour à chaque image
+PERIODE_AFFICHAGE = 0.25
+
+
+class Instrumentation:
+    """
+    Mesures par image des boucles d'animation.
+
+    Chaque image est découpée en phases chronométrées (`with instr.phase("rendu"):`),
+    puis close par `image_terminee()`. On garde une fenêtre glissante des intervalles
+    entre images pour le FPS et les percentiles p50/p95/p99 ; le temps passé hors
+    des phases (boucle d'événements Qt/VTK) est compté dans "hors_phases".
+    Chaque image peut être ajoutée à une trace JSONL.
+    """
+
+    actif = True
+
+    def __init__(self, nom, chemin_trace=None, fenetre=120):
+        self.nom = nom
+        self.n_images = 0
+        self._intervalles = deque(maxlen=fenetre)
+        self._phases = {}
+        self._cumul_phases = {}
+        self._derniere_image = None
+        self._evenements = {}
+        self._texte = None
+        self._dernier_affichage = 0.0
+        self._trace = open(chemin_trace, "a") if chemin_trace else None
+
+    @contextmanager
+    def phase(self, nom):
+        debut = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.ajouter(nom, time.perf_counter() - debut)
+
+    def ajouter(self, nom, duree):
+        """Ajoute une durée (s) à une phase de l'image en cours."""
+        self._phases[nom] = self._phases.get(nom, 0.0) + duree
+
+    def evenement(self, nom, duree):
+        """Mesure hors des images (ex. : calcul physique d'un clic), affichée et tracée."""
+        self._evenements[nom] = duree
+        self._ecrire({"type": "evenement", "nom": nom, "duree_ms": duree * 1000})
+
+    def nouvelle_animation(self):
+        """L'attente entre deux animations ne compte pas comme une image lente."""
+        self._derniere_image = None
+
+    def image_terminee(self):
+        maintenant = time.perf_counter()
+        intervalle = None
+        if self._derniere_image is not None:
+            intervalle = maintenant - self._derniere_image
+            self._intervalles.append(intervalle)
+            self._phases["hors_phases"] = max(0.0, intervalle - sum(self._phases.values()))
+        self._derniere_image = maintenant
+        self.n_images += 1
+
+        for nom, duree in self._phases.items():
+            self._cumul_phases[nom] = 0.9 * self._cumul_phases.get(nom, duree) + 0.1 * duree
+        self._ecrire({
+            "type": "image",
+            "image": self.n_images,
+            "intervalle_ms": None if intervalle is None else intervalle * 1000,
+            "phases_ms": {nom: duree * 1000 for nom, duree in self._phases.items()},
+        })
+        self._phases = {}
+
+        if self._texte is not None and maintenant - self._dernier_affichage > PERIODE_AFFICHAGE:
+            self._dernier_affichage = maintenant
+            self._texte.SetInput(self.texte())
+
+    def statistiques(self):
+        """FPS et percentiles (ms) sur la fenêtre glissante, moyennes lissées des phases (ms)."""
+        if not self._intervalles:
+            return {"fps": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "phases": {}}
+        intervalles = np.fromiter(self._intervalles, float)
+        p50, p95, p99 = np.percentile(intervalles, [50, 95, 99]) * 1000
+        return {
+            "fps": 1 / intervalles.mean(),
+            "p50": p50,
+            "p95": p95,
+            "p99": p99,
+            "phases": {nom: duree * 1000 for nom, duree in self._cumul_phases.items()},
+        }
+
+    def texte(self):
+        s = self.statistiques()
+        lignes = [
+            f"{s['fps']:5.1f} FPS",
+            f"image p50 {s['p50']:5.1f}  p95 {s['p95']:5.1f}  p99 {s['p99']:5.1f} ms",
+        ]
+        lignes += [f"  {nom:<12} {duree:6.2f} ms" for nom, duree in s["phases"].items()]
+        lignes += [f"  {nom:<12} {duree * 1000:6.1f} ms (dernier)" for nom, duree in self._evenements.items()]
+        return "\n".join(lignes)
+
+    def attacher(self, plotter):
+        """Affiche les mesures en bas à gauche de la vue PyVista."""
+        self._texte = plotter.add_text("", position=(10, 10), font_size=8, color="white", font="courier")
+
+    def _ecrire(self, ligne):
+        if self._trace is not None:
+            ligne["simulation"] = self.nom
+            self._trace.write(json.dumps(ligne) + "\n")
+
+    def fermer(self):
+        if self._trace is not None:
+            self._trace.close()
+            self._trace = None
+
+
+class InstrumentationNulle:
+    """Même interface, sans aucune mesure : coût quasi nul quand l'instrumentation est désactivée."""
+
+    actif = False
+    _contexte = nullcontext()
+
+    def phase(self, nom):
+        return self._contexte
+
+    def ajouter(self, nom, duree):
+        pass
+
+    def evenement(self, nom, duree):
+        pass
+
+    def nouvelle_animation(self):
+        pass
+
+    def image_terminee(self):
+        pass
+
+    def attacher(self, plotter):
+        pass
+
+    def fermer(self):
+        pass
+
+
+def creer_instrumentation(nom):
+    """Instrumentation selon CORIOLIS_INSTRUMENTATION ("1" ou chemin JSONL), nulle sinon."""
+    cible = os.environ.get(VARIABLE_ENVIRONNEMENT)
+    if not cible:
+        return InstrumentationNulle()
+    return Instrumentation(nom, chemin_trace=None if cible == "1" else cible)
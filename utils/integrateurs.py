@@ -0,0 +1,138 @@
+import numpy as np
+
+# Coefficients de Dormand-Prince (RK45) : nœuds, matrice de Butcher,
+# poids d'ordre 5 et poids d'ordre 4 pour l'estimation d'erreur
+DP_C = np.array([0, 1/5, 3/10, 4/5, 8/9, 1, 1])
+DP_A = [
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+    [35/384, 0, 500/1113, 125/192, -2187/6784, 11/84],
+]
+DP_B5 = np.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84, 0])
+DP_B4 = np.array([5179/57600, 0, 7571/16695, 393/640, -92097/339200, 187/2100, 1/40])
+
+
+def produit_vectoriel(a, b):
+    """Produit vectoriel a x b développé composante par composante (diffusion NumPy)."""
+    a = np.asarray(a)
+    b = np.asarray(b)
+    return np.stack((
+        a[..., 1] * b[..., 2] - a[..., 2] * b[..., 1],
+        a[..., 2] * b[..., 0] - a[..., 0] * b[..., 2],
+        a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0],
+    ), axis=-1)
+
+
+def pas_euler(pos, v, dt, acceleration):
+    """Euler semi-implicite : la vitesse est mise à jour avant la position."""
+    v_suiv = v + acceleration(pos, v) * dt
+    return pos + v_suiv * dt, v_suiv
+
+
+def pas_rk4(pos, v, dt, acceleration):
+    """Runge-Kutta classique d'ordre 4 sur l'état (position, vitesse)."""
+    k1_p, k1_v = v, acceleration(pos, v)
+    k2_p = v + 0.5 * dt * k1_v
+    k2_v = acceleration(pos + 0.5 * dt * k1_p, k2_p)
+    k3_p = v + 0.5 * dt * k2_v
+    k3_v = acceleration(pos + 0.5 * dt * k2_p, k3_p)
+    k4_p = v + dt * k3_v
+    k4_v = acceleration(pos + dt * k3_p, k4_p)
+
+    pos_suiv = pos + dt / 6 * (k1_p + 2 * k2_p + 2 * k3_p + k4_p)
+    v_suiv = v + dt / 6 * (k1_v + 2 * k2_v + 2 * k3_v + k4_v)
+    return pos_suiv, v_suiv
+
+
+def pas_boris(pos, v, dt, gravite, omega):
+    """
+    Pas de Boris pour le repère tournant.
+
+    La force de Coriolis -2 omega x v = v x (2 omega) agit comme un champ
+    magnétique : elle est appliquée par une rotation exacte de la vitesse,
+    encadrée par deux demi-poussées de gravité (au départ et à l'arrivée du pas).
+    Vitesse et position étant au même instant, la position avance avec la
+    vitesse moyenne de la rotation : le schéma reste d'ordre 2.
+    """
+    v_moins = v + 0.5 * dt * gravite(pos)
+
+    t = np.asarray(omega, dtype=float) * dt
+    s = 2 * t / (1 + np.dot(t, t))
+    v_prime = v_moins + produit_vectoriel(v_moins, t)
+    v_plus = v_moins + produit_vectoriel(v_prime, s)
+
+    pos_suiv = pos + 0.5 * dt * (v_moins + v_plus)
+    return pos_suiv, v_plus + 0.5 * dt * gravite(pos_suiv)
+
+
+def pas_dormand_prince(pos, v, dt, acceleration):
+    """
+    Pas de Dormand-Prince (RK45).
+
+    Retourne la solution d'ordre 5 (position, vitesse) et l'écart avec la
+    solution d'ordre 4 emboîtée, utilisé comme estimation de l'erreur locale.
+    """
+    k_p = []
+    k_v = []
+    for i in range(7):
+        p_i = pos + dt * sum(a * k for a, k in zip(DP_A[i], k_p))
+        v_i = v + dt * sum(a * k for a, k in zip(DP_A[i], k_v))
+        k_p.append(v_i)
+        k_v.append(acceleration(p_i, v_i))
+
+    pos_suiv = pos + dt * sum(b * k for b, k in zip(DP_B5, k_p))
+    v_suiv = v + dt * sum(b * k for b, k in zip(DP_B5, k_v))
+    err_p = dt * sum((b5 - b4) * k for b5, b4, k in zip(DP_B5, DP_B4, k_p))
+    err_v = dt * sum((b5 - b4) * k for b5, b4, k in zip(DP_B5, DP_B4, k_v))
+    return pos_suiv, v_suiv, np.concatenate((err_p, err_v), axis=-1)
+
+
+def interpolation_hermite(p0, v0, p1, v1, dt, s):
+    """Point du polynôme d'Hermite cubique reliant (p0, v0) à (p1, v1) à la fraction de pas s."""
+    s = s[:, None]
+    s2 = s * s
+    s3 = s2 * s
+    return ((2 * s3 - 3 * s2 + 1) * p0 + (s3 - 2 * s2 + s) * dt * v0
+            + (-2 * s3 + 3 * s2) * p1 + (s3 - s2) * dt * v1)
+
+
+def _dichotomie(dehors, n, iterations):
+    """Plus petite fraction s de [0, 1] où `dehors(s)` devient faux (vectorisé)."""
+    bas = np.zeros(n)
+    haut = np.ones(n)
+    for _ in range(iterations):
+        milieu = 0.5 * (bas + haut)
+        est_dehors = dehors(milieu)
+        bas = np.where(est_dehors, milieu, bas)
+        haut = np.where(est_dehors, haut, milieu)
+    return haut
+
+
+def point_impact(p0, v0, p1, v1, dt, rayon, iterations=40):
+    """
+    Localise le passage exact sous la sphère de rayon donné au cours d'un pas.
+
+    La trajectoire entre (p0, v0) et (p1, v1) est interpolée par un polynôme
+    d'Hermite cubique, puis la fraction de pas s où |p(s)| = rayon est trouvée
+    par dichotomie (vectorisée sur toutes les particules).
+    Retourne le point d'impact et la fraction s dans [0, 1].
+    """
+    def dehors(s):
+        p = interpolation_hermite(p0, v0, p1, v1, dt, s)
+        return np.einsum("ij,ij->i", p, p) > rayon ** 2
+
+    s = _dichotomie(dehors, len(p0), iterations)
+    return interpolation_hermite(p0, v0, p1, v1, dt, s), s
+
+
+def point_impact_plan(p0, v0, p1, v1, dt, iterations=40):
+    """Comme `point_impact`, pour le passage sous le plan horizontal z = 0."""
+    def dehors(s):
+        return interpolation_hermite(p0, v0, p1, v1, dt, s)[:, 2] > 0
+
+    s = _dichotomie(dehors, len(p0), iterations)
+    return interpolation_hermite(p0, v0, p1, v1, dt, s), s
@@ -1,6 +1,5 @@
 import sys
 from PyQt5 import QtWidgets, QtCore, QtGui
-from pyvista import examples
 import pyvista as pv
 try:
     from pyvistaqt import QtInteractor
@@ -9,12 +8,20 @@ except Exception as e:
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 
+from utils.globe import charger_globe
+
 class CoriolisInterface(QtWidgets.QWidget):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, chrono=None):
         super().__init__(parent)
         self.setWindowTitle("Analyse Coriolis - ISEP")
-        self._build_ui()
-        self._populate_views()
+        if chrono is None:
+            self._build_ui()
+            self._populate_views()
+        else:
+            with chrono.phase("interface"):
+                self._build_ui()
+            with chrono.phase("globe"):
+                self._populate_views()
 
     def _create_titled_widget(self, title, widget):
         """Encapsule un widget avec un titre au-dessus."""
@@ -84,6 +91,17 @@ class CoriolisInterface(QtWidgets.QWidget):
         self.input_alt.setSuffix(" m")
         self.input_alt.setStyleSheet("font-size: 16px; font-weight: bold; height: 30px;")
         
+        # Choix du modèle physique : formule du premier ordre ou intégration 3D complète
+        self.choix_modele = QtWidgets.QComboBox()
+        self.choix_modele.addItem("Formule analytique (t³)", "analytique")
+        self.choix_modele.addItem("Modèle 3D complet (traînée)", "3d")
+        self.choix_modele.addItem("Modèle 3D, atmosphère standard", "atmosphere")
+
+        # Aperçu sous le pointeur (mis à jour à chaque mouvement sur le globe)
+        self.apercu = QtWidgets.QLabel("Survol : —")
+        self.apercu.setStyleSheet("font-family: 'Courier New'; font-size: 12px;")
+        self.apercu.setWordWrap(True)
+
         self.details = QtWidgets.QTextEdit()
         self.details.setReadOnly(True)
         self.details.setStyleSheet("background-color: #f9f9f9; font-family: 'Courier New'; font-size: 12px;")
@@ -94,6 +112,11 @@ class CoriolisInterface(QtWidgets.QWidget):
         right_vbox.addWidget(QtWidgets.QLabel("Altitude de départ (h) :"))
         right_vbox.addWidget(self.input_alt)
         right_vbox.addSpacing(10)
+        right_vbox.addWidget(QtWidgets.QLabel("Modèle physique :"))
+        right_vbox.addWidget(self.choix_modele)
+        right_vbox.addSpacing(10)
+        right_vbox.addWidget(self.apercu)
+        right_vbox.addSpacing(10)
         right_vbox.addWidget(QtWidgets.QLabel("Résultats :"))
         right_vbox.addWidget(self.details)
         
@@ -120,22 +143,11 @@ class CoriolisInterface(QtWidgets.QWidget):
             globe_plotter = self.globe_widget
             globe_plotter.clear()
             
-            # 1. Création de la sphère de base
-            # On augmente la résolution pour un rendu plus joli
-            earth_mesh = pv.Sphere(radius=1.0, theta_resolution=100, phi_resolution=100)
-            
-            # 2. Préparation des coordonnées de texture
-            # inplace=True modifie directement le maillage
-            earth_mesh.texture_map_to_sphere(inplace=True)
-            
-            # --- LA CORRECTION EST ICI ---
-            # On fait pivoter la sphère de 180° autour de l'axe X pour remettre le Nord en haut.
-            earth_mesh.rotate_x(180)
-            # -----------------------------
+            # 1. Maillage texturé et pivoté du globe, relu depuis le cache disque
+            # (construit et mis en cache au premier lancement, voir utils.globe)
+            earth_mesh, tex = charger_globe()
             
             try:
-                # Chargement de la texture
-                tex = pv.read_texture(examples.mapfile) if hasattr(examples, "mapfile") else None
                 # Ajout du maillage texturé au traceur
                 # smooth_shading=True adoucit les facettes
                 globe_plotter.add_mesh(earth_mesh, texture=tex, smooth_shading=True)
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Reproduction Monte Carlo de la campagne de Flammarion (Panthéon, 1903).
+
+Les 169 lancers historiques donnent 8.22 ± 2.5 mm vers l'Est : la dispersion
+vient des défauts du lâcher (position, vitesse initiale), des courants d'air
+et de la traînée, propre à chaque bille (coefficient de traînée, rayon). On
+tire ici ces perturbations au hasard pour 10⁵ à 10⁷
+lancers, intégrés par lots vectorisés (ModeleChute3D) dans un pool de
+processus. Les statistiques (moyenne, variance, histogramme) sont cumulées
+en flux : seul un échantillon borné d'impacts est gardé pour l'affichage.
+
+Exemple :
+    python -m utils.montecarlo -n 1000000
+"""
+
+import argparse
+import math
+import os
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from utils.chute3d import ModeleChute3D
+
+# Conditions de l'expérience (identiques à sim2)
+HAUTEUR_PANTHEON = 68.0
+LATITUDE_PARIS = 48.8462
+MESURE_HISTORIQUE_MM = 8.22
+INCERTITUDE_HISTORIQUE_MM = 2.5
+
+# Écarts-types des perturbations (valeurs par défaut, ajustables)
+PERTURBATIONS = {
+    "position_mm": 1.0,          # décalage horizontal du point de lâcher
+    "vitesse_mm_s": 0.5,         # vitesse horizontale parasite au lâcher
+    "vent_m_s": 0.005,           # courant d'air horizontal dans la nef
+    "cd_relatif": 0.05,          # coefficient de traînée (surface, défauts de forme)
+    "rayon_relatif": 0.01,       # rayon de la bille (masse ∝ rayon³, même acier)
+}
+
+
+class StatistiquesFlux:
+    """
+    Moyenne, variance et histogramme cumulés lot par lot (algorithme de Welford
+    généralisé aux lots, formule de Chan pour la fusion).
+
+    L'histogramme a des classes fixes sur [borne_min, borne_max] ; les valeurs
+    hors bornes sont comptées à part.
+    """
+
+    def __init__(self, borne_min=-10.0, borne_max=30.0, n_classes=400):
+        self.n = 0
+        self.moyenne = 0.0
+        self._m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.bornes = np.linspace(borne_min, borne_max, n_classes + 1)
+        self.histogramme = np.zeros(n_classes, dtype=np.int64)
+        self.sous = 0
+        self.dessus = 0
+
+    def ajouter(self, valeurs):
+        valeurs = np.asarray(valeurs, dtype=float).ravel()
+        if valeurs.size == 0:
+            return
+        lot = StatistiquesFlux.__new__(StatistiquesFlux)
+        lot.n = valeurs.size
+        lot.moyenne = float(valeurs.mean())
+        lot._m2 = float(((valeurs - lot.moyenne) ** 2).sum())
+        lot.minimum = float(valeurs.min())
+        lot.maximum = float(valeurs.max())
+        lot.bornes = self.bornes
+        lot.histogramme, _ = np.histogram(valeurs, bins=self.bornes)
+        lot.sous = int((valeurs < self.bornes[0]).sum())
+        lot.dessus = int((valeurs > self.bornes[-1]).sum())
+        self.fusionner(lot)
+
+    def fusionner(self, autre):
+        """Ajoute les statistiques d'un autre flux (mêmes classes d'histogramme)."""
+        if autre.n == 0:
+            return
+        n = self.n + autre.n
+        delta = autre.moyenne - self.moyenne
+        self.moyenne += delta * autre.n / n
+        self._m2 += autre._m2 + delta**2 * self.n * autre.n / n
+        self.n = n
+        self.minimum = min(self.minimum, autre.minimum)
+        self.maximum = max(self.maximum, autre.maximum)
+        self.histogramme += autre.histogramme
+        self.sous += autre.sous
+        self.dessus += autre.dessus
+
+    @property
+    def variance(self):
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def ecart_type(self):
+        return math.sqrt(self.variance)
+
+    def fraction_entre(self, bas, haut):
+        """Fraction approchée (à une classe près) des valeurs dans [bas, haut]."""
+        if self.n == 0:
+            return 0.0
+        centres = 0.5 * (self.bornes[:-1] + self.bornes[1:])
+        return float(self.histogramme[(centres >= bas) & (centres <= haut)].sum() / self.n)
+
+
+def _simuler_lot(graine, n, perturbations, n_pas, n_echantillon):
+    """
+    Simule un lot de n lancers (exécuté dans un processus du pool).
+
+    Retourne les statistiques Est et Sud du lot et au plus `n_echantillon`
+    impacts (mm) pour le nuage de points.
+    """
+    rng = np.random.default_rng(graine)
+    modele = ModeleChute3D(trainee=True)
+
+    # Perturbations horizontales uniquement (x = Est, y = Nord)
+    v0 = np.zeros((n, 3))
+    v0[:, :2] = rng.normal(0, perturbations["vitesse_mm_s"] / 1000, (n, 2))
+    vent = np.zeros((n, 3))
+    vent[:, :2] = rng.normal(0, perturbations["vent_m_s"], (n, 2))
+    decalage_mm = rng.normal(0, perturbations["position_mm"], (n, 2))
+
+    # Traînée de chaque bille : ½·Cd·A/m ∝ Cd / rayon à masse volumique fixée
+    cd = 1 + rng.normal(0, perturbations["cd_relatif"], n)
+    rayon = 1 + rng.normal(0, perturbations["rayon_relatif"], n)
+    facteurs = modele.facteur_trainee * np.maximum(cd, 0.0) / np.maximum(rayon, 0.5)
+
+    r = modele.integrer(LATITUDE_PARIS, np.full(n, HAUTEUR_PANTHEON), v0=v0, vent=vent,
+                        n_pas=n_pas, garder_trajectoires=False, facteurs_trainee=facteurs)
+
+    # Le problème est invariant par translation horizontale à ces échelles :
+    # le décalage du lâcher s'ajoute directement au point d'impact
+    impacts = np.column_stack((r["deviation_est_mm"], r["deviation_sud_mm"])) + decalage_mm * [1, -1]
+
+    est = StatistiquesFlux()
+    est.ajouter(impacts[:, 0])
+    sud = StatistiquesFlux()
+    sud.ajouter(impacts[:, 1])
+    return est, sud, impacts[:n_echantillon]
+
+
+class CampagneMonteCarlo:
+    """
+    Lots d'une campagne Monte Carlo et cumul de leurs résultats.
+
+    Les graines des lots dérivent de `graine` (SeedSequence) : le résultat ne
+    dépend ni du nombre de processus ni de l'ordre d'arrivée des lots.
+    `soumettre(pool)` confie les lots à un pool de processus sans les attendre ;
+    `recuperer()` cumule ensuite les lots terminés, sans bloquer (à appeler
+    périodiquement, par exemple depuis le timer d'une animation). Si un lot échoue,
+    les lots restants sont annulés et `erreur` contient la trace de l'exception.
+    """
+
+    def __init__(self, n_lancers=100_000, taille_lot=20_000, graine=0, perturbations=None,
+                 n_pas=40, taille_echantillon=50_000):
+        perturbations = {**PERTURBATIONS, **(perturbations or {})}
+        tailles = [taille_lot] * (n_lancers // taille_lot)
+        if n_lancers % taille_lot:
+            tailles.append(n_lancers % taille_lot)
+        graines = np.random.SeedSequence(graine).spawn(len(tailles))
+
+        # Chaque lot contribue à l'échantillon en proportion de sa taille
+        self.arguments = [
+            (graines[i], n, perturbations, n_pas, math.ceil(taille_echantillon * n / n_lancers))
+            for i, n in enumerate(tailles)
+        ]
+        self.n_lancers = n_lancers
+        self.taille_echantillon = taille_echantillon
+        self.est = StatistiquesFlux()
+        self.sud = StatistiquesFlux()
+        self._echantillons = [None] * len(tailles)
+        self._futures = {}
+        self.erreur = None
+
+    @property
+    def fraction(self):
+        """Fraction des lancers déjà cumulés."""
+        return self.est.n / self.n_lancers
+
+    @property
+    def termine(self):
+        return self.est.n >= self.n_lancers
+
+    def recevoir(self, i, resultat):
+        """Cumule le résultat du lot `i` (voir _simuler_lot)."""
+        est_lot, sud_lot, impacts = resultat
+        self.est.fusionner(est_lot)
+        self.sud.fusionner(sud_lot)
+        self._echantillons[i] = impacts
+
+    def soumettre(self, pool):
+        """Soumet tous les lots au pool ; retourne le dictionnaire {future: indice du lot}."""
+        self._futures = {pool.submit(_simuler_lot, *args): i for i, args in enumerate(self.arguments)}
+        return self._futures
+
+    def recuperer(self):
+        """
+        Cumule les lots soumis déjà terminés (sans attendre les autres) ; retourne la fraction faite.
+
+        Un lot en échec (exception dans le processus, pool cassé, résultat non transmis)
+        annule la campagne : voir `erreur`.
+        """
+        for future in [f for f in self._futures if f.done()]:
+            i = self._futures.pop(future)
+            try:
+                resultat = future.result()
+            except Exception:
+                self.erreur = traceback.format_exc()
+                self.annuler()
+                break
+            self.recevoir(i, resultat)
+        return self.fraction
+
+    def annuler(self):
+        """Annule les lots soumis qui n'ont pas encore commencé."""
+        for future in self._futures:
+            future.cancel()
+        self._futures = {}
+
+    def resultat(self):
+        """Dictionnaire est, sud (StatistiquesFlux, en mm) et impacts (échantillon (K, 2) en mm)."""
+        impacts = [e for e in self._echantillons if e is not None]
+        impacts = np.concatenate(impacts) if impacts else np.empty((0, 2))
+        return {"est": self.est, "sud": self.sud, "impacts": impacts[:self.taille_echantillon]}
+
+
+def lancer_monte_carlo(n_lancers=100_000, taille_lot=20_000, n_processus=None, graine=0,
+                       perturbations=None, n_pas=40, taille_echantillon=50_000, progression=None):
+    """
+    Lance la campagne Monte Carlo et retourne un dictionnaire :
+    est, sud (StatistiquesFlux, en mm) et impacts (échantillon (K, 2) en mm).
+
+    Bloquant ; voir CampagneMonteCarlo pour suivre une campagne sans l'attendre.
+    `progression(fraction)` est appelée à la fin de chaque lot.
+    """
+    campagne = CampagneMonteCarlo(n_lancers, taille_lot, graine, perturbations, n_pas, taille_echantillon)
+
+    def recevoir(i, resultat):
+        campagne.recevoir(i, resultat)
+        if progression is not None:
+            progression(campagne.fraction)
+
+    n_lots = len(campagne.arguments)
+    n_processus = n_processus or os.cpu_count() or 1
+    if n_processus == 1 or n_lots == 1:
+        for i, args in enumerate(campagne.arguments):
+            recevoir(i, _simuler_lot(*args))
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_processus, n_lots)) as pool:
+            futures = campagne.soumettre(pool)
+            try:
+                for future in as_completed(futures):
+                    recevoir(futures[future], future.result())
+            except Exception:
+                # Lots restants annulés : la sortie du pool n'attend que ceux déjà commencés
+                campagne.annuler()
+                raise
+
+    return campagne.resultat()
+
+
+def resume(resultat):
+    """Texte de synthèse comparant la simulation à la mesure historique."""
+    est = resultat["est"]
+    sud = resultat["sud"]
+    dans_barre = est.fraction_entre(MESURE_HISTORIQUE_MM - INCERTITUDE_HISTORIQUE_MM,
+                                    MESURE_HISTORIQUE_MM + INCERTITUDE_HISTORIQUE_MM)
+    return (
+        f"MONTE CARLO ({est.n:,} lancers) :\n".replace(",", " ")
+        + f"  Est : {est.moyenne:.2f} ± {est.ecart_type:.2f} mm\n"
+        + f"  Sud : {sud.moyenne:.2f} ± {sud.ecart_type:.2f} mm\n"
+        + f"  Dans 8.22 ± 2.5 mm : {dans_barre * 100:.1f} %"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo de l'expérience de Flammarion.")
+    parser.add_argument("-n", "--lancers", type=int, default=100_000, help="nombre de lancers")
+    parser.add_argument("--lot", type=int, default=20_000, help="taille d'un lot vectorisé")
+    parser.add_argument("--processus", type=int, default=None, help="nombre de processus")
+    parser.add_argument("--graine", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    resultat = lancer_monte_carlo(args.lancers, args.lot, args.processus, args.graine)
+    print(resume(resultat))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,742 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Noyau physique partagé : formules de la chute et backends des boucles d'intégration.
+
+Les formules fermées (temps de vol, déviation vers l'Est, altitude) sont
+utilisées par bille, sim2, comparaison et chute3d. Les boucles pas à pas
+(SimulateurCoriolis.calculer_trajectoires_lot et ModeleChute3D.integrer)
+sont déléguées au backend actif :
+
+- "numpy" (défaut) : boucle Python sur les pas, vectorisée sur les particules ;
+- "numba" (si numba est installé) : noyaux compilés, une boucle par particule.
+
+Le backend est choisi par la variable d'environnement CORIOLIS_BACKEND ou à
+l'exécution par `choisir_backend(nom)`. Les tests (tests/test_noyau.py)
+comparent chaque backend disponible au backend NumPy sur des cas de
+référence ; `python -m utils.noyau` affiche la même comparaison.
+
+Les boucles NumPy existent aussi en générateurs pas à pas (iterer_pas_fixe,
+iterer_chute3d, regroupés par `par_blocs`) : les animations consomment une
+trajectoire au fur et à mesure de son calcul.
+"""
+
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+
+from utils import integrateurs
+from utils.stockage import StockageTrajectoire
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+VARIABLE_ENVIRONNEMENT = "CORIOLIS_BACKEND"
+BACKEND_DEFAUT = "numpy"
+
+# Écart relatif toléré entre un backend et le backend NumPy (ordre des opérations flottantes)
+TOLERANCE_VERIFICATION = 1e-9
+
+
+# ==================== FORMULES PARTAGÉES ====================
+
+# Constantes terrestres de toutes les simulations (seule définition, reprise par
+# SimulateurBille, ModeleChute3D, PenduleFoucault, l'atmosphère, sim2 et la comparaison)
+G = 9.81  # Accélération de la pesanteur (m/s²)
+OMEGA_TERRE = 7.2921e-5  # Vitesse angulaire de la Terre (rad/s)
+R_TERRE = 6371000  # Rayon moyen de la Terre (m)
+
+
+def temps_vol(hauteur, g):
+    """Temps de chute dans le vide : t = sqrt(2h/g)."""
+    return np.sqrt(2 * np.asarray(hauteur, dtype=float) / g)
+
+
+def temps_vol_trainee(hauteur, g, k):
+    """
+    Temps de chute verticale avec traînée quadratique (a = -g + k·v²) :
+    t = (v_l/g)·argch(exp(k·h)), v_l = sqrt(g/k) ; temps_vol là où k = 0.
+    `k` est un scalaire ou un tableau diffusable avec `hauteur`.
+    """
+    hauteur = np.asarray(hauteur, dtype=float)
+    k = np.asarray(k, dtype=float)
+    if not np.any(k > 0):
+        return temps_vol(hauteur, g)
+    k_positif = np.where(k > 0, k, 1.0)
+    x = k_positif * hauteur
+    # argch(exp(x)) = x + ln(1 + sqrt(1 - exp(-2x))), sans dépassement pour x grand
+    t = np.sqrt(1 / (g * k_positif)) * (x + np.log1p(np.sqrt(-np.expm1(-2 * x))))
+    return np.where(k > 0, t, temps_vol(hauteur, g))
+
+
+def deviation_est(latitude_rad, t, g, omega):
+    """Déviation vers l'Est au temps t : d = 1/3·ω·cos(φ)·g·t³."""
+    return (1/3) * omega * np.cos(latitude_rad) * g * t**3
+
+
+def acceleration_coriolis(latitude_rad, t, g, omega):
+    """Accélération de Coriolis vers l'Est au temps t d'une chute verticale : 2·ω·cos(φ)·g·t."""
+    return 2 * omega * np.cos(latitude_rad) * g * t
+
+
+def altitude_chute(hauteur, t, g):
+    """Altitude au temps t d'une chute verticale depuis `hauteur` : z = h - ½·g·t²."""
+    return hauteur - 0.5 * g * t**2
+
+
+# ==================== REGISTRE ====================
+
+BACKENDS = {}
+_actif = None
+
+
+def enregistrer_backend(classe):
+    """Décorateur : ajoute une classe de backend au registre (sous `classe.nom`)."""
+    BACKENDS[classe.nom] = classe
+    return classe
+
+
+def backends_disponibles():
+    return [nom for nom, classe in BACKENDS.items() if classe.disponible()]
+
+
+def choisir_backend(nom):
+    """Active le backend `nom` pour tous les calculs suivants et le retourne."""
+    global _actif
+    if nom not in BACKENDS:
+        raise ValueError(f"Backend inconnu : {nom!r} (choix : {tuple(BACKENDS)})")
+    classe = BACKENDS[nom]
+    if not classe.disponible():
+        raise ValueError(f"Backend {nom!r} indisponible ({classe.installation})")
+    _actif = classe()
+    return _actif
+
+
+def backend_actif():
+    """Backend courant ; au premier appel, celui de CORIOLIS_BACKEND (NumPy par défaut)."""
+    if _actif is None:
+        nom = os.environ.get(VARIABLE_ENVIRONNEMENT) or BACKEND_DEFAUT
+        try:
+            choisir_backend(nom)
+        except ValueError as e:
+            warnings.warn(f"{VARIABLE_ENVIRONNEMENT} : {e} ; backend {BACKEND_DEFAUT!r} utilisé", stacklevel=2)
+            choisir_backend(BACKEND_DEFAUT)
+    return _actif
+
+
+def _finir_impacts(trajectoires, indices_arret, touche, impacts):
+    """Remplace, pour les particules arrivées au sol, le dernier point et la suite par l'impact."""
+    if touche.any():
+        apres = np.arange(trajectoires.shape[1])[None, :] >= indices_arret[touche, None]
+        trajectoires[touche] = np.where(apres[..., None], impacts[:, None, :], trajectoires[touche])
+
+
+# ==================== BACKEND NUMPY ====================
+
+@enregistrer_backend
+class BackendNumPy:
+    """Boucle Python sur les pas, opérations vectorisées sur toutes les particules actives."""
+
+    nom = "numpy"
+    installation = ""
+
+    @staticmethod
+    def disponible():
+        return True
+
+    def pas_fixe(self, simulateur, methode, pos, dt, n_pas_max, rayon_sol, coriolis, stockage):
+        """
+        Trajectoires du SimulateurCoriolis depuis `pos` (vitesse nulle), au plus `n_pas_max` pas.
+
+        Les positions de tout le lot sont ajoutées à chaque pas dans `stockage`
+        (StockageTrajectoire de forme de point (N, 3)). Retourne une vue (N, T, 3)
+        du stockage et l'indice du dernier point de chaque particule.
+        Voir calculer_trajectoires_lot.
+        """
+        for positions, indices_arret in self.iterer_pas_fixe(simulateur, methode, pos, dt, n_pas_max,
+                                                              rayon_sol, coriolis):
+            stockage.ajouter(positions)
+        return stockage.donnees.swapaxes(0, 1), indices_arret
+
+    def iterer_pas_fixe(self, simulateur, methode, pos, dt, n_pas_max, rayon_sol, coriolis):
+        """
+        Générateur pas à pas de pas_fixe : produit (positions (N, 3), indices_arret (N,))
+        au départ puis après chaque pas, jusqu'à ce que toutes les particules soient au sol.
+
+        Les tableaux produits sont modifiés en place au pas suivant : le consommateur
+        copie ce qu'il garde. Rien n'est calculé tant que le pas suivant n'est pas demandé.
+        """
+        n_particules = pos.shape[0]
+        pos = pos.copy()
+        v = np.zeros_like(pos)
+        indices_arret = np.zeros(n_particules, dtype=int)
+        yield pos, indices_arret
+
+        actives = np.flatnonzero(np.einsum("ij,ij->i", pos, pos) > rayon_sol ** 2)
+
+        for k in range(1, n_pas_max + 1):
+            if actives.size == 0:
+                # Toutes les particules sont au sol : la trajectoire s'arrête ici
+                break
+
+            p = pos[actives]
+            vit = v[actives]
+            p_suiv, v_suiv = simulateur.pas(methode, p, vit, dt, coriolis)
+
+            # Les particules qui passent sous le sol sont ramenées sur la surface
+            touche = np.einsum("ij,ij->i", p_suiv, p_suiv) <= rayon_sol ** 2
+            if touche.any():
+                if methode == "rk4":
+                    v0, v1 = vit[touche], v_suiv[touche]
+                else:
+                    # Schémas à dérive rectiligne : mouvement uniforme sur le pas
+                    v0 = v1 = (p_suiv[touche] - p[touche]) / dt
+                p_suiv[touche], _ = integrateurs.point_impact(
+                    p[touche], v0, p_suiv[touche], v1, dt, rayon_sol
+                )
+
+            pos[actives] = p_suiv
+            v[actives] = v_suiv
+            indices_arret[actives] = k
+            yield pos, indices_arret
+
+            # Les particules qui viennent de toucher le sol sont retirées du lot
+            actives = actives[~touche]
+
+    def chute3d(self, modele, pos, v, dt, omega_local, vent, facteurs, n_pas_max, stockage=None):
+        """
+        Intégration RK4 de ModeleChute3D jusqu'au sol (z = 0), au plus `n_pas_max` pas
+        (`facteurs` : ½·Cd·A/m de chaque bille).
+
+        Si `stockage` (StockageTrajectoire de forme de point (M, 3)) est donné, les
+        positions y sont ajoutées à chaque pas. Retourne (impact (M, 3), temps de vol (M,),
+        instants (M, T) ou None, trajectoires (M, T, 3) ou None), les deux derniers
+        étant des vues des stockages. Voir ModeleChute3D.integrer.
+        """
+        etats = self.iterer_chute3d(modele, pos, v, dt, omega_local, vent, facteurs, n_pas_max)
+        if stockage is None:
+            for _, pos, _, temps_vol in etats:
+                pass
+            return pos, temps_vol, None, None
+
+        instants = StockageTrajectoire((pos.shape[0],), capacite=stockage.capacite)
+        for temps, pos, _, temps_vol in etats:
+            stockage.ajouter(pos)
+            instants.ajouter(temps)
+        return pos, temps_vol, instants.donnees.T, stockage.donnees.swapaxes(0, 1)
+
+    def iterer_chute3d(self, modele, pos, v, dt, omega_local, vent, facteurs, n_pas_max):
+        """
+        Générateur pas à pas de chute3d : produit (instants (M,), positions (M, 3),
+        vitesses (M, 3), temps de vol (M,), NaN tant que la bille vole) au départ
+        puis après chaque pas, jusqu'à ce que toutes les billes soient au sol.
+
+        Comme pour iterer_pas_fixe, les tableaux produits sont modifiés en place au pas suivant.
+        """
+        n = pos.shape[0]
+        pos = pos.copy()
+        v = v.copy()
+        dt = dt[:, None]
+        temps = np.zeros(n)
+        temps_vol = np.full(n, np.nan)
+
+        actives = np.flatnonzero(pos[:, 2] > 0)
+        temps_vol[pos[:, 2] <= 0] = 0.0
+        yield temps, pos, v, temps_vol
+
+        for _ in range(n_pas_max):
+            if actives.size == 0:
+                break
+
+            p = pos[actives]
+            vit = v[actives]
+            h = dt[actives]
+            om = omega_local[actives]
+            ve = vent[actives]
+            fa = facteurs[actives]
+            acceleration = lambda q, w: modele.acceleration(q, w, om, ve, fa)
+            p_suiv, v_suiv = integrateurs.pas_rk4(p, vit, h, acceleration)
+
+            # Les billes qui passent sous le sol sont ramenées exactement sur z = 0
+            touche = p_suiv[:, 2] <= 0
+            fraction = np.ones(actives.size)
+            if touche.any():
+                p_sol, fraction[touche] = integrateurs.point_impact_plan(
+                    p[touche], vit[touche], p_suiv[touche], v_suiv[touche], h[touche]
+                )
+                p_sol[:, 2] = 0.0
+                p_suiv[touche] = p_sol
+
+            pos[actives] = p_suiv
+            v[actives] = v_suiv
+            temps[actives] += fraction * h[:, 0]
+            temps_vol[actives[touche]] = temps[actives[touche]]
+            yield temps, pos, v, temps_vol
+
+            actives = actives[~touche]
+
+
+def par_blocs(etats, taille):
+    """
+    Regroupe par `taille` les états d'un générateur pas à pas (iterer_pas_fixe, iterer_chute3d).
+
+    Chaque état est un tuple de tableaux modifiés en place au pas suivant : ils sont
+    copiés. Produit des tuples de tableaux (k, ...), k <= taille (None : un seul bloc).
+    Un bloc n'est calculé que lorsqu'il est demandé : le consommateur règle le rythme
+    de l'intégration.
+    """
+    bloc = []
+    for etat in etats:
+        bloc.append(tuple(np.array(x) for x in etat))
+        if len(bloc) == taille:
+            yield tuple(np.stack(colonne) for colonne in zip(*bloc))
+            bloc = []
+    if bloc:
+        yield tuple(np.stack(colonne) for colonne in zip(*bloc))
+
+
+# ==================== BACKEND NUMBA ====================
+# Mêmes schémas que integrateurs.py, écrits composante par composante pour une
+# particule à la fois. Le point d'impact (Hermite + dichotomie) reste calculé
+# par integrateurs.py, sur l'état avant/après le pas qui franchit le sol.
+
+METHODES_CODES = {"euler": 0, "rk4": 1, "boris": 2}
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _acceleration_centrale(px, py, pz, vx, vy, vz, ox, oy, oz, g_scale, coriolis):
+        facteur = -g_scale / np.sqrt(px * px + py * py + pz * pz)
+        ax = px * facteur
+        ay = py * facteur
+        az = pz * facteur
+        if coriolis:
+            ax -= 2 * (oy * vz - oz * vy)
+            ay -= 2 * (oz * vx - ox * vz)
+            az -= 2 * (ox * vy - oy * vx)
+        return ax, ay, az
+
+    @numba.njit(cache=True)
+    def _pas_central(code, px, py, pz, vx, vy, vz, dt, ox, oy, oz, g_scale, coriolis):
+        if code == 0:
+            ax, ay, az = _acceleration_centrale(px, py, pz, vx, vy, vz, ox, oy, oz, g_scale, coriolis)
+            vx = vx + ax * dt
+            vy = vy + ay * dt
+            vz = vz + az * dt
+            return px + vx * dt, py + vy * dt, pz + vz * dt, vx, vy, vz
+        if code == 1:
+            k1vx, k1vy, k1vz = _acceleration_centrale(px, py, pz, vx, vy, vz, ox, oy, oz, g_scale, coriolis)
+            k2px = vx + 0.5 * dt * k1vx
+            k2py = vy + 0.5 * dt * k1vy
+            k2pz = vz + 0.5 * dt * k1vz
+            k2vx, k2vy, k2vz = _acceleration_centrale(px + 0.5 * dt * vx, py + 0.5 * dt * vy, pz + 0.5 * dt * vz,
+                                                      k2px, k2py, k2pz, ox, oy, oz, g_scale, coriolis)
+            k3px = vx + 0.5 * dt * k2vx
+            k3py = vy + 0.5 * dt * k2vy
+            k3pz = vz + 0.5 * dt * k2vz
+            k3vx, k3vy, k3vz = _acceleration_centrale(px + 0.5 * dt * k2px, py + 0.5 * dt * k2py,
+                                                      pz + 0.5 * dt * k2pz, k3px, k3py, k3pz,
+                                                      ox, oy, oz, g_scale, coriolis)
+            k4px = vx + dt * k3vx
+            k4py = vy + dt * k3vy
+            k4pz = vz + dt * k3vz
+            k4vx, k4vy, k4vz = _acceleration_centrale(px + dt * k3px, py + dt * k3py, pz + dt * k3pz,
+                                                      k4px, k4py, k4pz, ox, oy, oz, g_scale, coriolis)
+            return (px + dt / 6 * (vx + 2 * k2px + 2 * k3px + k4px),
+                    py + dt / 6 * (vy + 2 * k2py + 2 * k3py + k4py),
+                    pz + dt / 6 * (vz + 2 * k2pz + 2 * k3pz + k4pz),
+                    vx + dt / 6 * (k1vx + 2 * k2vx + 2 * k3vx + k4vx),
+                    vy + dt / 6 * (k1vy + 2 * k2vy + 2 * k3vy + k4vy),
+                    vz + dt / 6 * (k1vz + 2 * k2vz + 2 * k3vz + k4vz))
+        # Boris : rotation exacte de la vitesse entre deux demi-poussées de gravité (départ, arrivée)
+        facteur = -g_scale / np.sqrt(px * px + py * py + pz * pz)
+        ax = px * facteur
+        ay = py * facteur
+        az = pz * facteur
+        mx = vx + 0.5 * dt * ax
+        my = vy + 0.5 * dt * ay
+        mz = vz + 0.5 * dt * az
+        if coriolis:
+            tx, ty, tz = ox * dt, oy * dt, oz * dt
+        else:
+            tx, ty, tz = 0.0, 0.0, 0.0
+        d = 1 + (tx * tx + ty * ty + tz * tz)
+        sx, sy, sz = 2 * tx / d, 2 * ty / d, 2 * tz / d
+        qx = mx + (my * tz - mz * ty)
+        qy = my + (mz * tx - mx * tz)
+        qz = mz + (mx * ty - my * tx)
+        wx = mx + (qy * sz - qz * sy)
+        wy = my + (qz * sx - qx * sz)
+        wz = mz + (qx * sy - qy * sx)
+        # Dérive à la vitesse moyenne de la rotation, puis demi-poussée à l'arrivée
+        px = px + 0.5 * dt * (mx + wx)
+        py = py + 0.5 * dt * (my + wy)
+        pz = pz + 0.5 * dt * (mz + wz)
+        facteur = -g_scale / np.sqrt(px * px + py * py + pz * pz)
+        return (px, py, pz,
+                wx + 0.5 * dt * px * facteur, wy + 0.5 * dt * py * facteur, wz + 0.5 * dt * pz * facteur)
+
+    @numba.njit(cache=True)
+    def _noyau_pas_fixe(code, departs, dt, n_pas_max, rayon_sol, omega, g_scale, coriolis, trajectoires):
+        # trajectoires : tableau (n_pas_max + 1, n, 3) en ordre temporel, rempli sur place
+        n = departs.shape[0]
+        r2 = rayon_sol * rayon_sol
+        ox, oy, oz = omega[0], omega[1], omega[2]
+        indices_arret = np.zeros(n, dtype=np.int64)
+        touche = np.zeros(n, dtype=np.bool_)
+        # État avant et après le pas qui franchit le sol : p0, v0, p1, v1
+        franchissement = np.zeros((n, 4, 3))
+
+        for i in range(n):
+            px, py, pz = departs[i, 0], departs[i, 1], departs[i, 2]
+            vx, vy, vz = 0.0, 0.0, 0.0
+            trajectoires[0, i] = departs[i]
+            k_fin = 0
+            if px * px + py * py + pz * pz > r2:
+                for k in range(1, n_pas_max + 1):
+                    qx, qy, qz, wx, wy, wz = _pas_central(code, px, py, pz, vx, vy, vz, dt,
+                                                          ox, oy, oz, g_scale, coriolis)
+                    trajectoires[k, i, 0] = qx
+                    trajectoires[k, i, 1] = qy
+                    trajectoires[k, i, 2] = qz
+                    k_fin = k
+                    if qx * qx + qy * qy + qz * qz <= r2:
+                        touche[i] = True
+                        f = franchissement[i]
+                        f[0, 0], f[0, 1], f[0, 2] = px, py, pz
+                        f[1, 0], f[1, 1], f[1, 2] = vx, vy, vz
+                        f[2, 0], f[2, 1], f[2, 2] = qx, qy, qz
+                        f[3, 0], f[3, 1], f[3, 2] = wx, wy, wz
+                        break
+                    px, py, pz, vx, vy, vz = qx, qy, qz, wx, wy, wz
+            indices_arret[i] = k_fin
+
+        # Comme pour NumPy : la trajectoire s'arrête au pas de la chute la plus longue,
+        # les particules déjà au sol y restent figées
+        fin = indices_arret.max() + 1 if n else 1
+        for i in range(n):
+            for k in range(indices_arret[i] + 1, fin):
+                trajectoires[k, i] = trajectoires[indices_arret[i], i]
+        return fin, indices_arret, touche, franchissement
+
+    @numba.njit(cache=True)
+    def _acceleration_3d(px, py, pz, vx, vy, vz, oy, oz, wx, wy, wz, omega, g, R_terre, k_trainee,
+                         gravite_variable, centrifuge, trainee, table, pas_table, tabulee):
+        # Atmosphère tabulée (voir utils.atmosphere) : k_trainee est alors ½·Cd·A/m de la bille,
+        # multiplié par la densité interpolée, et le vent du profil s'ajoute
+        if tabulee:
+            n = table.shape[0]
+            s = min(max(pz / pas_table, 0.0), n - 1.0)
+            j = min(int(s), n - 2)
+            f = s - j
+            k_trainee = k_trainee * (table[j, 0] * (1 - f) + table[j + 1, 0] * f)
+            if gravite_variable:
+                g = table[j, 1] * (1 - f) + table[j + 1, 1] * f
+            wx = wx + table[j, 2] * (1 - f) + table[j + 1, 2] * f
+            wy = wy + table[j, 3] * (1 - f) + table[j + 1, 3] * f
+        ax = -2 * (oy * vz - oz * vy)
+        ay = -2 * oz * vx
+        az = 2 * oy * vx
+        if centrifuge:
+            omega_r = oy * py + oz * pz
+            ax += omega**2 * px
+            ay += omega**2 * py
+            az += omega**2 * pz
+            ay -= omega_r * oy
+            az -= omega_r * oz
+        if gravite_variable and not tabulee:
+            az -= g * (R_terre / (R_terre + pz))**2
+        else:
+            az -= g
+        if trainee:
+            rx, ry, rz = vx - wx, vy - wy, vz - wz
+            kn = k_trainee * np.sqrt(rx * rx + ry * ry + rz * rz)
+            ax -= kn * rx
+            ay -= kn * ry
+            az -= kn * rz
+        return ax, ay, az
+
+    @numba.njit(cache=True)
+    def _noyau_chute3d(pos, vit, dt, omega_local, vent, n_pas_max, garder, trajectoires, instants,
+                       omega, g, R_terre, k_trainee, gravite_variable, centrifuge, trainee,
+                       table, pas_table, tabulee):
+        # trajectoires (n_pas_max + 1, n, 3) et instants (n_pas_max + 1, n) : ordre temporel,
+        # remplis sur place si `garder` ; k_trainee (n,) : un coefficient par bille
+        n = pos.shape[0]
+        indices_arret = np.zeros(n, dtype=np.int64)
+        temps = np.zeros(n)
+        touche = np.zeros(n, dtype=np.bool_)
+        franchissement = np.zeros((n, 4, 3))
+
+        for i in range(n):
+            px, py, pz = pos[i, 0], pos[i, 1], pos[i, 2]
+            vx, vy, vz = vit[i, 0], vit[i, 1], vit[i, 2]
+            h = dt[i]
+            oy = omega_local[i, 1]
+            oz = omega_local[i, 2]
+            wx, wy, wz = vent[i, 0], vent[i, 1], vent[i, 2]
+            k_bille = k_trainee[i]
+            if garder:
+                trajectoires[0, i] = pos[i]
+                instants[0, i] = 0.0
+            t = 0.0
+            k_fin = 0
+            if pz > 0:
+                for k in range(1, n_pas_max + 1):
+                    k1vx, k1vy, k1vz = _acceleration_3d(px, py, pz, vx, vy, vz, oy, oz, wx, wy, wz,
+                                                        omega, g, R_terre, k_bille,
+                                                        gravite_variable, centrifuge, trainee,
+                                                        table, pas_table, tabulee)
+                    k2px = vx + 0.5 * h * k1vx
+                    k2py = vy + 0.5 * h * k1vy
+                    k2pz = vz + 0.5 * h * k1vz
+                    k2vx, k2vy, k2vz = _acceleration_3d(px + 0.5 * h * vx, py + 0.5 * h * vy, pz + 0.5 * h * vz,
+                                                        k2px, k2py, k2pz, oy, oz, wx, wy, wz,
+                                                        omega, g, R_terre, k_bille,
+                                                        gravite_variable, centrifuge, trainee,
+                                                        table, pas_table, tabulee)
+                    k3px = vx + 0.5 * h * k2vx
+                    k3py = vy + 0.5 * h * k2vy
+                    k3pz = vz + 0.5 * h * k2vz
+                    k3vx, k3vy, k3vz = _acceleration_3d(px + 0.5 * h * k2px, py + 0.5 * h * k2py,
+                                                        pz + 0.5 * h * k2pz, k3px, k3py, k3pz,
+                                                        oy, oz, wx, wy, wz, omega, g, R_terre, k_bille,
+                                                        gravite_variable, centrifuge, trainee,
+                                                        table, pas_table, tabulee)
+                    k4px = vx + h * k3vx
+                    k4py = vy + h * k3vy
+                    k4pz = vz + h * k3vz
+                    k4vx, k4vy, k4vz = _acceleration_3d(px + h * k3px, py + h * k3py, pz + h * k3pz,
+                                                        k4px, k4py, k4pz, oy, oz, wx, wy, wz,
+                                                        omega, g, R_terre, k_bille,
+                                                        gravite_variable, centrifuge, trainee,
+                                                        table, pas_table, tabulee)
+                    qx = px + h / 6 * (vx + 2 * k2px + 2 * k3px + k4px)
+                    qy = py + h / 6 * (vy + 2 * k2py + 2 * k3py + k4py)
+                    qz = pz + h / 6 * (vz + 2 * k2pz + 2 * k3pz + k4pz)
+                    ux = vx + h / 6 * (k1vx + 2 * k2vx + 2 * k3vx + k4vx)
+                    uy = vy + h / 6 * (k1vy + 2 * k2vy + 2 * k3vy + k4vy)
+                    uz = vz + h / 6 * (k1vz + 2 * k2vz + 2 * k3vz + k4vz)
+                    k_fin = k
+                    if qz <= 0:
+                        touche[i] = True
+                        f = franchissement[i]
+                        f[0, 0], f[0, 1], f[0, 2] = px, py, pz
+                        f[1, 0], f[1, 1], f[1, 2] = vx, vy, vz
+                        f[2, 0], f[2, 1], f[2, 2] = qx, qy, qz
+                        f[3, 0], f[3, 1], f[3, 2] = ux, uy, uz
+                        break
+                    px, py, pz, vx, vy, vz = qx, qy, qz, ux, uy, uz
+                    t += 1.0 * h
+                    if garder:
+                        trajectoires[k, i, 0] = px
+                        trajectoires[k, i, 1] = py
+                        trajectoires[k, i, 2] = pz
+                        instants[k, i] = t
+                if not touche[i]:
+                    pos[i, 0], pos[i, 1], pos[i, 2] = px, py, pz
+            temps[i] = t
+            indices_arret[i] = k_fin
+        return indices_arret, temps, touche, franchissement
+
+
+@enregistrer_backend
+class BackendNumba:
+    """Noyaux compilés par numba (compilés au premier appel, puis mis en cache sur disque)."""
+
+    nom = "numba"
+    installation = "pip install numba"
+
+    @staticmethod
+    def disponible():
+        return numba is not None
+
+    def pas_fixe(self, simulateur, methode, pos, dt, n_pas_max, rayon_sol, coriolis, stockage):
+        # Le noyau écrit directement dans le stockage, réservé pour le nombre maximal de pas
+        stockage.vider()
+        stockage.reserver(n_pas_max + 1)
+        fin, indices_arret, touche, f = _noyau_pas_fixe(
+            METHODES_CODES[methode], np.ascontiguousarray(pos, dtype=float), float(dt), int(n_pas_max),
+            float(rayon_sol), np.asarray(simulateur.omega, dtype=float), float(simulateur.g_scale),
+            bool(coriolis), np.asarray(stockage.tampon),
+        )
+        stockage.n = fin
+        trajectoires = stockage.donnees.swapaxes(0, 1)
+        if touche.any():
+            p0, v0, p1, v1 = f[touche, 0], f[touche, 1], f[touche, 2], f[touche, 3]
+            if methode != "rk4":
+                # Schémas à dérive rectiligne : mouvement uniforme sur le pas
+                v0 = v1 = (p1 - p0) / dt
+            impacts, _ = integrateurs.point_impact(p0, v0, p1, v1, dt, rayon_sol)
+            _finir_impacts(trajectoires, indices_arret, touche, impacts)
+        return trajectoires, indices_arret
+
+    def chute3d(self, modele, pos, v, dt, omega_local, vent, facteurs, n_pas_max, stockage=None):
+        pos = np.array(pos, dtype=float)
+        n = pos.shape[0]
+        garder_trajectoires = stockage is not None
+        if garder_trajectoires:
+            stockage.vider()
+            stockage.reserver(n_pas_max + 1)
+            instants = StockageTrajectoire((n,), capacite=n_pas_max + 1)
+            tampon, tampon_instants = np.asarray(stockage.tampon), instants.tampon
+        else:
+            tampon, tampon_instants = np.empty((1, n, 3)), np.empty((1, n))
+
+        # Sans atmosphère tabulée, le coefficient de traînée de chaque bille ne dépend pas de l'altitude
+        atmosphere = modele.atmosphere
+        if atmosphere is None:
+            k_trainee = np.ascontiguousarray(modele.coef_trainee(np.zeros(n), facteurs), dtype=float)
+            table, pas_table = np.zeros((2, 4)), 1.0
+        else:
+            k_trainee = np.ascontiguousarray(facteurs, dtype=float)
+            table, pas_table = atmosphere.table, atmosphere.pas
+        indices_arret, temps, touche, f = _noyau_chute3d(
+            pos, np.ascontiguousarray(v, dtype=float), np.ascontiguousarray(dt, dtype=float),
+            np.ascontiguousarray(omega_local, dtype=float), np.ascontiguousarray(vent, dtype=float),
+            int(n_pas_max), garder_trajectoires, tampon, tampon_instants,
+            float(modele.omega), float(modele.g), float(modele.R_terre), k_trainee,
+            bool(modele.gravite_variable), bool(modele.centrifuge), bool(modele.trainee),
+            table, float(pas_table), atmosphere is not None,
+        )
+
+        temps_vol = np.where(pos[:, 2] <= 0, 0.0, np.nan)
+        if touche.any():
+            p_sol, fraction = integrateurs.point_impact_plan(
+                f[touche, 0], f[touche, 1], f[touche, 2], f[touche, 3], dt[touche, None]
+            )
+            p_sol[:, 2] = 0.0
+            pos[touche] = p_sol
+            temps[touche] += fraction * dt[touche]
+            temps_vol[touche] = temps[touche]
+
+        if not garder_trajectoires:
+            return pos, temps_vol, None, None
+        # Comme pour NumPy : autant de points que le nombre de pas de la chute la plus longue ;
+        # à partir de son dernier point (l'impact), chaque bille reste figée
+        fin = int(indices_arret.max()) + 1 if n else 1
+        stockage.n = instants.n = fin
+        trajectoires = stockage.donnees.swapaxes(0, 1)
+        t = instants.donnees.T
+        apres = np.arange(fin)[None, :] >= np.where(touche, indices_arret, indices_arret + 1)[:, None]
+        trajectoires[apres] = np.repeat(pos, apres.sum(axis=1), axis=0)
+        t[apres] = np.repeat(temps, apres.sum(axis=1))
+        return pos, temps_vol, t, trajectoires
+
+
+# ==================== VÉRIFICATION ====================
+
+def _cas_verification():
+    """Cas de référence : (nom, fonction(backend) -> tableaux à comparer)."""
+    from utils.atmosphere import PROFIL_VENT_EXEMPLE, TablesAtmosphere
+    from utils.chute3d import ModeleChute3D
+    from utils.physique import METHODES_PAS_FIXE, SimulateurCoriolis
+
+    simulateur = SimulateurCoriolis(g_scale=0.5)
+    departs = np.array([[0.6, 0.0, 0.8], [0.0, 1.0, 0.0], [0.3, -0.4, -0.866]])
+    cas = []
+    for methode in METHODES_PAS_FIXE:
+        def pas_fixe(backend, methode=methode):
+            pos = departs * (simulateur.radius_earth + 0.05)
+            return backend.pas_fixe(simulateur, methode, pos, 0.01, 200, simulateur.radius_earth * 0.95, True,
+                                    StockageTrajectoire(pos.shape))
+        cas.append((f"physique.pas_fixe[{methode}]", pas_fixe))
+
+    rng = np.random.default_rng(0)
+    n = 64
+    latitudes = rng.uniform(-80, 80, n)
+    altitudes = rng.uniform(0, 2000, n)
+    v0 = rng.normal(0, 0.01, (n, 3))
+    vent = np.zeros((n, 3))
+    vent[:, :2] = rng.normal(0, 1, (n, 2))
+    for trainee in (False, True):
+        def chute3d(backend, trainee=trainee):
+            r = ModeleChute3D(trainee=trainee).integrer(latitudes, altitudes, v0=v0, vent=vent, n_pas=50)
+            return r["impact"], r["temps_vol"], r["t"], r["trajectoires"]
+        cas.append((f"chute3d.integrer[trainee={trainee}]", chute3d))
+
+    # Traînée propre à chaque bille (Cd et rayon tirés, comme dans utils.montecarlo)
+    facteurs = ModeleChute3D().facteur_trainee * rng.uniform(0.5, 2.0, n)
+
+    def chute3d_facteurs(backend):
+        r = ModeleChute3D(trainee=True).integrer(latitudes, altitudes, v0=v0, vent=vent, n_pas=50,
+                                                 facteurs_trainee=facteurs)
+        return r["impact"], r["temps_vol"], r["t"], r["trajectoires"]
+    cas.append(("chute3d.integrer[trainee par bille]", chute3d_facteurs))
+
+    atmosphere = TablesAtmosphere.construire(couches_vent=PROFIL_VENT_EXEMPLE)
+
+    def chute3d_atmosphere(backend):
+        modele = ModeleChute3D(trainee=True, atmosphere=atmosphere)
+        r = modele.integrer(latitudes, altitudes * 5, v0=v0, vent=vent, n_pas=50)
+        return r["impact"], r["temps_vol"], r["t"], r["trajectoires"]
+    cas.append(("chute3d.integrer[atmosphere]", chute3d_atmosphere))
+    return cas
+
+
+def ecart_relatif(reference, resultat):
+    """
+    Plus grand écart entre deux suites de tableaux, relatif à la plus grande valeur
+    absolue de chaque tableau de référence (inf si formes ou NaN diffèrent).
+    """
+    ecart = 0.0
+    for a, b in zip(reference, resultat):
+        a, b = np.asarray(a), np.asarray(b)
+        if a.shape != b.shape or not np.array_equal(np.isnan(a), np.isnan(b)):
+            return np.inf
+        echelle = max(np.nanmax(np.abs(a)), 1e-300) if a.size else 1.0
+        ecart = max(ecart, float(np.nanmax(np.abs(a - b), initial=0.0) / echelle))
+    return ecart
+
+
+def verifier_backends(tolerance=TOLERANCE_VERIFICATION):
+    """
+    Compare chaque backend disponible au backend NumPy sur les cas de référence.
+
+    Retourne une liste de dictionnaires {backend, cas, ecart, duree_s, ok} ; l'écart
+    est relatif à la plus grande valeur absolue de la référence. Le backend actif
+    est rétabli à la fin.
+    """
+    global _actif
+    precedent = _actif
+    lignes = []
+    try:
+        for cas, calculer in _cas_verification():
+            reference = None
+            for nom in ["numpy"] + [b for b in backends_disponibles() if b != "numpy"]:
+                backend = choisir_backend(nom)
+                calculer(backend)  # échauffement (compilation JIT)
+                debut = time.perf_counter()
+                resultat = calculer(backend)
+                duree = time.perf_counter() - debut
+                if reference is None:
+                    reference = resultat
+                ecart = ecart_relatif(reference, resultat)
+                lignes.append({"backend": nom, "cas": cas, "ecart": ecart, "duree_s": duree,
+                               "ok": ecart <= tolerance})
+    finally:
+        _actif = precedent
+    return lignes
+
+
+def main():
+    print(f"Backends disponibles : {', '.join(backends_disponibles())}")
+    lignes = verifier_backends()
+    print(f"{'CAS':<34} {'BACKEND':<8} {'ÉCART':>10} {'TEMPS':>10}")
+    for ligne in lignes:
+        alerte = "" if ligne["ok"] else "  <-- DIFFÉRENT"
+        print(f"{ligne['cas']:<34} {ligne['backend']:<8} {ligne['ecart']:>10.1e} "
+              f"{ligne['duree_s'] * 1000:>8.2f} ms{alerte}")
+    return 0 if all(ligne["ok"] for ligne in lignes) else 1
+
+
+if __name__ == "__main__":
+    # Lancé par `python -m utils.noyau`, ce fichier est le module __main__ : les autres
+    # modules importent utils.noyau, distinct, dont le backend actif doit être changé
+    from utils import noyau
+    sys.exit(noyau.main())
@@ -1,5 +1,16 @@
 import numpy as np
 
+from utils import integrateurs, noyau
+from utils.stockage import StockageTrajectoire
+
+# Schémas d'intégration disponibles (rk45 : pas adaptatif, particule unique)
+METHODES_PAS_FIXE = ("euler", "rk4", "boris")
+METHODES = METHODES_PAS_FIXE + ("rk45",)
+
+# Nombre de points par bloc produit par iterer_trajectoire
+TAILLE_BLOC = 64
+
+
 class SimulateurCoriolis:
     def __init__(self, omega_val=5.0, g_scale=0.005, radius_earth=1.0):
         # Vecteur rotation de la Terre (autour de l'axe Z par défaut dans PyVista)
@@ -7,35 +18,191 @@ class SimulateurCoriolis:
         self.g_scale = g_scale # Gravité à l'échelle de notre globe
         self.radius_earth = radius_earth # Rayon de notre modèle de Terre
 
-    def calculer_trajectoire_animee(self, depart, dt=0.005, duree_chute_max=2.0, coriolis=True):
-        """Calcule chaque point de la trajectoire pour une animation."""
-        pos = np.array(depart, dtype=float)
-        v = np.array([0.0, 0.0, 0.0], dtype=float)
-        
-        # Simuler une chute sur une "hauteur" plus significative pour voir l'effet
-        # On fait partir la bille d'un peu au-dessus de la surface
-        pos_initial_offset = pos * (self.radius_earth + 0.05) # Commence un peu au-dessus
-        pos = pos_initial_offset
-
-        trajectoire_points = [pos.copy()]
-        
+    def _gravite(self, pos):
+        """Gravité de norme constante dirigée vers le centre du globe."""
+        norme = np.sqrt(np.einsum("ij,ij->i", pos, pos))
+        return pos * (-self.g_scale / norme)[:, None]
+
+    def _acceleration(self, pos, v, coriolis):
+        accel_totale = self._gravite(pos)
+        if coriolis:
+            # Force de Coriolis : -2 * omega x v
+            accel_totale -= 2 * integrateurs.produit_vectoriel(self.omega, v)
+        return accel_totale
+
+    def pas(self, methode, pos, v, dt, coriolis=True):
+        """
+        Avance d'un pas fixe `dt` avec le schéma demandé (voir METHODES_PAS_FIXE).
+
+        `pos` et `v` sont des tableaux (N, 3) ; retourne la position et la vitesse suivantes.
+        """
+        if methode == "boris":
+            omega = self.omega if coriolis else np.zeros(3)
+            return integrateurs.pas_boris(pos, v, dt, self._gravite, omega)
+
+        acceleration = lambda p, vit: self._acceleration(p, vit, coriolis)
+        if methode == "rk4":
+            return integrateurs.pas_rk4(pos, v, dt, acceleration)
+        return integrateurs.pas_euler(pos, v, dt, acceleration)
+
+    def calculer_trajectoire_animee(self, depart, dt=0.005, duree_chute_max=2.0, coriolis=True,
+                                    methode="euler", tolerance=1e-8, dtype=np.float64, chemin=None):
+        """
+        Calcule chaque point de la trajectoire pour une animation.
+
+        `methode` choisit le schéma : "euler", "rk4", "boris" (pas fixe `dt`) ou
+        "rk45" (pas adaptatif, `dt` sert de pas initial et `tolerance` d'erreur
+        locale visée). Le dernier point est placé exactement sur le sol.
+        Retourne un tableau (T, 3) ; `dtype` et `chemin` : voir calculer_trajectoires_lot.
+        """
+        if methode == "rk45":
+            return self._trajectoire_rk45(depart, dt, duree_chute_max, coriolis, tolerance, dtype, chemin)
+
+        trajectoires, indices_arret = self.calculer_trajectoires_lot(
+            [depart], dt=dt, duree_chute_max=duree_chute_max, coriolis=coriolis, methode=methode,
+            dtype=dtype, chemin=chemin,
+        )
+        return trajectoires[0, :indices_arret[0] + 1]
+
+    def iterer_trajectoire(self, depart, dt=0.005, duree_chute_max=2.0, coriolis=True,
+                           methode="euler", tolerance=1e-8, taille_bloc=TAILLE_BLOC):
+        """
+        Version progressive de calculer_trajectoire_animee : générateur de blocs (k, 3)
+        de points, calculés seulement quand le bloc est demandé.
+
+        Le premier bloc est disponible après `taille_bloc` pas, quelle que soit la
+        durée totale de la chute : une animation peut commencer avant la fin du calcul.
+        Les pas fixes passent par la boucle NumPy (une seule particule).
+        """
+        if methode == "rk45":
+            etats = ((p,) for p in self._iterer_rk45(depart, dt, duree_chute_max, coriolis, tolerance))
+        else:
+            if methode not in METHODES_PAS_FIXE:
+                raise ValueError(f"Méthode à pas fixe inconnue : {methode!r} (choix : {METHODES_PAS_FIXE})")
+            pos = np.asarray(depart, dtype=float).reshape(1, 3) * (self.radius_earth + 0.05)
+            n_pas_max = int(np.ceil(duree_chute_max / dt - 1e-9))
+            etats = ((p[0],) for p, _ in noyau.BackendNumPy().iterer_pas_fixe(
+                self, methode, pos, dt, n_pas_max, self.radius_earth * 0.95, coriolis
+            ))
+        for bloc, in noyau.par_blocs(etats, taille_bloc):
+            yield bloc
+
+    def calculer_trajectoires_lot(self, departs, dt=0.005, duree_chute_max=2.0, coriolis=True,
+                                  methode="euler", dtype=np.float64, chemin=None):
+        """
+        Calcule simultanément les trajectoires de N particules.
+
+        `departs` est un tableau (N, 3) de points de départ sur le globe. Toutes les
+        particules avancent ensemble par opérations vectorisées et chacune s'arrête
+        individuellement en atteignant le sol (0.95·R), le point d'impact étant
+        interpolé exactement sur la surface.
+        Retourne un tableau (N, T, 3) et, pour chaque particule, l'indice de son
+        dernier point calculé. Au-delà de cet indice, la position reste figée.
+        T s'arrête au pas où la dernière particule touche le sol.
+
+        Les points sont écrits dans un StockageTrajectoire : `dtype=np.float32`
+        divise la mémoire par deux, `chemin` place le tableau dans un fichier
+        projeté en mémoire (le calcul reste en float64, seul le stockage change).
+        Le tableau retourné est une vue de ce stockage.
+        """
+        if methode not in METHODES_PAS_FIXE:
+            raise ValueError(f"Méthode à pas fixe inconnue : {methode!r} (choix : {METHODES_PAS_FIXE})")
+
+        departs = np.atleast_2d(np.asarray(departs, dtype=float))
+        n_pas_max = int(np.ceil(duree_chute_max / dt - 1e-9))
+        rayon_sol = self.radius_earth * 0.95
+
+        # On fait partir les billes d'un peu au-dessus de la surface
+        pos = departs * (self.radius_earth + 0.05)
+
+        # Positions de tout le lot, pas après pas, dans un tableau contigu agrandi par doublement
+        stockage = StockageTrajectoire(pos.shape, dtype=dtype, capacite=min(n_pas_max + 1, 1024), chemin=chemin)
+
+        # Boucle sur les pas déléguée au backend actif (NumPy par défaut, voir utils.noyau)
+        return noyau.backend_actif().pas_fixe(self, methode, pos, dt, n_pas_max, rayon_sol, coriolis, stockage)
+
+    def _trajectoire_rk45(self, depart, dt, duree_chute_max, coriolis, tolerance, dtype=np.float64, chemin=None):
+        """Intégration Dormand-Prince à pas adaptatif d'une particule."""
+        trajectoire_points = StockageTrajectoire((3,), dtype=dtype, chemin=chemin)
+        for point in self._iterer_rk45(depart, dt, duree_chute_max, coriolis, tolerance):
+            trajectoire_points.ajouter(point)
+        return trajectoire_points.donnees
+
+    def _iterer_rk45(self, depart, dt, duree_chute_max, coriolis, tolerance):
+        """Générateur des points acceptés (3,) par le pas adaptatif, départ compris."""
+        rayon_sol = self.radius_earth * 0.95
+        pos = np.asarray(depart, dtype=float).reshape(1, 3) * (self.radius_earth + 0.05)
+        v = np.zeros_like(pos)
+        acceleration = lambda p, vit: self._acceleration(p, vit, coriolis)
+
+        yield pos[0]
         temps_ecoule = 0.0
-        
-        while np.linalg.norm(pos) > self.radius_earth * 0.95 and temps_ecoule < duree_chute_max:
-            # Vecteur directionnel vers le centre du globe
-            direction_vers_centre = -pos / np.linalg.norm(pos)
-            accel_gravite = direction_vers_centre * self.g_scale
-            
-            accel_totale = accel_gravite
-            
-            if coriolis:
-                # Force de Coriolis : -2 * omega x v
-                accel_coriolis = -2 * np.cross(self.omega, v)
-                accel_totale += accel_coriolis
-            
-            v += accel_totale * dt
-            pos += v * dt
-            trajectoire_points.append(pos.copy())
-            temps_ecoule += dt
-            
-        return trajectoire_points
\ No newline at end of file
+        h = dt
+
+        while np.dot(pos[0], pos[0]) > rayon_sol ** 2 and temps_ecoule < duree_chute_max:
+            h = min(h, duree_chute_max - temps_ecoule)
+            p_suiv, v_suiv, erreur = integrateurs.pas_dormand_prince(pos, v, h, acceleration)
+
+            # Erreur locale normalisée par une tolérance mixte absolue/relative
+            echelle = tolerance * (1 + np.abs(np.concatenate((pos, v), axis=-1)))
+            err = np.max(np.abs(erreur) / echelle)
+
+            if err <= 1.0:
+                if np.dot(p_suiv[0], p_suiv[0]) <= rayon_sol ** 2:
+                    p_suiv, _ = integrateurs.point_impact(pos, v, p_suiv, v_suiv, h, rayon_sol)
+                pos, v = p_suiv, v_suiv
+                temps_ecoule += h
+                yield pos[0]
+
+            # Contrôle du pas (facteur de sécurité 0.9, variation bornée)
+            facteur = 5.0 if err == 0 else 0.9 * err ** -0.2
+            h *= min(5.0, max(0.2, facteur))
+
+
+def rapport_convergence(simulateur=None, depart=(0.6, 0.0, 0.8), duree_chute_max=2.0):
+    """
+    Compare le nombre de pas et l'erreur sur le point final pour chaque schéma.
+
+    La référence est une intégration RK45 à tolérance très serrée. Retourne une
+    liste de dictionnaires {methode, parametre, n_pas, erreur}.
+    """
+    if simulateur is None:
+        # Gravité renforcée pour que la bille touche le sol pendant la durée simulée
+        simulateur = SimulateurCoriolis(g_scale=0.5)
+
+    reference = simulateur.calculer_trajectoire_animee(
+        depart, dt=1e-3, duree_chute_max=duree_chute_max, methode="rk45", tolerance=1e-13
+    )[-1]
+
+    essais = [(m, dt) for m in ("euler", "boris") for dt in (0.02, 0.01, 0.005, 0.0025, 0.00125)]
+    essais += [("rk4", dt) for dt in (0.1, 0.05, 0.02, 0.01, 0.005)]
+    essais += [("rk45", tol) for tol in (1e-4, 1e-6, 1e-8, 1e-10)]
+
+    lignes = []
+    for methode, parametre in essais:
+        if methode == "rk45":
+            points = simulateur.calculer_trajectoire_animee(
+                depart, dt=0.01, duree_chute_max=duree_chute_max, methode=methode, tolerance=parametre
+            )
+        else:
+            points = simulateur.calculer_trajectoire_animee(
+                depart, dt=parametre, duree_chute_max=duree_chute_max, methode=methode
+            )
+        lignes.append({
+            "methode": methode,
+            "parametre": parametre,
+            "n_pas": len(points) - 1,
+            "erreur": float(np.linalg.norm(points[-1] - reference)),
+        })
+    return lignes
+
+
+def afficher_rapport_convergence(lignes):
+    """Affiche le rapport de convergence sous forme de tableau."""
+    print(f"{'MÉTHODE':<8} {'dt / tol':>10} {'PAS':>8} {'ERREUR':>12}")
+    for ligne in lignes:
+        print(f"{ligne['methode']:<8} {ligne['parametre']:>10.1e} {ligne['n_pas']:>8d} {ligne['erreur']:>12.3e}")
+
+
+if __name__ == "__main__":
+    afficher_rapport_convergence(rapport_convergence())
@@ -0,0 +1,273 @@
+import math
+from collections import deque
+
+import numpy as np
+
+from utils.stockage import StockageTrajectoire
+
+
+def nombre_echantillons(duree, acceleration_max, tolerance, n_min=2, n_max=20000):
+    """
+    Nombre d'échantillons réguliers sur [0, duree] tel que l'interpolation linéaire
+    d'une courbe d'accélération bornée par `acceleration_max` reste à moins de
+    `tolerance` de la courbe (erreur max = a·dt²/8).
+    """
+    if duree <= 0 or acceleration_max <= 0:
+        return n_min
+    dt = math.sqrt(8 * tolerance / acceleration_max)
+    return int(min(max(math.ceil(duree / dt) + 1, n_min), n_max))
+
+
+def instants_images(t_fin, duree, fps):
+    """Instants physiques des images d'une animation de `duree` secondes à `fps` images/s."""
+    n_images = max(2, round(duree * fps) + 1)
+    return np.linspace(0, t_fin, n_images)
+
+
+def reechantillonner(t, colonnes, t_nouveaux):
+    """Interpole linéairement chaque colonne (échantillonnée en `t`) aux instants `t_nouveaux`."""
+    return tuple(np.interp(t_nouveaux, t, colonne) for colonne in colonnes)
+
+
+def indices_decimation(x, courbes, tolerance=0.002, etendues=None):
+    """
+    Indices des points à garder pour tracer les courbes y(x) sans écart visible.
+
+    Algorithme de Ramer-Douglas-Peucker, appliqué dans le repère normalisé des
+    axes (chaque coordonnée ramenée à [0, 1]) : les zones courbes gardent beaucoup
+    de points, les portions presque droites très peu. Un point est gardé s'il
+    est nécessaire pour au moins une des courbes ; les extrémités sont toujours gardées.
+    `etendues` (x puis chaque courbe) remplace l'étendue des données pour la
+    normalisation : un morceau de courbe est alors décimé comme la courbe entière.
+    """
+    x = np.asarray(x, dtype=float)
+    n = x.size
+    if n <= 2:
+        return np.arange(n)
+    if etendues is None:
+        etendues = [None] * (len(courbes) + 1)
+
+    def normaliser(v, etendue):
+        v = np.asarray(v, dtype=float)
+        if etendue is None:
+            etendue = np.ptp(v)
+        return (v - v.min()) / etendue if etendue > 0 else np.zeros_like(v)
+
+    xn = normaliser(x, etendues[0])
+    garder = np.zeros(n, dtype=bool)
+    garder[[0, -1]] = True
+
+    for y, etendue in zip(courbes, etendues[1:]):
+        yn = normaliser(y, etendue)
+        segments = [(0, n - 1)]
+        while segments:
+            debut, fin = segments.pop()
+            if fin - debut < 2:
+                continue
+            # Distance des points intermédiaires à la corde [debut, fin]
+            dx = xn[fin] - xn[debut]
+            dy = yn[fin] - yn[debut]
+            longueur = math.hypot(dx, dy) or 1.0
+            interieur = slice(debut + 1, fin)
+            distances = np.abs(dy * (xn[interieur] - xn[debut]) - dx * (yn[interieur] - yn[debut])) / longueur
+            i = int(np.argmax(distances))
+            if distances[i] > tolerance:
+                milieu = debut + 1 + i
+                garder[milieu] = True
+                segments.append((debut, milieu))
+                segments.append((milieu, fin))
+
+    return np.flatnonzero(garder)
+
+
+class FluxAnimation:
+    """
+    Sépare une trajectoire physique (résolution choisie pour la précision) en deux flux :
+
+    - `images` : les colonnes rééchantillonnées à la cadence d'affichage, régulières
+      en temps physique (une animation de `duree` secondes à `fps` images/s) ;
+    - `trace` : les échantillons physiques gardés par décimation pour les graphiques.
+
+    `plage_trace(premier, dernier)` donne les échantillons du tracé à ajouter quand
+    l'animation passe de l'image `premier` à l'image `dernier`.
+    """
+
+    def __init__(self, t, colonnes, courbes, duree, fps, tolerance=0.002):
+        t = np.asarray(t, dtype=float)
+        self.t_images = instants_images(t[-1], duree, fps)
+        self.images = (self.t_images,) + reechantillonner(t, colonnes, self.t_images)
+
+        garder = indices_decimation(t, courbes, tolerance)
+        self.trace = (t[garder],) + tuple(np.asarray(c)[garder] for c in courbes)
+        # Nombre de points du tracé déjà atteints à chaque image
+        self._bornes = np.searchsorted(self.trace[0], self.t_images, side="right")
+
+    @property
+    def n_images(self):
+        return self.t_images.size
+
+    def plage_trace(self, premier, dernier):
+        debut = self._bornes[premier - 1] if premier > 0 else 0
+        return slice(debut, self._bornes[dernier])
+
+
+class FluxProgressif:
+    """
+    FluxAnimation alimenté au fur et à mesure par des blocs (t, colonne_1, ..., colonne_n),
+    par exemple ceux de SimulateurBille.iterer_donnees : tirés d'un générateur
+    `blocs`, ou, si `blocs` est None, poussés par `recevoir` (calcul dans un autre
+    thread) jusqu'à `terminer`.
+
+    Les images sont espacées de t_estime / (n - 1) en temps physique, n étant le
+    nombre d'images d'une animation de `duree` secondes à `fps` images/s. Un bloc
+    n'est demandé au générateur que lorsqu'une image en a besoin (`preparer`) :
+    l'animation commence après le premier bloc et le calcul avance à son rythme.
+    Si la chute dure plus que `t_estime`, l'animation continue à la même cadence ;
+    la dernière image tombe exactement sur le dernier échantillon.
+
+    Sans générateur, `preparer` n'attend pas : il s'arrête à la dernière image
+    couverte par les blocs déjà reçus.
+
+    `courbes` donne les indices des colonnes tracées (décimées bloc par bloc pour
+    les graphiques). `images` et `trace` ont la forme de ceux de FluxAnimation,
+    limités aux images déjà préparées.
+    """
+
+    def __init__(self, blocs, t_estime, duree, fps, courbes=(), tolerance=0.002):
+        self._blocs = iter(blocs) if blocs is not None else None
+        self._recus = deque()
+        self._fin_recue = False
+        self.courbes = tuple(courbes)
+        self.tolerance = tolerance
+        n_estime = instants_images(t_estime, duree, fps).size
+        self.n_estime = n_estime
+        self.pas_image = t_estime / (n_estime - 1)
+        self.termine = False
+
+        # Échantillons reçus, images préparées, points du tracé et, pour chaque
+        # image, le nombre de points du tracé atteints (créés au premier bloc)
+        self._echantillons = None
+        self._images = None
+        self._trace = None
+        self._bornes = StockageTrajectoire((), dtype=np.int64)
+        self._minimums = None
+        self._maximums = None
+
+    @property
+    def n_images(self):
+        """Nombre d'images : estimé tant que le calcul continue, exact ensuite."""
+        if self.termine:
+            t_fin = self._echantillons.donnees[-1, 0]
+            return max(2, math.ceil(t_fin / self.pas_image - 1e-9) + 1) if self.pas_image > 0 else 2
+        return max(self.n_estime, len(self._bornes) + 1)
+
+    @property
+    def images(self):
+        return tuple(self._images.donnees.T) if self._images is not None else ()
+
+    @property
+    def trace(self):
+        return tuple(self._trace.donnees.T) if self._trace is not None else ()
+
+    def _instant(self, i):
+        instant = i * self.pas_image
+        if self.termine:
+            instant = np.minimum(instant, self._echantillons.donnees[-1, 0])
+        return instant
+
+    def recevoir(self, bloc):
+        """Ajoute un bloc calculé ailleurs (flux sans générateur)."""
+        self._recus.append(bloc)
+
+    def terminer(self):
+        """Signale que tous les blocs ont été reçus (flux sans générateur)."""
+        self._fin_recue = True
+
+    def _suivant(self):
+        """Bloc suivant, ou None s'il n'y en a plus (termine) ou pas encore (en attente)."""
+        if self._blocs is not None:
+            try:
+                return next(self._blocs)
+            except StopIteration:
+                self.termine = True
+                return None
+        if self._recus:
+            return self._recus.popleft()
+        self.termine = self._fin_recue
+        return None
+
+    def _tirer(self):
+        """Intègre le bloc suivant ; False quand il n'y en a plus ou pas encore."""
+        bloc = self._suivant()
+        if bloc is None:
+            return False
+        bloc = np.column_stack(bloc)
+        if self._echantillons is None:
+            largeur = bloc.shape[1]
+            self._echantillons = StockageTrajectoire((largeur,), capacite=max(len(bloc), 256))
+            self._images = StockageTrajectoire((largeur,), capacite=self.n_estime)
+            self._trace = StockageTrajectoire((1 + len(self.courbes),))
+            precedent = None
+        else:
+            precedent = self._echantillons.donnees[-1].copy()
+        self._echantillons.etendre(bloc)
+        self._decimer(bloc, precedent)
+        return True
+
+    def _decimer(self, bloc, precedent):
+        """Ajoute au tracé les points du bloc gardés par décimation."""
+        indices = [0, *self.courbes]
+        colonnes = bloc[:, indices]
+        # Étendues de tout ce qui a été reçu : la tolérance ne dépend pas du découpage en blocs
+        minimums, maximums = colonnes.min(axis=0), colonnes.max(axis=0)
+        if self._minimums is not None:
+            minimums = np.minimum(minimums, self._minimums)
+            maximums = np.maximum(maximums, self._maximums)
+        self._minimums, self._maximums = minimums, maximums
+
+        # Le segment qui relie le bloc au précédent fait partie de la courbe décimée
+        if precedent is not None:
+            colonnes = np.vstack((precedent[indices], colonnes))
+        garder = indices_decimation(colonnes[:, 0], colonnes[:, 1:].T, self.tolerance,
+                                    etendues=maximums - minimums)
+        if precedent is not None:
+            garder = garder[1:]
+        self._trace.etendre(colonnes[garder])
+
+    def preparer(self, dernier):
+        """
+        Prépare les images jusqu'à `dernier` en demandant les blocs nécessaires.
+
+        Retourne l'indice de la dernière image disponible : moins que `dernier` si
+        la chute s'est terminée avant, ou si les blocs reçus ne la couvrent pas
+        encore (-1 avant le premier bloc).
+        """
+        # 1. Blocs demandés jusqu'à couvrir l'instant de l'image (ou la fin du calcul)
+        while not self.termine and (self._echantillons is None
+                                    or self._echantillons.donnees[-1, 0] < self._instant(dernier)):
+            if not self._tirer():
+                break
+        if self._echantillons is None:
+            return -1
+        dernier = min(dernier, self.n_images - 1)
+        if not self.termine:
+            # Calcul en retard : seulement les images couvertes par les échantillons reçus
+            dernier = min(dernier, int(self._echantillons.donnees[-1, 0] / self.pas_image + 1e-9))
+
+        # 2. Images manquantes, interpolées sur les seuls échantillons récents
+        premier = len(self._bornes)
+        if dernier < premier:
+            return dernier
+        instants = self._instant(np.arange(premier, dernier + 1))
+        echantillons = self._echantillons.donnees
+        debut = max(0, np.searchsorted(echantillons[:, 0], instants[0], side="right") - 1)
+        t = echantillons[debut:, 0]
+        images = np.column_stack((instants,) + reechantillonner(t, echantillons[debut:, 1:].T, instants))
+        self._images.etendre(images)
+        self._bornes.etendre(np.searchsorted(self._trace.donnees[:, 0], instants, side="right"))
+        return dernier
+
+    def plage_trace(self, premier, dernier):
+        bornes = self._bornes.donnees
+        debut = bornes[premier - 1] if premier > 0 else 0
+        return slice(debut, bornes[dernier])
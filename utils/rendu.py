@@ -0,0 +1,180 @@
+import numpy as np
+import pyvista as pv
+from vtkmodules.util import numpy_support
+from vtkmodules.vtkCommonDataModel import vtkCellArray
+
+# Type NumPy correspondant à vtkIdType (indices de connectivité)
+TYPE_ID = numpy_support.get_vtk_to_numpy_typemap()[numpy_support.VTK_ID_TYPE]
+
+
+def ids_vtk(tableau):
+    """
+    Enveloppe un tableau d'entiers NumPy (dtype TYPE_ID) en vtkIdTypeArray sans copie :
+    le tableau doit rester référencé tant que VTK l'utilise.
+    """
+    return numpy_support.numpy_to_vtkIdTypeArray(tableau, deep=False)
+
+
+class PolyligneProgressive:
+    """
+    Polyligne préallouée dont seuls les premiers points sont affichés.
+
+    Le maillage PyVista (`self.maillage`) est créé une fois et ajouté une fois au
+    traceur : chaque ajout de points écrit les coordonnées en place et déplace la
+    borne de la cellule visible, sans reconstruire de maillage ni d'acteur.
+    """
+
+    def __init__(self, capacite=256):
+        self.n_visibles = 0
+        self._cellules = vtkCellArray()
+        self.maillage = pv.PolyData()
+        self._allouer(max(2, capacite))
+        self.maillage.SetLines(self._cellules)
+        self._mettre_a_jour_cellule()
+
+    def _allouer(self, capacite):
+        anciens = self.maillage.points[:self.n_visibles] if self.n_visibles else None
+        points = np.zeros((capacite, 3))
+        if anciens is not None:
+            points[:self.n_visibles] = anciens
+            # Les points non encore visibles restent sur le dernier point affiché
+            points[self.n_visibles:] = anciens[-1]
+        self.maillage.points = points
+        self._connectivite = np.arange(capacite, dtype=TYPE_ID)
+
+    @property
+    def capacite(self):
+        return self.maillage.n_points
+
+    @property
+    def points(self):
+        """Vue (sans copie) des points visibles."""
+        return self.maillage.points[:self.n_visibles]
+
+    def reinitialiser(self):
+        self.n_visibles = 0
+        self._mettre_a_jour_cellule()
+
+    def ajouter(self, points):
+        """Ajoute un ou plusieurs points (tableau (3,) ou (k, 3)) à la fin de la ligne."""
+        points = np.atleast_2d(points)
+        fin = self.n_visibles + len(points)
+        if fin > self.capacite:
+            self._allouer(max(fin, 2 * self.capacite))
+        self.maillage.points[self.n_visibles:fin] = points
+        self.maillage.GetPoints().Modified()
+        self.n_visibles = fin
+        self._mettre_a_jour_cellule()
+
+    def _mettre_a_jour_cellule(self):
+        # Une seule cellule polyligne sur les n premiers points (aucune si n < 2)
+        n = self.n_visibles if self.n_visibles >= 2 else 0
+        self._offsets = np.array([0, n] if n else [0], dtype=TYPE_ID)
+        self._ids = self._connectivite[:n]
+        self._cellules.SetData(ids_vtk(self._offsets), ids_vtk(self._ids))
+        self._cellules.Modified()
+        self.maillage.Modified()
+
+
+class SceneBille:
+    """
+    Vue de profil XZ de la chute (sol, billes, flèche de force, trajectoires).
+
+    Partagée par l'interface (sim1) et l'export hors écran (utils.export) :
+    les acteurs sont créés une fois puis déplacés à chaque image.
+    """
+
+    def __init__(self, plotter, capacite=200):
+        self.plotter = plotter
+        plotter.set_background("black")
+
+        # 1. Création du sol (Cube pour l'épaisseur visuelle)
+        sol_visible = pv.Cube(center=(50, 0, -2), x_length=200, y_length=10, z_length=4)
+        plotter.add_mesh(sol_visible, color="seagreen", opacity=0.8, label="Surface (Z=0)")
+
+        # 2. Création des acteurs billes (sphères)
+        self.b_id = plotter.add_mesh(pv.Sphere(radius=1.5), color="orange", label="Chute Verticale")
+        self.b_co = plotter.add_mesh(pv.Sphere(radius=1.5), color="red", label="Chute Coriolis (Amplifiée)")
+
+        # 3. Acteurs persistants : flèche de force (mise à l'échelle à chaque image)
+        # et lignes de trajectoire préallouées, mises à jour en place
+        self.force_arrow = plotter.add_mesh(pv.Arrow(start=(0, 0, 0), direction=(1, 0, 0), scale=1.0), color="orange")
+        self.force_arrow.visibility = False
+        self.trace_id = PolyligneProgressive(capacite)
+        self.trace_co = PolyligneProgressive(capacite)
+        plotter.add_mesh(self.trace_id.maillage, color="yellow", line_width=2)
+        plotter.add_mesh(self.trace_co.maillage, color="red", line_width=2)
+
+        # 4. Légende avec correction du texte noir sur fond blanc
+        legend = plotter.add_legend(bcolor='white', border=True, size=(0.20, 0.25))
+        legend.GetEntryTextProperty().SetColor(0, 0, 0)
+
+        # 5. Configuration de la caméra 2D
+        plotter.view_xz()
+        plotter.enable_parallel_projection()
+
+        # Cadrage par défaut (pour une hauteur de ~84m)
+        plotter.camera.focal_point = (50, 0, 45)
+        plotter.camera.position = (50, -150, 45)
+        plotter.camera.parallel_scale = 60
+
+    def cadrer(self, h, deviation_finale):
+        """Ajuste la vue pour que le sol reste en bas et que toute la chute soit visible."""
+        camera = self.plotter.camera
+        camera.focal_point = (deviation_finale / 2, 0, h / 2)
+        camera.position = (deviation_finale / 2, -h * 2, h / 2)
+        camera.parallel_scale = h * 0.7
+
+    def reinitialiser(self):
+        """Nettoyage des tracés précédents (les buffers sont réutilisés)."""
+        self.trace_id.reinitialiser()
+        self.trace_co.reinitialiser()
+
+    def afficher(self, donnees, premier, dernier):
+        """Place les acteurs à l'image `dernier` et ajoute aux tracés les points depuis `premier`."""
+        t, x_id, z_id, x_co, z_co, force_mag = donnees
+        i = dernier
+        lot = slice(premier, dernier + 1)
+
+        # Mise à jour positions billes
+        self.b_id.position = [x_id[i], 0, z_id[i]]
+        self.b_co.position = [x_co[i], 0, z_co[i]]
+
+        # Mise à jour du vecteur Force (Flèche orange) : même acteur, déplacé et mis à l'échelle
+        self.force_arrow.visibility = bool(force_mag[i] > 0)
+        if force_mag[i] > 0:
+            self.force_arrow.position = [x_co[i], 0, z_co[i]]
+            self.force_arrow.scale = [force_mag[i]] * 3
+
+        # Mise à jour des lignes de trajectoire (points sautés inclus, en place)
+        zeros = np.zeros(dernier + 1 - premier)
+        self.trace_id.ajouter(np.column_stack((x_id[lot], zeros, z_id[lot])))
+        self.trace_co.ajouter(np.column_stack((x_co[lot], zeros, z_co[lot])))
+
+
+class SceneFlammarion:
+    """Décor du Panthéon, bille et trajectoire (mêmes couleurs que sim2), acteurs persistants."""
+
+    def __init__(self, plotter, capacite=200):
+        from utils.sim2 import HAUTEUR, ajouter_decor
+
+        plotter.set_background('black')
+        ajouter_decor(plotter)
+        # Sphère construite une fois à l'origine, placée par la position de l'acteur
+        self.depart = (0, HAUTEUR, 0)
+        self.bille = plotter.add_mesh(pv.Sphere(radius=0.4), color='yellow')
+        self.bille.position = self.depart
+        self.trace = PolyligneProgressive(capacite)
+        plotter.add_mesh(self.trace.maillage, color='orange', line_width=4)
+        plotter.camera_position = [(40, HAUTEUR/2, 40), (0, HAUTEUR/2, 0), (0, 1, 0)]
+
+    def reinitialiser(self):
+        """Bille au sommet, trajectoire vidée (buffers réutilisés)."""
+        self.bille.position = self.depart
+        self.trace.reinitialiser()
+
+    def afficher(self, donnees, premier, dernier):
+        t, x_visu, y, z = donnees
+        self.bille.position = [x_visu[dernier], y[dernier], z[dernier]]
+        lot = slice(premier, dernier + 1)
+        self.trace.ajouter(np.column_stack((x_visu[lot], y[lot], z[lot])))
@@ -0,0 +1,110 @@
+import numpy as np
+import pyvista as pv
+
+# Déplacement maximal (pixels) entre appui et relâchement pour compter un clic
+# (au-delà, c'est une rotation de la caméra)
+TOLERANCE_CLIC = 4
+
+
+def intersection_rayon_sphere(origine, direction, centre=(0.0, 0.0, 0.0), rayon=1.0):
+    """
+    Premier point où le rayon origine + s·direction (s >= 0) touche la sphère, ou None.
+
+    Résolution directe de |o + s·d - c|² = r² : pas de lancer de rayon sur le
+    maillage, le point est exactement sur la sphère idéale.
+    """
+    o = np.asarray(origine, dtype=float) - centre
+    d = np.asarray(direction, dtype=float)
+    d = d / np.linalg.norm(d)
+    b = np.dot(o, d)
+    discriminant = b * b - (np.dot(o, o) - rayon * rayon)
+    if discriminant < 0:
+        return None
+    racine = np.sqrt(discriminant)
+    s = -b - racine
+    if s < 0:
+        s = -b + racine  # origine à l'intérieur de la sphère
+        if s < 0:
+            return None
+    return o + s * d + centre
+
+
+def coordonnees_geographiques(point):
+    """
+    Latitude et longitude (degrés) d'un point du globe.
+
+    Le Nord de la texture est en -Z : texture_map_to_sphere donne v = 0 (bas de
+    l'image, le Sud) au pôle +Z. La longitude est celle de la carte affichée :
+    texture_map_to_sphere (sans couture) étale la carte de -180° à 180° entre +X et -X,
+    symétriquement de part et d'autre du plan XZ.
+    """
+    x, y, z = point
+    rho = np.hypot(x, y)
+    latitude = np.degrees(np.arctan2(-z, rho))
+    s = np.arccos(np.clip(x / rho, -1.0, 1.0)) / np.pi if rho > 0 else 0.0
+    return latitude, 360 * s - 180
+
+
+class SelecteurGlobe:
+    """
+    Sélection analytique sur le globe (sphère de rayon 1 centrée à l'origine).
+
+    À chaque mouvement de souris, le rayon de la caméra passant par le pointeur
+    est intersecté avec la sphère idéale (quelques µs) : `rappel_survol(point)`
+    reçoit le point ou None hors du globe. Un clic gauche sans glisser appelle
+    `rappel_clic(point)` et marque le point choisi.
+    """
+
+    def __init__(self, plotter, rappel_clic, rappel_survol=None, rayon=1.0):
+        self.plotter = plotter
+        self.rappel_clic = rappel_clic
+        self.rappel_survol = rappel_survol
+        self.rayon = rayon
+        self._appui = None
+
+        # Marqueur du point choisi : un seul acteur, déplacé en place
+        self._marqueur = pv.PolyData(np.zeros((1, 3)))
+        self._acteur_marqueur = plotter.add_mesh(self._marqueur, color="red", point_size=10,
+                                                 render_points_as_spheres=True, pickable=False)
+        self._acteur_marqueur.visibility = False
+
+        iren = plotter.iren
+        iren.add_observer("LeftButtonPressEvent", self._sur_appui)
+        iren.add_observer("LeftButtonReleaseEvent", self._sur_relachement)
+        if rappel_survol is not None:
+            iren.add_observer("MouseMoveEvent", self._sur_mouvement)
+
+    def point_ecran(self, x, y):
+        """Point du globe sous la position d'écran (x, y), ou None."""
+        renderer = self.plotter.renderer
+        extremites = []
+        for profondeur in (0.0, 1.0):
+            renderer.SetDisplayPoint(x, y, profondeur)
+            renderer.DisplayToWorld()
+            point = np.array(renderer.GetWorldPoint())
+            extremites.append(point[:3] / point[3])
+        proche, loin = extremites
+        return intersection_rayon_sphere(proche, loin - proche, rayon=self.rayon)
+
+    def _sur_appui(self, obj, event):
+        self._appui = self.plotter.iren.get_event_position()
+
+    def _sur_relachement(self, obj, event):
+        if self._appui is None:
+            return
+        x, y = self.plotter.iren.get_event_position()
+        x0, y0 = self._appui
+        self._appui = None
+        if abs(x - x0) > TOLERANCE_CLIC or abs(y - y0) > TOLERANCE_CLIC:
+            return
+        point = self.point_ecran(x, y)
+        if point is None:
+            return
+        self._marqueur.points[0] = point
+        self._marqueur.GetPoints().Modified()
+        self._acteur_marqueur.visibility = True
+        self.plotter.render()
+        self.rappel_clic(point)
+
+    def _sur_mouvement(self, obj, event):
+        self.rappel_survol(self.point_ecran(*self.plotter.iren.get_event_position()))
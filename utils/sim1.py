@@ -1,76 +1,185 @@
-import sys
-import numpy as np
 import time
-import pyvista as pv
+_DEBUT_IMPORTS = time.perf_counter()
+
+import math
+import sys
 from PyQt5 import QtWidgets
 
+from utils import noyau
 from utils.interface import CoriolisInterface
 from utils.bille import SimulateurBille
 from utils.graphiques import GestionnaireGraphiques
+from utils.rendu import SceneBille
+from utils.animation import PlanificateurAnimation
+from utils.travailleurs import ExecuteurCalculs
+from utils.chrono import ChronoDemarrage
+from utils.instrumentation import creer_instrumentation
+from utils.reechantillonnage import FluxProgressif
+from utils.selection import SelecteurGlobe, coordonnees_geographiques
+
+_DUREE_IMPORTS = time.perf_counter() - _DEBUT_IMPORTS
+
+# Durée réelle d'une animation de chute (s) et cadence visée (images/s)
+DUREE_ANIMATION = 2.0
+FPS_CIBLE = 60
 
 class ControlleurPrincipal:
     def __init__(self):
-        self.app = QtWidgets.QApplication(sys.argv)
-        self.view = CoriolisInterface()
-        # Le globe affiché dans l'interface est pivoté (voir interface._populate_views),
-        # donc on indique au moteur d'inverser le signe de la latitude pour rester cohérent.
+        # Chronométrage du démarrage par phase (voir utils.chrono, CORIOLIS_CHRONO)
+        self.chrono = ChronoDemarrage("sim1", debut=_DEBUT_IMPORTS)
+        self.chrono.ajouter("imports", _DUREE_IMPORTS)
+        with self.chrono.phase("application Qt"):
+            self.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+        self.view = CoriolisInterface(chrono=self.chrono)
+        # La sélection est analytique (utils.selection) : le point reçu est exactement
+        # sur la sphère. Le Nord de la texture est en -Z, d'où l'inversion de latitude.
         self.moteur = SimulateurBille(flip_latitude=True)
         self.graph = GestionnaireGraphiques(self.view.matplot1, self.view.matplot2)
+        self.animation = PlanificateurAnimation(FPS_CIBLE)
+        # Pool de calcul : les blocs de trajectoire et les résultats reviennent par signaux Qt
+        self.calculs = ExecuteurCalculs()
+        self.calculs.partiel.connect(self.recevoir_bloc)
+        self.calculs.termine.connect(self.terminer_calcul)
+        self.calculs.progression.connect(self.afficher_progression)
+        self.calculs.erreur.connect(self.afficher_erreur)
+        # Trajectoire reçue par blocs pendant l'animation (voir gerer_clic)
+        self.flux_animation = None
+        self.id_calcul = None
+        self.n_clics = 0
+        self.entete = ""
+        self.hauteur = None
+        self.details = None
+        self.debut_calcul = None
+        # Reprise du cache disque des trajectoires, ou précalcul des scénarios
+        # courants dans le pool (l'interface s'affiche sans l'attendre)
+        with self.chrono.phase("cache trajectoires"):
+            if self.moteur.charger_cache() == 0:
+                self.calculs.soumettre(self.precalculer)
+        # Mesures par image (CORIOLIS_INSTRUMENTATION) ; objet nul si désactivé
+        self.instr = creer_instrumentation("sim1")
         
-        # Activation de la sélection par clic sur le globe
-        self.view.globe_widget.enable_surface_point_picking(
-            callback=self.gerer_clic, 
-            left_clicking=True, 
-            show_point=True
-        )
+        # Sélection par clic sur le globe et aperçu au survol (intersection rayon-sphère)
+        self.selection = SelecteurGlobe(self.view.globe_widget, self.gerer_clic, self.afficher_apercu)
         
-        self.setup_ball_view()
+        with self.chrono.phase("vue bille"):
+            self.setup_ball_view()
+        self.chrono.publier()
 
     def setup_ball_view(self):
         """Configuration initiale de la vue de simulation (profil XZ)."""
-        bw = self.view.ball_widget
-        bw.set_background("black")
-        
-        # 1. Création du sol (Cube pour l'épaisseur visuelle)
-        sol_visible = pv.Cube(center=(50, 0, -2), x_length=200, y_length=10, z_length=4)
-        bw.add_mesh(sol_visible, color="seagreen", opacity=0.8, label="Surface (Z=0)")
-        
-        # 2. Création des acteurs billes (sphères)
-        self.b_id = bw.add_mesh(pv.Sphere(radius=1.5), color="orange", label="Chute Verticale")
-        self.b_co = bw.add_mesh(pv.Sphere(radius=1.5), color="red", label="Chute Coriolis (Amplifiée)")
-        
-        self.force_arrow = None
-        
-        # 3. Légende avec correction du texte noir sur fond blanc
-        legend = bw.add_legend(bcolor='white', border=True, size=(0.20, 0.25))
-        legend.GetEntryTextProperty().SetColor(0, 0, 0)
-        
-        # 4. Configuration de la caméra 2D
-        bw.view_xz() 
-        bw.enable_parallel_projection()
-        
-        # Cadrage par défaut (pour une hauteur de ~84m)
-        bw.camera.focal_point = (50, 0, 45)
-        bw.camera.position = (50, -150, 45)
-        bw.camera.parallel_scale = 60
+        self.scene = SceneBille(self.view.ball_widget)
+        self.instr.attacher(self.view.ball_widget)
 
     def gerer_clic(self, point):
         # 1. Récupération de l'altitude saisie dans l'interface
         h_utilisateur = self.view.input_alt.value()
-        
-        # 2. Calcul des trajectoires et détails physiques
-        t, x_id, z_id, x_co, z_co, force_mag = self.moteur.calculer_donnees(point, h_utilisateur)
-        details = self.moteur.obtenir_details_numeriques(point, h_utilisateur)
-        
-        # 3. Mise à jour dynamique des axes et de la caméra selon l'altitude
-        self.graph.preparer_axes(t[-1], h_utilisateur, x_co[-1])
-        
-        # Ajustement automatique de la vue pour que le sol reste en bas
-        bw = self.view.ball_widget
-        bw.camera.focal_point = (x_co[-1] / 2, 0, h_utilisateur / 2)
-        bw.camera.position = (x_co[-1] / 2, -h_utilisateur * 2, h_utilisateur / 2)
-        bw.camera.parallel_scale = h_utilisateur * 0.7
-        
+        modele = self.view.choix_modele.currentData()
+        self.debut_calcul = time.perf_counter()
+        latitude, _ = coordonnees_geographiques(point)
+
+        # 2. Calcul dans le pool : les blocs de trajectoire arrivent un par un dans le
+        # flux progressif, que l'animation consomme dès le premier, quelle que soit la
+        # durée de la chute. Un clic plus récent rend ce calcul obsolète (abandonné).
+        # Seules des formules fermées sont évaluées ici, dans le thread de l'interface.
+        t_estime = self.moteur.temps_vol_estime(h_utilisateur, modele)
+        deviation_formule = noyau.deviation_est(math.radians(latitude), noyau.temps_vol(h_utilisateur, self.moteur.g),
+                                                self.moteur.g, self.moteur.omega)
+        flux = FluxProgressif(None, t_estime, DUREE_ANIMATION, FPS_CIBLE, courbes=(3, 4))
+        self.n_clics += 1
+        self.hauteur = h_utilisateur
+        self.details = None
+        self.id_calcul = self.calculs.soumettre(self.calculer_scenario, self.n_clics, point, h_utilisateur, modele,
+                                                t_estime)
+
+        # 3. Axes et caméra d'après la formule (la déviation avec traînée est plus faible)
+        deviation_estimee = deviation_formule * self.moteur.amplification
+        self.graph.preparer_axes(t_estime, h_utilisateur, deviation_estimee)
+        self.scene.cadrer(h_utilisateur, deviation_estimee)
+
+        self.entete = (
+            f"--- CONFIGURATION ---\n"
+            f"LATITUDE  : {latitude:.2f}°\n"
+            f"HAUTEUR   : {h_utilisateur:.1f} m\n\n"
+        )
+        self.view.details.setPlainText(self.entete + "Calcul en cours...")
+
+        # Nettoyage des tracés précédents (les buffers sont réutilisés)
+        self.scene.reinitialiser()
+
+        # 4. Animation synchronisée (PyVista + Matplotlib), cadencée par un timer Qt.
+        # Un nouveau clic relance demarrer(), ce qui annule l'animation en cours.
+        self.flux_animation = flux
+        self.instr.nouvelle_animation()
+        self.animation.demarrer(flux.n_images, DUREE_ANIMATION, self.afficher_images, self.afficher_resultats)
+
+    def afficher_apercu(self, point):
+        """
+        Déviation sous le pointeur, par la formule fermée seule : aucune trajectoire
+        échantillonnée ni entrée de cache pour chaque mouvement de la souris.
+        """
+        if point is None:
+            self.view.apercu.setText("Survol : —")
+            return
+        latitude, longitude = coordonnees_geographiques(point)
+        h_utilisateur = self.view.input_alt.value()
+        t_vol = noyau.temps_vol(h_utilisateur, self.moteur.g)
+        deviation_mm = noyau.deviation_est(math.radians(latitude), t_vol, self.moteur.g, self.moteur.omega) * 1000
+        self.view.apercu.setText(
+            f"Survol : {latitude:+.2f}° {longitude:+.2f}°\n"
+            f"Déviation : {deviation_mm:.2f} mm en {t_vol:.2f} s"
+        )
+
+    def precalculer(self, progression, publier):
+        """Précalcul des scénarios courants, exécuté dans le pool de threads."""
+        self.moteur.precalculer()
+
+    def calculer_scenario(self, numero, point, h_utilisateur, modele, t_estime, progression, publier):
+        """Calcul exécuté dans le pool de threads (aucun accès à l'interface ici)."""
+        debut = time.perf_counter()
+        for bloc in self.moteur.iterer_donnees(point, h_utilisateur, modele):
+            if numero != self.n_clics:
+                # Clic plus récent : la suite de cette trajectoire ne sera pas affichée
+                return None
+            publier(bloc)
+            progression(min(bloc[0][-1] / t_estime, 1.0) if t_estime > 0 else 1.0)
+        # Résultat complet désormais dans le cache : lu sans recalcul
+        details = self.moteur.obtenir_details_numeriques(point, h_utilisateur, modele)
+        return details, time.perf_counter() - debut
+
+    def recevoir_bloc(self, identifiant, bloc):
+        if identifiant == self.id_calcul:
+            self.flux_animation.recevoir(bloc)
+
+    def terminer_calcul(self, identifiant, resultat):
+        """Dernier bloc reçu : l'animation peut aller jusqu'au sol."""
+        if identifiant != self.id_calcul:
+            return
+        self.flux_animation.terminer()
+        self.details, duree_calcul = resultat
+        self.instr.evenement("physique", duree_calcul)
+
+    def afficher_progression(self, identifiant, fraction):
+        if identifiant == self.id_calcul:
+            self.view.details.setPlainText(self.entete + f"Calcul en cours... {fraction * 100:.0f} %")
+
+    def afficher_erreur(self, identifiant, message):
+        if identifiant == self.id_calcul:
+            self.animation.arreter()
+        self.view.details.setPlainText(f"--- ERREUR DE CALCUL ---\n{message}")
+
+    def afficher_resultats(self):
+        """Fin de l'animation : tous les blocs ont été reçus avec les résultats du calcul."""
+        details, h_utilisateur = self.details, self.hauteur
+        x_co = self.flux_animation.images[3]
+
+        # Lignes propres au modèle 3D (nulles pour la formule analytique)
+        lignes_3d = ""
+        if details["ecart_analytique_mm"] or details["deviation_sud_mm"]:
+            lignes_3d = (
+                f"DÉV. SUD  : {details['deviation_sud_mm']:.3f} mm\n"
+                f"ÉCART/FORMULE : {details['ecart_analytique_mm']:+.3f} mm\n"
+            )
+
         # Affichage des résultats dans le panneau de droite
         self.view.details.setPlainText(
             f"--- CONFIGURATION ---\n"
@@ -78,44 +187,51 @@ class ControlleurPrincipal:
             f"HAUTEUR   : {h_utilisateur:.1f} m\n\n"
             f"--- RÉSULTATS RÉELS ---\n"
             f"TEMPS VOL : {details['temps_vol']:.3f} s\n"
-            f"DÉVIATION : {details['deviation_mm']:.2f} mm\n\n"
+            f"DÉVIATION : {details['deviation_mm']:.2f} mm\n"
+            f"{lignes_3d}\n"
             f"--- VISUEL (x{self.moteur.amplification}) ---\n"
             f"DÉV. SIMU : {x_co[-1]:.2f} m"
         )
 
-        # Nettoyage des tracés précédents
-        bw.remove_actor("t_id")
-        bw.remove_actor("t_co")
-
-        # 4. Boucle d'animation synchronisée (PyVista + Matplotlib)
-        for i in range(len(t)):
-            # Mise à jour positions billes
-            self.b_id.position = [x_id[i], 0, z_id[i]]
-            self.b_co.position = [x_co[i], 0, z_co[i]]
-            
-            # Mise à jour du vecteur Force (Flèche orange)
-            if self.force_arrow: 
-                bw.remove_actor(self.force_arrow)
-            arrow = pv.Arrow(start=[x_co[i], 0, z_co[i]], direction=[1, 0, 0], scale=force_mag[i])
-            self.force_arrow = bw.add_mesh(arrow, color="orange")
-            
-            # Mise à jour des lignes de trajectoire
-            if i > 1:
-                pts_id = np.column_stack((x_id[:i], np.zeros(i), z_id[:i]))
-                pts_co = np.column_stack((x_co[:i], np.zeros(i), z_co[:i]))
-                bw.add_mesh(pv.MultipleLines(points=pts_id), color="yellow", name="t_id", line_width=2)
-                bw.add_mesh(pv.MultipleLines(points=pts_co), color="red", name="t_co", line_width=2)
-
-            # Mise à jour point par point des graphiques Matplotlib
-            self.graph.mettre_a_jour_point(t[i], x_co[i], z_co[i])
-
-            bw.render()
-            self.app.processEvents() # Maintient l'interface fluide
-            time.sleep(0.005)
+    def afficher_images(self, premier, dernier):
+        """Affiche l'image `dernier` en ajoutant aux tracés les points depuis `premier`."""
+        flux = self.flux_animation
+
+        # Images construites à partir des blocs déjà reçus (aucun calcul physique ici)
+        with self.instr.phase("reechantillonnage"):
+            disponible = flux.preparer(dernier)
+        # Le nombre d'images n'est exact qu'une fois la chute terminée
+        self.animation.ajuster(flux.n_images)
+        if disponible < dernier and not flux.termine:
+            # Calcul en retard : l'animation attend les blocs suivants
+            self.animation.recaler(disponible)
+        dernier = disponible
+        if dernier < premier:
+            return
+        if premier == 0:
+            self.instr.evenement("premiere_image", time.perf_counter() - self.debut_calcul)
+
+        # Billes, flèche de force et trajectoires (acteurs persistants)
+        with self.instr.phase("scene"):
+            self.scene.afficher(flux.images, premier, dernier)
+
+        # Mise à jour par lot des graphiques Matplotlib (points décimés atteints depuis `premier`)
+        with self.instr.phase("graphiques"):
+            lot = flux.plage_trace(premier, dernier)
+            t, dev, alt = flux.trace
+            self.graph.mettre_a_jour_points(t[lot], dev[lot], alt[lot])
+
+        with self.instr.phase("rendu"):
+            self.view.ball_widget.render()
+        self.instr.image_terminee()
 
     def executer(self):
         self.view.show()
         self.app.exec_()
+        # Calculs en cours terminés avant d'écrire le cache
+        self.calculs.attendre()
+        self.moteur.sauvegarder_cache()
+        self.instr.fermer()
 
 
 def main():
@@ -1,137 +1,279 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import pyvista as pv
 import numpy as np
 
+from utils import noyau
+from utils.instrumentation import creer_instrumentation
+from utils.montecarlo import CampagneMonteCarlo, resume
+from utils.reechantillonnage import FluxProgressif, nombre_echantillons
+from utils.rendu import SceneFlammarion
+
+# Nombre de lancers simulés par la touche [M]
+N_LANCERS_MONTE_CARLO = 100_000
+
+
+# ==================== PARAMÈTRES PHYSIQUES ====================
+G = noyau.G  # Accélération gravitationnelle (m/s²)
+HAUTEUR = 68.0  # Hauteur du Panthéon (m)
+LATITUDE = 48.8462  # Latitude de Paris (degrés)
+OMEGA = noyau.OMEGA_TERRE  # Vitesse de rotation de la Terre (rad/s)
+AMPLIFICATION = 400
+
+# Animation : durée réelle (s) et cadence (images/s), indépendantes de la résolution physique
+DUREE_ANIMATION = 6.0
+FPS_ANIMATION = 30
+
+# Échantillons par bloc de iterer_trajectoire
+TAILLE_BLOC = 64
+
+
+def calculer_trajectoire(n_points=None):
+    """
+    Trajectoire de la bille dans la scène : temps, x (Est, amplifié), y (altitude), z,
+    et déviation théorique en mm. Utilisée par l'animation et par utils.export.
+
+    Par défaut, le nombre d'échantillons garde l'interpolation linéaire à moins
+    d'un millimètre des courbes exactes.
+    """
+    t, x_visu, y, z = (np.concatenate(c) for c in zip(*iterer_trajectoire(n_points, taille_bloc=None)))
+    deviation_theorique = noyau.deviation_est(np.radians(LATITUDE), t[-1], G, OMEGA)
+    return t, x_visu, y, z, deviation_theorique * 1000
 
-def main():
-    """Lance la simulation 2: Expérience de Flammarion"""
-    # ==================== PARAMÈTRES PHYSIQUES ====================
-    g = 9.81  # Accélération gravitationnelle (m/s²)
-    h = 68.0  # Hauteur du Panthéon (m)
-    latitude = 48.8462  # Latitude de Paris (degrés)
-    omega = 7.2921e-5  # Vitesse de rotation de la Terre (rad/s)
-
-    # ==================== CALCUL DE LA DÉVIATION ====================
-    lat_rad = np.radians(latitude)
-    deviation_theorique = (2/3) * omega * np.cos(lat_rad) * np.sqrt(2 * h**3 / g)
-    deviation_mm = deviation_theorique * 1000 
-    amplification = 400
-
-    # ==================== CONFIGURATION PYVISTA ====================
-    plotter = pv.Plotter(title="Expérience de Flammarion - Panthéon 1903")
-    plotter.set_background('black')
 
+def iterer_trajectoire(n_points=None, taille_bloc=TAILLE_BLOC):
+    """
+    Version progressive de calculer_trajectoire : générateur de blocs (t, x, y, z)
+    d'au plus `taille_bloc` échantillons (None : un seul bloc), chacun calculé
+    quand il est demandé.
+    """
+    lat_rad = np.radians(LATITUDE)
+    t_chute = noyau.temps_vol(HAUTEUR, G)
+
+    if n_points is None:
+        n_points = nombre_echantillons(t_chute, G, 1e-3, n_min=50)
+    t_tous = np.linspace(0, t_chute, n_points)
+    for debut in range(0, n_points, taille_bloc or n_points):
+        t = t_tous[debut:debut + (taille_bloc or n_points)]
+        y = noyau.altitude_chute(HAUTEUR, t, G)
+        x = noyau.deviation_est(lat_rad, t, G, OMEGA)
+        yield t, x * AMPLIFICATION, y, np.zeros_like(t)
+
+
+def ajouter_decor(plotter):
+    """Cylindre du Panthéon et sol."""
     # === CYLINDRE ===
-    cylinder = pv.Cylinder(center=(0, h/2, 0), direction=(0, 1, 0), radius=3, height=h)
+    cylinder = pv.Cylinder(center=(0, HAUTEUR/2, 0), direction=(0, 1, 0), radius=3, height=HAUTEUR)
     plotter.add_mesh(cylinder, color='lightgray', opacity=0.2, style='wireframe')
 
     # === SOL ===
     floor = pv.Plane(center=(0, 0, 0), direction=(0, 1, 0), i_size=20, j_size=20)
     plotter.add_mesh(floor, color='green', opacity=0.3)
 
-    # === TRAJECTOIRE ===
-    t_chute = np.sqrt(2 * h / g)
-    n_points = 200
-    t = np.linspace(0, t_chute, n_points)
-    y = h - 0.5 * g * t**2
-    x = (1/3) * omega * np.cos(lat_rad) * g * t**3
-    x_visu = x * amplification
-    z = np.zeros_like(t)
-
-    # === TEXTE DES DONNÉES ===
-    texte_donnees = f"""EXPÉRIENCE DE FLAMMARION - PANTHÉON (1903)
+
+class SimulationFlammarion:
+    """
+    Expérience de Flammarion dans une fenêtre PyVista.
+
+    La scène (utils.rendu.SceneFlammarion) est construite une fois : la bille est
+    déplacée par sa position d'acteur et la trajectoire est une polyligne
+    préallouée dont la partie visible s'allonge. [R] rejoue l'animation en
+    réutilisant les mêmes acteurs et buffers.
+    """
+
+    def __init__(self, plotter=None):
+        # 1. Images de l'animation, régulières en temps physique. La trajectoire est
+        # calculée par blocs au fil de l'animation (les rejeux [R] réutilisent les images)
+        t_chute = noyau.temps_vol(HAUTEUR, G)
+        self.deviation_mm = noyau.deviation_est(np.radians(LATITUDE), t_chute, G, OMEGA) * 1000
+        self.flux = FluxProgressif(iterer_trajectoire(), t_chute, DUREE_ANIMATION, FPS_ANIMATION)
+
+        # 2. Scène persistante (décor, bille, trajectoire préallouée pour toutes les images)
+        self.plotter = plotter or pv.Plotter(title="Expérience de Flammarion - Panthéon 1903")
+        self.scene = SceneFlammarion(self.plotter, capacite=self.flux.n_images)
+        self.plotter.add_text(self.texte_donnees(), position='upper_left', font_size=10,
+                              color='cyan', font='courier')
+
+        # 3. État de l'animation. Le timer tourne tant que l'animation ou une
+        # campagne Monte Carlo (calculée dans un pool de processus) est en cours
+        self.image_suivante = 0
+        self.timer_id = None
+        self.anime = False
+        self.debut_animation = None  # fixé au premier appel du timer
+        self.pool = None
+        self.campagne = None
+
+        # Mesures par image (CORIOLIS_INSTRUMENTATION) ; objet nul si désactivé
+        self.instr = creer_instrumentation("sim2")
+        self.instr.attacher(self.plotter)
+
+        # Un seul observateur du timer pour toute la durée de vie de la fenêtre
+        self.plotter.iren.add_observer('TimerEvent', self._sur_timer)
+        self.plotter.iren.add_observer('KeyPressEvent', self.on_key_press)
+
+    def texte_donnees(self):
+        return f"""EXPÉRIENCE DE FLAMMARION - PANTHÉON (1903)
 CALCUL THÉORIQUE :
-  Déviation : {deviation_mm:.2f} mm
+  Déviation : {self.deviation_mm:.2f} mm
   Incertitude : ± 0.2 mm
 MESURE HISTORIQUE :
   Déviation (Moyenne 169 lancers) : 8.22 mm
   Incertitude : ± 2.5 mm
 PARAMÈTRES :
-  Hauteur : {h} m
-  Latitude : {latitude}°N
-(Trajectoire amplifiée ×{amplification} pour visibilité)
+  Hauteur : {HAUTEUR} m
+  Latitude : {LATITUDE}°N
+(Trajectoire amplifiée ×{AMPLIFICATION} pour visibilité)
 
 COMMANDES :
   [R] Recommencer la simulation
-  [Q] Quitter"""
-    plotter.add_text(texte_donnees, position='upper_left', font_size=10, color='cyan', font='courier')
-
-    # === VARIABLES D'ÉTAT ===
-    bille = pv.Sphere(radius=0.4, center=(0, h, 0))
-    bille_actor = plotter.add_mesh(bille, color='yellow')
-    trajectoire_points = []
-    frame_counter = [0]
-    timer_id = [None]
-    line_actor = [None]
-
-    # === ANIMATION ===
-    def update_animation(step):
-        f = frame_counter[0]
-        
-        if f < n_points:
-            # Mise à jour position bille
-            current_pos = [x_visu[f], y[f], z[f]]
-            bille.points[:] = pv.Sphere(radius=0.4, center=current_pos).points
-            
-            # Ajout point à la trajectoire
-            trajectoire_points.append(current_pos)
-            
-            # Dessin de la ligne
-            if len(trajectoire_points) > 1:
-                points = np.array(trajectoire_points)
-                line = pv.MultipleLines(points=points)
-                
-                # Suppression ancienne ligne
-                if line_actor[0] is not None:
-                    plotter.remove_actor(line_actor[0])
-                
-                line_actor[0] = plotter.add_mesh(line, color='orange', line_width=4)
-            
-            frame_counter[0] += 1
+  [M] Monte Carlo ({N_LANCERS_MONTE_CARLO:,} lancers)
+  [Q] Quitter""".replace(",", " ")
+
+    # ==================== ANIMATION ====================
+
+    def demarrer(self):
+        """(Re)lance l'animation depuis le sommet, avec les mêmes acteurs."""
+        # 1. Remise à zéro de la bille et de la trajectoire (buffers réutilisés)
+        self.scene.reinitialiser()
+        self.image_suivante = 0
+
+        # 2. Animation relancée (terminée par update_animation à la dernière image)
+        self.instr.nouvelle_animation()
+        self.debut_animation = None
+        self.anime = True
+        self.lancer_timer()
+
+    def lancer_timer(self):
+        if self.timer_id is None:
+            self.timer_id = self.plotter.iren.create_timer(1000 // FPS_ANIMATION)
+
+    def arreter(self):
+        if self.timer_id is not None:
+            self.plotter.iren.destroy_timer(self.timer_id)
+            self.timer_id = None
+
+    def _sur_timer(self, obj, event):
+        if self.timer_id is None:
+            return
+        if self.anime:
+            self.update_animation()
+        if self.campagne is not None:
+            self.suivre_monte_carlo()
+        if not self.anime and self.campagne is None:
+            self.arreter()
+
+    def update_animation(self):
+        f = self.image_suivante
+        n_images = self.flux.n_images
+        if self.debut_animation is None:
+            self.debut_animation = time.perf_counter()
+        # Image correspondant au temps écoulé : les images en retard sont sautées
+        ecoule = time.perf_counter() - self.debut_animation
+        cible = min(int(ecoule / DUREE_ANIMATION * (n_images - 1)), n_images - 1)
+
+        if f < n_images and cible >= f:
+            # Blocs de trajectoire calculés seulement quand ces images en ont besoin
+            with self.instr.phase("physique"):
+                cible = self.flux.preparer(cible)
+            # Bille déplacée et trajectoire prolongée (points sautés inclus), en place
+            with self.instr.phase("scene"):
+                self.scene.afficher(self.flux.images, f, cible)
+            self.image_suivante = cible + 1
+        elif f >= n_images:
+            # Animation terminée (le timer s'arrête s'il ne suit plus de campagne)
+            self.anime = False
+
+        with self.instr.phase("rendu"):
+            self.plotter.render()
+        self.instr.image_terminee()
+
+    # ==================== MONTE CARLO ====================
+
+    def monte_carlo(self):
+        """
+        Lance la campagne de lancers dans un pool de processus, sans l'attendre :
+        le timer suit son avancement et le nuage d'impacts est ajouté à la fin.
+        """
+        if self.campagne is not None:
+            return
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+        self.campagne = CampagneMonteCarlo(N_LANCERS_MONTE_CARLO)
+        self.campagne.soumettre(self.pool)
+        self.afficher_progression_monte_carlo(0.0)
+        self.lancer_timer()
+
+    def afficher_progression_monte_carlo(self, fraction):
+        self.plotter.add_text(f"MONTE CARLO : {fraction * 100:.0f} %", position='upper_right',
+                              font_size=10, color='red', font='courier', name='monte_carlo_texte')
+
+    def afficher_erreur_monte_carlo(self, message):
+        # Dernière ligne de la trace : type et message de l'exception
+        derniere_ligne = message.strip().splitlines()[-1]
+        self.plotter.add_text(f"MONTE CARLO : ÉCHEC\n{derniere_ligne}\n[M] pour relancer", position='upper_right',
+                              font_size=10, color='red', font='courier', name='monte_carlo_texte')
+
+    def suivre_monte_carlo(self):
+        """Appelé par le timer : cumule les lots terminés, puis affiche le résultat."""
+        campagne = self.campagne
+        fraction_precedente = campagne.fraction
+        fraction = campagne.recuperer()
+        if campagne.erreur is not None:
+            # Lot en échec : campagne abandonnée, pool fermé (recréé au prochain [M])
+            self.campagne = None
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+            self.afficher_erreur_monte_carlo(campagne.erreur)
+        elif campagne.termine:
+            self.campagne = None
+            self.afficher_monte_carlo(campagne.resultat())
+        elif fraction != fraction_precedente:
+            self.afficher_progression_monte_carlo(fraction)
         else:
-            # Animation terminée, on arrête le timer
-            if timer_id[0] is not None:
-                plotter.remove_timer_event(timer_id[0])
-                timer_id[0] = None
-        
-        plotter.render()
-
-    def reset_simulation():
-        """Réinitialise et relance la simulation"""
-        # 1. Arrêter le timer actuel s'il existe
-        if timer_id[0] is not None:
-            plotter.remove_timer_event(timer_id[0])
-            timer_id[0] = None
-        
-        # 2. Nettoyage des données
-        trajectoire_points.clear()
-        frame_counter[0] = 0
-        
-        # 3. Suppression de la ligne
-        if line_actor[0] is not None:
-            plotter.remove_actor(line_actor[0])
-            line_actor[0] = None
-        
-        # 4. Remise à zéro de la bille
-        bille.points[:] = pv.Sphere(radius=0.4, center=(0, h, 0)).points
-        
-        # 5. Relance du timer
-        timer_id[0] = plotter.add_timer_event(max_steps=n_points, duration=30, callback=update_animation)
-        
-        plotter.render()
-
-    def on_key_press(obj, event):
+            return
+        if not self.anime:
+            self.plotter.render()
+
+    def afficher_monte_carlo(self, resultat):
+        """Impacts en un seul nuage de points, et synthèse comparée à la mesure historique"""
+        plotter = self.plotter
+
+        # Impacts en mm -> coordonnées de la scène (x = Est, z = Sud), amplifiés comme la trajectoire
+        impacts = resultat["impacts"] / 1000 * AMPLIFICATION
+        points = np.column_stack((impacts[:, 0], np.full(len(impacts), 0.05), impacts[:, 1]))
+        nuage = pv.PolyData(points)
+        nuage["deviation_est_mm"] = resultat["impacts"][:, 0]
+        plotter.add_mesh(nuage, scalars="deviation_est_mm", cmap="coolwarm", point_size=3,
+                         render_points_as_spheres=True, show_scalar_bar=False, name='monte_carlo')
+
+        plotter.add_text(resume(resultat), position='upper_right', font_size=10,
+                         color='red', font='courier', name='monte_carlo_texte')
+
+    def on_key_press(self, obj, event):
         key = obj.GetKeySym()
         if key == 'r' or key == 'R':
-            reset_simulation()
+            self.demarrer()
+            self.plotter.render()
+        elif key == 'm' or key == 'M':
+            self.monte_carlo()
+
+    def executer(self):
+        self.demarrer()
+        self.plotter.show()
+        # Fenêtre fermée : la campagne en cours est abandonnée
+        if self.campagne is not None:
+            self.campagne.annuler()
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+        self.instr.fermer()
 
-    # Configuration
-    plotter.camera_position = [(40, h/2, 40), (0, h/2, 0), (0, 1, 0)]
-    plotter.iren.add_observer('KeyPressEvent', on_key_press)
 
-    # Lancement initial
-    timer_id[0] = plotter.add_timer_event(max_steps=n_points, duration=30, callback=update_animation)
-    plotter.show()
+def main():
+    """Lance la simulation 2: Expérience de Flammarion"""
+    SimulationFlammarion().executer()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
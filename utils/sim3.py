@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Pendule de Foucault à une latitude choisie.
+
+Exemples :
+    python -m utils.sim3
+    python -m utils.sim3 --latitude -33.9 --longueur 28 --vitesse 600
+
+Le pendule (utils.pendule) avance par blocs de pas calculés seulement quand
+l'animation les demande. À chaque image, seul le dernier état est affiché :
+en accéléré, les milliers de pas intermédiaires sont calculés sans être
+rendus, et leurs points de rebroussement prolongent l'étoile de la précession.
+"""
+
+import argparse
+import math
+import sys
+import time
+
+import numpy as np
+import pyvista as pv
+
+from utils.instrumentation import creer_instrumentation
+from utils.pendule import SCHEMAS, PenduleFoucault, points_de_rebroussement
+from utils.rendu import PolyligneProgressive
+
+# Paramètres par défaut : pendule du Panthéon (1851)
+LATITUDE = 48.8462  # degrés
+LONGUEUR = 67.0  # m
+AMPLITUDE = 3.0  # m
+
+# Cadence d'affichage (images/s) et temps simulé par seconde réelle
+FPS_ANIMATION = 30
+VITESSE_DEFAUT = 60.0
+VITESSE_MIN = 1.0
+VITESSE_MAX = 65536.0
+
+# Saut de la touche [→] (s de temps simulé)
+AVANCE_RAPIDE = 3600.0
+
+
+def formater_duree(secondes):
+    heures, reste = divmod(int(secondes), 3600)
+    minutes, secondes = divmod(reste, 60)
+    return f"{heures:d} h {minutes:02d} min {secondes:02d} s"
+
+
+class SimulationFoucault:
+    """
+    Pendule de Foucault dans une fenêtre PyVista (vue du dessus, x = Est, y = Nord).
+
+    Acteurs persistants : la bille et le fil sont déplacés à chaque image, les
+    rebroussements (extrémités des oscillations) sont ajoutés à une polyligne
+    préallouée dont la partie visible s'allonge : elle dessine l'étoile dont les
+    branches tournent avec le plan d'oscillation.
+    """
+
+    def __init__(self, latitude=LATITUDE, longueur=LONGUEUR, amplitude=AMPLITUDE,
+                 schema="exact", vitesse=VITESSE_DEFAUT, plotter=None):
+        self.pendule = PenduleFoucault(latitude, longueur, amplitude, schema=schema)
+        self.vitesse = vitesse
+
+        # 1. Scène : sol, rose des vents, fil et bille
+        self.plotter = plotter or pv.Plotter(title="Pendule de Foucault")
+        self.plotter.set_background("black")
+        rayon = 1.3 * amplitude
+        self.plotter.add_mesh(pv.Disc(inner=0, outer=rayon, c_res=72), color="seagreen", opacity=0.3)
+        self.plotter.add_mesh(pv.Line((-rayon, 0, 0), (rayon, 0, 0)), color="gray")
+        self.plotter.add_mesh(pv.Line((0, -rayon, 0), (0, rayon, 0)), color="gray")
+        self.plotter.add_point_labels([(rayon, 0, 0), (0, rayon, 0)], ["E", "N"], font_size=14,
+                                      text_color="white", shape_opacity=0.0, always_visible=True)
+
+        self.fil = pv.Line((0, 0, longueur), (amplitude, 0, 0))
+        self.plotter.add_mesh(self.fil, color="white", line_width=1)
+        self.bille = self.plotter.add_mesh(pv.Sphere(radius=0.04 * amplitude), color="gold")
+        self.etoile = PolyligneProgressive(1024)
+        self.plotter.add_mesh(self.etoile.maillage, color="orange", line_width=1)
+
+        self.texte = self.plotter.add_text("", position="upper_left", font_size=9, color="cyan", font="courier")
+        self.plotter.camera_position = [(0, -2.5 * rayon, 2.5 * rayon), (0, 0, 0), (0, 0, 1)]
+
+        # 2. État de l'animation
+        self.timer_id = None
+        self.instr = creer_instrumentation("sim3")
+        self.instr.attacher(self.plotter)
+        self.reinitialiser()
+
+        # Un seul observateur du timer pour toute la durée de vie de la fenêtre
+        self.plotter.iren.add_observer("TimerEvent", self._sur_timer)
+        self.plotter.iren.add_observer("KeyPressEvent", self.on_key_press)
+
+    def reinitialiser(self):
+        """Pendule lâché au repos, étoile vidée (buffers réutilisés)."""
+        self.t = 0.0
+        self.etat = self.pendule.etat_initial
+        self.blocs = self.pendule.iterer()
+        self.bloc = None  # (instants, états, indice du prochain état à consommer)
+        self.produit_precedent = None
+        self.en_pause = False
+        self.dernier_tic = None
+        self.etoile.reinitialiser()
+        self.etoile.ajouter((self.etat[0], self.etat[1], 0.0))
+        self.afficher()
+
+    # ==================== PHYSIQUE ====================
+
+    def avancer_jusqu_a(self, t_cible):
+        """
+        Consomme les états jusqu'à `t_cible` (blocs demandés au pendule au besoin)
+        et ajoute leurs rebroussements à l'étoile. Aucun état intermédiaire n'est affiché.
+        """
+        nouveaux = []
+        while self.t < t_cible:
+            if self.bloc is None:
+                instants, etats = next(self.blocs)
+                indices, self.produit_precedent = points_de_rebroussement(etats, self.produit_precedent)
+                self.bloc = (instants, etats, indices, 0)
+            instants, etats, indices, debut = self.bloc
+            fin = min(len(instants), np.searchsorted(instants, t_cible, side="right"))
+            if fin > debut:
+                rebroussements = indices[(indices >= debut) & (indices < fin)]
+                nouveaux.append(etats[rebroussements, :2])
+                self.t, self.etat = instants[fin - 1], etats[fin - 1]
+            self.bloc = None if fin >= len(instants) else (instants, etats, indices, fin)
+            if fin < len(instants):
+                break
+
+        # Une seule mise à jour de la polyligne, même après des centaines de blocs
+        if nouveaux:
+            xy = np.concatenate(nouveaux)
+            if len(xy):
+                self.etoile.ajouter(np.column_stack((xy, np.zeros(len(xy)))))
+
+    # ==================== AFFICHAGE ====================
+
+    def angle_plan(self):
+        """Azimut (degrés, depuis l'Est) du dernier rebroussement, ramené sur [0, 180[."""
+        x, y = self.etoile.points[-1, :2]
+        return math.degrees(math.atan2(y, x)) % 180
+
+    def texte_donnees(self):
+        p = self.pendule
+        rotation_theorique = (-math.degrees(p.omega_z * self.t)) % 180
+        sens = "horaire" if p.omega_z > 0 else "antihoraire" if p.omega_z < 0 else "aucun"
+        return f"""PENDULE DE FOUCAULT - LATITUDE {p.latitude_deg:+.2f}°
+  Longueur : {p.longueur:.1f} m  Période : {p.periode:.2f} s
+  Précession : {p.periode_precession / 3600:.2f} h par tour ({sens})
+  Schéma : {p.schema}  pas : {p.dt * 1000:.0f} ms
+TEMPS SIMULÉ : {formater_duree(self.t)}  (×{self.vitesse:g})
+  Pas calculés : {self.t / p.dt:,.0f}
+  Plan d'oscillation : {self.angle_plan():6.2f}°
+  Rotation attendue (Ωz·t) : {rotation_theorique:6.2f}°
+
+COMMANDES :
+  [+] / [-]  Accélérer / ralentir
+  [→]        Avancer d'une heure (sans rendu intermédiaire)
+  [Espace]   Pause
+  [R]        Recommencer
+  [Q]        Quitter""".replace(",", " ")
+
+    def afficher(self):
+        """Bille et fil à l'état courant (la bille remonte légèrement en s'écartant)."""
+        x, y = self.etat[0], self.etat[1]
+        longueur = self.pendule.longueur
+        z = longueur - math.sqrt(max(longueur**2 - x * x - y * y, 0.0))
+        self.bille.position = (x, y, z)
+        self.fil.points[1] = (x, y, z)
+        self.fil.GetPoints().Modified()
+        self.texte.SetText(2, self.texte_donnees())
+
+    # ==================== ANIMATION ====================
+
+    def demarrer(self):
+        self.arreter()
+        self.instr.nouvelle_animation()
+        self.dernier_tic = None
+        self.timer_id = self.plotter.iren.create_timer(1000 // FPS_ANIMATION)
+
+    def arreter(self):
+        if self.timer_id is not None:
+            self.plotter.iren.destroy_timer(self.timer_id)
+            self.timer_id = None
+
+    def _sur_timer(self, obj, event):
+        if self.timer_id is not None:
+            self.update_animation()
+
+    def update_animation(self):
+        # Temps simulé proportionnel au temps réel écoulé (borné après une pause du rendu)
+        maintenant = time.perf_counter()
+        ecoule = 0.0 if self.dernier_tic is None else min(maintenant - self.dernier_tic, 0.25)
+        self.dernier_tic = maintenant
+        if not self.en_pause:
+            with self.instr.phase("physique"):
+                self.avancer_jusqu_a(self.t + self.vitesse * ecoule)
+        with self.instr.phase("scene"):
+            self.afficher()
+        with self.instr.phase("rendu"):
+            self.plotter.render()
+        self.instr.image_terminee()
+
+    def on_key_press(self, obj, event):
+        key = obj.GetKeySym()
+        if key in ("plus", "KP_Add"):
+            self.vitesse = min(self.vitesse * 2, VITESSE_MAX)
+        elif key in ("minus", "KP_Subtract"):
+            self.vitesse = max(self.vitesse / 2, VITESSE_MIN)
+        elif key == "Right":
+            with self.instr.phase("physique"):
+                self.avancer_jusqu_a(self.t + AVANCE_RAPIDE)
+        elif key == "space":
+            self.en_pause = not self.en_pause
+        elif key == "r" or key == "R":
+            self.reinitialiser()
+        else:
+            return
+        self.afficher()
+        self.plotter.render()
+
+    def executer(self):
+        self.demarrer()
+        self.plotter.show()
+        self.instr.fermer()
+
+
+def main(argv=None):
+    """Lance la simulation 3 : pendule de Foucault"""
+    parser = argparse.ArgumentParser(description="Pendule de Foucault à une latitude choisie.")
+    parser.add_argument("--latitude", type=float, default=LATITUDE, help="latitude en degrés (défaut : Paris)")
+    parser.add_argument("--longueur", type=float, default=LONGUEUR, help="longueur du fil (m)")
+    parser.add_argument("--amplitude", type=float, default=AMPLITUDE, help="écart initial vers l'Est (m)")
+    parser.add_argument("--schema", choices=SCHEMAS, default="exact")
+    parser.add_argument("--vitesse", type=float, default=VITESSE_DEFAUT,
+                        help="secondes simulées par seconde réelle")
+    args = parser.parse_args(argv)
+    if not -90 <= args.latitude <= 90:
+        parser.error("la latitude doit être comprise entre -90 et 90°")
+    if args.longueur <= 0 or not 0 < args.amplitude < args.longueur:
+        parser.error("il faut 0 < amplitude < longueur")
+
+    SimulationFoucault(args.latitude, args.longueur, args.amplitude, args.schema, args.vitesse).executer()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+import os
+
+import numpy as np
+
+
+class StockageTrajectoire:
+    """
+    Points d'une trajectoire ajoutés pas à pas dans un tableau contigu préalloué.
+
+    Chaque point a la forme `forme_point` ((3,) pour une particule, (N, 3) pour un
+    lot de N particules avancées ensemble). La capacité double quand elle est
+    atteinte : pas d'objet NumPy par pas ni de liste à empiler à la fin.
+    `dtype=np.float32` divise la mémoire par deux. Avec `chemin`, le tableau est
+    un fichier projeté en mémoire (np.memmap) : seules les pages utilisées sont
+    en RAM, ce qui permet des intégrations plus grandes que la mémoire.
+
+    `donnees` est une vue (sans copie) des points stockés, valable jusqu'au
+    prochain agrandissement.
+    """
+
+    def __init__(self, forme_point=(3,), dtype=np.float64, capacite=256, chemin=None):
+        self.forme_point = tuple(forme_point)
+        self.dtype = np.dtype(dtype)
+        self.chemin = None if chemin is None else os.fspath(chemin)
+        self.n = 0
+        self._tampon = None
+        self._allouer(max(1, capacite))
+
+    def _octets(self, capacite):
+        return capacite * int(np.prod(self.forme_point, dtype=np.int64)) * self.dtype.itemsize
+
+    def _allouer(self, capacite):
+        forme = (capacite,) + self.forme_point
+        if self.chemin is None:
+            tampon = np.empty(forme, dtype=self.dtype)
+            if self._tampon is not None:
+                tampon[:self.n] = self._tampon[:self.n]
+            self._tampon = tampon
+            return
+
+        # Fichier brut agrandi sur place : les points déjà écrits ne sont pas recopiés
+        if self._tampon is not None:
+            self._tampon.flush()
+        self._tampon = None
+        with open(self.chemin, "r+b" if os.path.exists(self.chemin) and self.n else "w+b") as f:
+            f.truncate(self._octets(capacite))
+        self._tampon = np.memmap(self.chemin, dtype=self.dtype, mode="r+", shape=forme)
+
+    @property
+    def capacite(self):
+        return self._tampon.shape[0]
+
+    @property
+    def tampon(self):
+        """Tableau complet (capacité) ; pour écrire directement, puis fixer `n`."""
+        return self._tampon
+
+    @property
+    def donnees(self):
+        """Vue (sans copie) des n points stockés."""
+        return self._tampon[:self.n]
+
+    def __len__(self):
+        return self.n
+
+    def __array__(self, dtype=None, copy=None):
+        return self.donnees if dtype is None else self.donnees.astype(dtype)
+
+    @property
+    def nbytes(self):
+        return self._octets(self.n)
+
+    def reserver(self, capacite):
+        """Garantit la place pour `capacite` points (agrandissement par doublement)."""
+        if capacite > self.capacite:
+            self._allouer(max(capacite, 2 * self.capacite))
+
+    def ajouter(self, point):
+        self.reserver(self.n + 1)
+        self._tampon[self.n] = point
+        self.n += 1
+
+    def etendre(self, points):
+        points = np.asarray(points)
+        fin = self.n + len(points)
+        self.reserver(fin)
+        self._tampon[self.n:fin] = points
+        self.n = fin
+
+    def vider(self):
+        self.n = 0
+
+    def fermer(self):
+        """Fichier : écrit les données et le ramène aux seuls n points stockés."""
+        if self.chemin is None or self._tampon is None:
+            return
+        self._tampon.flush()
+        self._tampon = None
+        with open(self.chemin, "r+b") as f:
+            f.truncate(self._octets(self.n))
+
+    @staticmethod
+    def relire(chemin, forme_point=(3,), dtype=np.float64):
+        """Projection en lecture seule d'un fichier écrit par un stockage fermé."""
+        return np.memmap(chemin, dtype=dtype, mode="r").reshape((-1,) + tuple(forme_point))
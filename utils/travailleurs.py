@@ -0,0 +1,104 @@
+import itertools
+import traceback
+from PyQt5 import QtCore
+
+
+class _SignauxTache(QtCore.QObject):
+    # Créé dans le thread principal : les émissions depuis le thread de calcul
+    # sont donc livrées dans la boucle d'événements Qt (connexion en file)
+    termine = QtCore.pyqtSignal(int, object)
+    erreur = QtCore.pyqtSignal(int, str)
+    progression = QtCore.pyqtSignal(int, float)
+    partiel = QtCore.pyqtSignal(int, object)
+
+
+class _Tache(QtCore.QRunnable):
+    def __init__(self, identifiant, fonction, args, kwargs, signaux):
+        super().__init__()
+        self.identifiant = identifiant
+        self.fonction = fonction
+        self.args = args
+        self.kwargs = kwargs
+        self.signaux = signaux
+
+    def run(self):
+        def progression(fraction):
+            self.signaux.progression.emit(self.identifiant, float(fraction))
+
+        def publier(objet):
+            self.signaux.partiel.emit(self.identifiant, objet)
+
+        try:
+            resultat = self.fonction(*self.args, progression=progression, publier=publier, **self.kwargs)
+        except Exception:
+            self.signaux.erreur.emit(self.identifiant, traceback.format_exc())
+        else:
+            self.signaux.termine.emit(self.identifiant, resultat)
+
+
+class ExecuteurCalculs(QtCore.QObject):
+    """
+    Exécute les calculs physiques dans un pool de threads (QThreadPool).
+
+    Chaque demande reçoit un identifiant croissant. Seuls les signaux de la
+    demande la plus récente sont relayés : le résultat d'un ancien clic,
+    dépassé par un nouveau, est ignoré.
+    La fonction soumise reçoit les arguments nommés `progression(fraction)` et
+    `publier(objet)` : chaque objet publié (un bloc de trajectoire par exemple)
+    est relayé par le signal `partiel`, dans l'ordre, avant `termine`.
+    """
+
+    termine = QtCore.pyqtSignal(int, object)
+    erreur = QtCore.pyqtSignal(int, str)
+    progression = QtCore.pyqtSignal(int, float)
+    partiel = QtCore.pyqtSignal(int, object)
+
+    def __init__(self, n_threads=None, parent=None):
+        super().__init__(parent)
+        self.pool = QtCore.QThreadPool(self)
+        if n_threads:
+            self.pool.setMaxThreadCount(n_threads)
+        self._compteur = itertools.count(1)
+        self.dernier_id = 0
+        self._signaux = {}
+
+    def soumettre(self, fonction, *args, **kwargs):
+        """Lance `fonction` en arrière-plan et retourne l'identifiant de la demande."""
+        identifiant = next(self._compteur)
+        self.dernier_id = identifiant
+
+        signaux = _SignauxTache()
+        signaux.termine.connect(self._sur_termine)
+        signaux.erreur.connect(self._sur_erreur)
+        signaux.progression.connect(self._sur_progression)
+        signaux.partiel.connect(self._sur_partiel)
+        # On garde une référence tant que la tâche n'est pas terminée
+        self._signaux[identifiant] = signaux
+
+        self.pool.start(_Tache(identifiant, fonction, args, kwargs, signaux))
+        return identifiant
+
+    def _est_actuel(self, identifiant):
+        return identifiant == self.dernier_id
+
+    def _sur_termine(self, identifiant, resultat):
+        self._signaux.pop(identifiant, None)
+        if self._est_actuel(identifiant):
+            self.termine.emit(identifiant, resultat)
+
+    def _sur_erreur(self, identifiant, message):
+        self._signaux.pop(identifiant, None)
+        if self._est_actuel(identifiant):
+            self.erreur.emit(identifiant, message)
+
+    def _sur_progression(self, identifiant, fraction):
+        if self._est_actuel(identifiant):
+            self.progression.emit(identifiant, fraction)
+
+    def _sur_partiel(self, identifiant, objet):
+        if self._est_actuel(identifiant):
+            self.partiel.emit(identifiant, objet)
+
+    def attendre(self, delai_ms=-1):
+        """Attend la fin des calculs en cours (utile à la fermeture)."""
+        return self.pool.waitForDone(delai_ms)